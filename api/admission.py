@@ -0,0 +1,184 @@
+"""
+FIFA 2026 World Cup Draw - Admission Control
+Bounded, prioritized queue in front of the solver: single clicks before full draws,
+a cap per client, and fast rejection when the expected wait exceeds a budget
+"""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from api import tracing
+from api.solver import SearchCancelled
+
+# Solves run at once; the rest wait in the queue
+SOLVER_SLOTS = int(os.environ.get('SOLVER_SLOTS', os.cpu_count() or 1))
+# Slots one batch may hold; below SOLVER_SLOTS, so clicks always have one
+BATCH_SLOTS = max(1, min(int(os.environ.get('BATCH_SLOTS', SOLVER_SLOTS - 1)), SOLVER_SLOTS - 1))
+MAX_QUEUE = int(os.environ.get('MAX_QUEUE', 64))
+# Requests a client may have queued or running at once
+MAX_PER_CLIENT = int(os.environ.get('MAX_PER_CLIENT', 2))
+# Requests expected to wait longer than this (seconds) are turned away
+WAIT_BUDGET = float(os.environ.get('WAIT_BUDGET', 2.0))
+
+# Lower runs first
+PRIORITY_CLICK = 0
+PRIORITY_FULL_DRAW = 1
+PRIORITY_BATCH = 2
+
+# Smoothing of the service time estimate, and its value before any solve finished
+SERVICE_TIME_ALPHA = 0.2
+INITIAL_SERVICE_TIME = 0.2
+
+
+class Overloaded(Exception):
+    """Request rejected without queueing; retry_after is in whole seconds"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Server busy ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, slots=SOLVER_SLOTS, max_queue=MAX_QUEUE, max_per_client=MAX_PER_CLIENT,
+                 wait_budget=WAIT_BUDGET):
+        self.slots = slots
+        self.max_queue = max_queue
+        self.max_per_client = max_per_client
+        self.wait_budget = wait_budget
+        self.condition = threading.Condition()
+        self.queue = []  # heap of (priority, sequence)
+        self.sequence = itertools.count()
+        self.running = 0
+        self.holding = {}  # ticket -> (slots, start, expected seconds or None if timed)
+        self.per_client = {}
+        self.service_time = INITIAL_SERVICE_TIME
+        # Seconds per solve of untimed blocks, learned from them likewise
+        self.work_time = INITIAL_SERVICE_TIME
+        self.counters = {
+            'admitted': 0,
+            'completed': 0,
+            'shed_queue_full': 0,
+            'shed_client_limit': 0,
+            'shed_wait_budget': 0,
+            'cancelled_in_queue': 0,
+        }
+
+    def estimated_wait(self, priority):
+        """Seconds a new request of this priority would wait before it starts. Slots
+        free up as running blocks finish: a timed one in a service time, an untimed
+        one when what is left of its expected time has passed (at least a service
+        time); each request ahead then takes the first free slot for a service time."""
+        ahead = sum(1 for p, _ in self.queue if p <= priority)
+        if self.running < self.slots and ahead == 0:
+            return 0.0
+        now = time.perf_counter()
+        free_at = [0.0] * max(0, self.slots - self.running)
+        for slots, start, expected in self.holding.values():
+            left = self.service_time if expected is None else max(self.service_time, start + expected - now)
+            free_at.extend([left] * slots)
+        heapq.heapify(free_at)
+        for _ in range(ahead):
+            heapq.heapreplace(free_at, free_at[0] + self.service_time)
+        return free_at[0]
+
+    def reject(self, reason, wait):
+        self.counters[f'shed_{reason}'] += 1
+        raise Overloaded(reason, max(1, math.ceil(wait)))
+
+    @contextmanager
+    def admit(self, client, priority=PRIORITY_CLICK, cancel=None, timed=True, slots=1, shed=True, work=1):
+        """Hold solver slots for the block: one per process it keeps busy (at most
+        all of them). Raises Overloaded at once if the request should be shed, and
+        SearchCancelled if cancel is set while it waits. Blocks not timed (batches,
+        draw simulations) leave the service time estimate of single solves alone:
+        they stand for `work` solves spread over their slots, and are expected to
+        take as long per solve as such blocks took so far. Background work
+        (shed=False) always queues."""
+        slots = min(slots, self.slots)
+        work = max(1, work)
+        with tracing.span("admission_wait", "request", priority=priority), self.condition:
+            wait = self.estimated_wait(priority)
+            if shed:
+                if self.per_client.get(client, 0) >= self.max_per_client:
+                    self.reject('client_limit', self.service_time)
+                if len(self.queue) >= self.max_queue:
+                    self.reject('queue_full', wait)
+                if wait > self.wait_budget:
+                    self.reject('wait_budget', wait)
+
+            ticket = (priority, next(self.sequence))
+            heapq.heappush(self.queue, ticket)
+            self.per_client[client] = self.per_client.get(client, 0) + 1
+            try:
+                while self.running + slots > self.slots or self.queue[0] != ticket:
+                    if cancel is not None and cancel.is_set():
+                        self.counters['cancelled_in_queue'] += 1
+                        raise SearchCancelled("Cancelled while queued")
+                    self.condition.wait(0.05 if cancel is not None else None)
+            except BaseException:
+                self.queue.remove(ticket)
+                heapq.heapify(self.queue)
+                self.release_client(client)
+                self.condition.notify_all()
+                raise
+            heapq.heappop(self.queue)
+            self.running += slots
+            expected = None if timed else work * self.work_time / slots
+            self.holding[ticket] = (slots, time.perf_counter(), expected)
+            self.counters['admitted'] += 1
+            # The next in line may fit in another free slot
+            self.condition.notify_all()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.condition:
+                self.running -= slots
+                del self.holding[ticket]
+                self.release_client(client)
+                self.counters['completed'] += 1
+                if timed:
+                    self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+                else:
+                    self.work_time += SERVICE_TIME_ALPHA * (elapsed * slots / work - self.work_time)
+                self.condition.notify_all()
+
+    def release_client(self, client):
+        remaining = self.per_client[client] - 1
+        if remaining:
+            self.per_client[client] = remaining
+        else:
+            del self.per_client[client]
+
+    def metrics(self):
+        with self.condition:
+            return {
+                'queue_depth': len(self.queue),
+                'running': self.running,
+                'slots': self.slots,
+                'clients': len(self.per_client),
+                'service_time_seconds': self.service_time,
+                'work_time_seconds': self.work_time,
+                **self.counters,
+            }
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, value in self.metrics().items():
+            kind = 'counter' if name in self.counters else 'gauge'
+            metric = f"draw_admission_{name}" + ('_total' if kind == 'counter' else '')
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+admission = AdmissionController()
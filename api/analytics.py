@@ -0,0 +1,101 @@
+"""
+FIFA 2026 World Cup Draw - Draw Analytics
+Vectorized statistics over large arrays of simulated draws (N x 48 group numbers, ALL_TEAMS order)
+"""
+
+import numpy as np
+
+from api.solver import ALL_TEAMS, NUM_OF_GROUPS, NUM_OF_TEAMS, TEAMS, TEAMS_PER_GROUP
+
+# Draws processed per step; bounds memory at roughly CHUNK_SIZE * 48 * 4 bytes per buffer
+CHUNK_SIZE = 250_000
+
+# Single confederation per team for mix statistics; playoff placeholders get their own label
+TEAM_CONFEDERATION = {}
+for _confederation, _teams in TEAMS.items():
+    for _team in _teams:
+        TEAM_CONFEDERATION[_team] = "PLAYOFF" if _team in TEAM_CONFEDERATION else _confederation
+CONFEDERATION_LABELS = sorted(set(TEAM_CONFEDERATION.values()))
+
+
+def iter_chunks(draws, chunk_size=CHUNK_SIZE):
+    """Zero-copy row slices of an array or np.memmap"""
+    for start in range(0, len(draws), chunk_size):
+        yield draws[start:start + chunk_size]
+
+def group_sums(chunk, weights):
+    """(n x 13) per-draw sum of weights of the teams in each group (column 0 unused)"""
+    rows = np.arange(len(chunk))[:, None] * (NUM_OF_GROUPS + 1)
+    flat = np.bincount((rows + chunk).ravel(), weights=np.broadcast_to(weights, chunk.shape).ravel(),
+                       minlength=len(chunk) * (NUM_OF_GROUPS + 1))
+    return flat.reshape(len(chunk), NUM_OF_GROUPS + 1)
+
+
+class DrawAnalytics:
+    """Accumulates co-group counts, confederation mixes and opponent strength chunk by chunk.
+
+    strength is one rating per team in ALL_TEAMS order (e.g. ranking points). Pots
+    are no use here since every group holds one team per pot, so opponent
+    strength is only tracked when ratings are given.
+    """
+
+    def __init__(self, strength=None):
+        self.strength = None if strength is None else np.asarray(strength, dtype=np.float64)
+        self.num_draws = 0
+        self.co_group = np.zeros((NUM_OF_TEAMS, NUM_OF_TEAMS), dtype=np.int64)
+        self.conf_matrix = np.array(
+            [[TEAM_CONFEDERATION[t] == c for c in CONFEDERATION_LABELS] for t in ALL_TEAMS], dtype=np.float32)
+        # [group, confederation, number of teams of that confederation in the group]
+        self.conf_mix = np.zeros((NUM_OF_GROUPS, len(CONFEDERATION_LABELS), TEAMS_PER_GROUP + 1), dtype=np.int64)
+        self.opp_sum = np.zeros(NUM_OF_TEAMS)
+        self.opp_sumsq = np.zeros(NUM_OF_TEAMS)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk)
+        self.num_draws += len(chunk)
+        num_labels = len(CONFEDERATION_LABELS)
+        bins = np.arange(num_labels) * (TEAMS_PER_GROUP + 1)
+
+        for group in range(1, NUM_OF_GROUPS + 1):
+            in_group = (chunk == group).astype(np.float32)
+            self.co_group += np.rint(in_group.T @ in_group).astype(np.int64)
+
+            conf_counts = (in_group @ self.conf_matrix).astype(np.int64)
+            mix = np.bincount((conf_counts + bins).ravel(), minlength=num_labels * (TEAMS_PER_GROUP + 1))
+            self.conf_mix[group - 1] += mix.reshape(num_labels, TEAMS_PER_GROUP + 1)
+
+        if self.strength is None:
+            return
+
+        # Opponents' strength = strength of the team's group minus its own
+        sums = group_sums(chunk, self.strength)
+        opponents = np.take_along_axis(sums, chunk.astype(np.intp), axis=1) - self.strength
+        self.opp_sum += opponents.sum(axis=0)
+        self.opp_sumsq += (opponents ** 2).sum(axis=0)
+
+    def co_group_probabilities(self):
+        """48 x 48 probability that two teams share a group (diagonal is 1)"""
+        return self.co_group / max(1, self.num_draws)
+
+    def confederation_mix(self):
+        """{group: {confederation: [P(0 teams), ..., P(4 teams)]}}"""
+        probs = self.conf_mix / max(1, self.num_draws)
+        return {
+            group: {c: probs[group - 1, i].tolist() for i, c in enumerate(CONFEDERATION_LABELS)}
+            for group in range(1, NUM_OF_GROUPS + 1)
+        }
+
+    def opponent_strength(self):
+        """{team: (mean, std)} of the summed strength of the three group opponents"""
+        n = max(1, self.num_draws)
+        mean = self.opp_sum / n
+        std = np.sqrt(np.maximum(self.opp_sumsq / n - mean ** 2, 0))
+        return {team: (mean[i], std[i]) for i, team in enumerate(ALL_TEAMS)}
+
+
+def analyze_draws(draws, strength=None, chunk_size=CHUNK_SIZE):
+    """Run every statistic over draws (array or np.memmap) in a single chunked pass"""
+    analytics = DrawAnalytics(strength)
+    for chunk in iter_chunks(draws, chunk_size):
+        analytics.update(chunk)
+    return analytics
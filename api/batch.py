@@ -0,0 +1,130 @@
+"""
+FIFA 2026 World Cup Draw - Batch What-If Evaluation
+Many (assignments, team) queries in one request: duplicates are evaluated once, the
+rest in worker processes sharing the feasibility cache file, and results come back
+in query order as soon as every earlier one is known
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from api.rules import validate_assignments
+from api.solver import DEFAULT_RULES, SearchCancelled, check_feasibility, get_valid_group_for_team, worker_context
+
+# Worker processes for batches (1 evaluates in the request's own process)
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+MAX_BATCH_QUERIES = int(os.environ.get('MAX_BATCH_QUERIES', 10_000))
+
+# Queries per task sent to a worker: enough to amortize the round trip, few enough
+# that results keep streaming
+CHUNK_SIZE = 8
+
+
+def parse_query(query):
+    """(assignments, team or None) of a query {"assignments": {...}, "team": ...}"""
+    if not isinstance(query, dict):
+        raise ValueError(f"Invalid query: {query!r}")
+    assignments = query.get('assignments', {})
+    if not isinstance(assignments, dict):
+        raise ValueError(f"Invalid assignments: {assignments!r}")
+    try:
+        assignments = {str(k): int(v) for k, v in assignments.items()}
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid assignments: {assignments!r}") from None
+    team = query.get('team')
+    return assignments, None if team is None else str(team)
+
+def evaluate_query(assignments, team, rules=DEFAULT_RULES):
+    """Where team would go and whether the draw can still be completed; without a
+    team, only the latter"""
+    validate_assignments(assignments, rules)
+    if team is None:
+        return {'completable': check_feasibility(assignments, rules=rules)}
+    if team not in rules.team_pot:
+        raise ValueError(f"Unknown team: {team}")
+    if team in assignments:
+        raise ValueError(f"{team} is already assigned")
+    # Every unassigned team has a group in a complete draw, so this answers both
+    group = get_valid_group_for_team(team, assignments, parallel=False, rules=rules)
+    return {'valid_group': group, 'completable': group is not None}
+
+def evaluate_chunk(queries, rules=DEFAULT_RULES):
+    """Results of [(assignments, team)]; a bad query gets an error, not the chunk"""
+    results = []
+    for assignments, team in queries:
+        try:
+            results.append(evaluate_query(assignments, team, rules))
+        except ValueError as error:
+            results.append({'error': str(error)})
+    return results
+
+
+_batch_pools = {}
+_batch_pools_lock = threading.Lock()
+
+def get_batch_pool(workers=BATCH_WORKERS):
+    """Lazily started pool of this many workers, kept for later batches. The workers
+    share the parent's feasibility cache file, not its memory."""
+    with _batch_pools_lock:
+        if workers not in _batch_pools:
+            _batch_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=worker_context())
+        return _batch_pools[workers]
+
+def evaluate_batch(queries, rules=DEFAULT_RULES, workers=BATCH_WORKERS, cancel=None):
+    """(number of distinct queries, iterator of one result per query in order:
+    {"index", "team", ...evaluate_query result or "error"}). Malformed input raises
+    ValueError here, before any work; setting cancel stops the iterator with
+    SearchCancelled."""
+    if not isinstance(queries, list):
+        raise ValueError("queries must be a list")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise ValueError(f"At most {MAX_BATCH_QUERIES} queries per batch")
+    parsed = [parse_query(query) for query in queries]
+
+    # Each distinct query once, in order of first appearance
+    unique = {}
+    slots = []
+    for assignments, team in parsed:
+        key = (tuple(sorted(assignments.items())), team)
+        slots.append(unique.setdefault(key, len(unique)))
+    distinct = [(dict(key[0]), key[1]) for key in unique]
+
+    if workers <= 1:
+        results = iter_inline(distinct, slots, rules, cancel)
+    else:
+        results = iter_pooled(distinct, slots, rules, workers, cancel)
+    labelled = ({'index': idx, 'team': parsed[idx][1], **result} for idx, result in enumerate(results))
+    return len(distinct), labelled
+
+def iter_inline(distinct, slots, rules, cancel):
+    answers = {}
+    for slot in slots:
+        if cancel is not None and cancel.is_set():
+            raise SearchCancelled("Batch cancelled")
+        if slot not in answers:
+            answers[slot] = evaluate_chunk([distinct[slot]], rules)[0]
+        yield answers[slot]
+
+def iter_pooled(distinct, slots, rules, workers, cancel):
+    executor = get_batch_pool(workers)
+    futures = [executor.submit(evaluate_chunk, distinct[start:start + CHUNK_SIZE], rules)
+               for start in range(0, len(distinct), CHUNK_SIZE)]
+    try:
+        for slot in slots:
+            future = futures[slot // CHUNK_SIZE]
+            # Later chunks keep running while this one is awaited
+            while not wait([future], timeout=None if cancel is None else 0.05).done:
+                if cancel.is_set():
+                    raise SearchCancelled("Batch cancelled")
+            yield future.result()[slot % CHUNK_SIZE]
+    finally:
+        # Queued chunks are dropped; running ones finish in the background
+        for future in futures:
+            future.cancel()
+
+def batch_summary(num_queries, num_distinct, start):
+    """Last line of a streamed batch"""
+    return {'done': True, 'queries': num_queries, 'distinct': num_distinct,
+            'seconds': round(time.perf_counter() - start, 3)}
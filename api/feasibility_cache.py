@@ -0,0 +1,227 @@
+"""
+FIFA 2026 World Cup Draw - Feasibility Cache
+Answers of check_feasibility and get_valid_group_for_team kept in an in-memory LRU
+over a SQLite file shared by every worker process and kept across restarts. The
+file can be built ahead of time and shipped (see tools/build_feasibility_cache.py).
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_FILE = os.environ.get(
+    'FEASIBILITY_CACHE_FILE', os.path.join(os.path.dirname(__file__), 'feasibility_cache.sqlite'))
+
+# Entries kept in memory per process, and in the file before the least recently used go
+MEMORY_ENTRIES = int(os.environ.get('FEASIBILITY_CACHE_MEMORY', 100_000))
+MAX_ENTRIES = int(os.environ.get('FEASIBILITY_CACHE_MAX', 2_000_000))
+
+# New entries and hits are written together, every FLUSH_SIZE of them or FLUSH_INTERVAL seconds
+FLUSH_SIZE = 256
+FLUSH_INTERVAL = 1.0
+# Eviction deletes down to this share of MAX_ENTRIES, so it doesn't run on every flush
+EVICT_TO = 0.9
+
+FEASIBLE = b'f'
+VALID_GROUP = b'g'
+# Stored for get_valid_group_for_team when no group is valid
+NO_GROUP = 0
+
+
+def cache_key(kind, rules, assignments, team=None):
+    """16-byte key of an answer, specific to the rule set"""
+    text = json.dumps([rules.hash, sorted(assignments.items()), team], separators=(',', ':'))
+    return kind + hashlib.blake2b(text.encode('utf-8'), digest_size=15).digest()
+
+
+class FeasibilityCache:
+    """Two-tier cache of definitive answers. Only answers the search proved belong
+    here: a cancelled or timed-out search says nothing and must not be stored.
+
+    The file is opened lazily in each process (connections don't survive fork).
+    If it can't be written (e.g. a read-only deployment), it is only read.
+    """
+
+    def __init__(self, path=CACHE_FILE, memory_entries=MEMORY_ENTRIES, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.connection = None
+        self.pid = None
+        self.writable = False
+        self.pending = {}
+        self.touched = set()
+        self.last_flush = time.monotonic()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def connect(self):
+        """The process's connection, or None if the file can't be opened"""
+        if self.pid == os.getpid():
+            return self.connection
+        # First use in this process, or a forked child: the parent's connection isn't ours
+        self.pid = os.getpid()
+        self.connection = None
+        self.pending = {}
+        self.touched = set()
+        connection = None
+        try:
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS answers '
+                               '(key BLOB PRIMARY KEY, value INTEGER NOT NULL, used REAL NOT NULL) WITHOUT ROWID')
+            connection.execute('CREATE INDEX IF NOT EXISTS answers_used ON answers (used)')
+            self.writable = True
+        except sqlite3.Error:
+            if connection is not None:
+                connection.close()
+            try:
+                connection = sqlite3.connect(f'file:{self.path}?mode=ro&immutable=1', uri=True,
+                                             check_same_thread=False)
+                connection.execute('SELECT 1 FROM answers LIMIT 1')
+            except sqlite3.Error:
+                return None
+            self.writable = False
+        self.connection = connection
+        return connection
+
+    def get(self, key):
+        """Cached value, or None"""
+        with self.lock:
+            value = self.memory.get(key)
+            if value is not None:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                self.touched.add(key)
+                return value
+
+            value = self.pending.get(key)
+            connection = self.connect()
+            if value is None and connection is not None:
+                try:
+                    row = connection.execute('SELECT value FROM answers WHERE key = ?', (key,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+                value = None if row is None else row[0]
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self.remember(key, value)
+            self.touched.add(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.remember(key, value)
+            if self.connect() is not None and self.writable:
+                self.pending[key] = value
+                if len(self.pending) + len(self.touched) >= FLUSH_SIZE \
+                        or time.monotonic() - self.last_flush >= FLUSH_INTERVAL:
+                    self.flush_locked()
+
+    def remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        self.last_flush = time.monotonic()
+        if self.pid != os.getpid() or self.connection is None or not self.writable:
+            return
+        if not self.pending and not self.touched:
+            return
+        now = time.time()
+        try:
+            with self.connection:
+                self.connection.execute('BEGIN IMMEDIATE')
+                self.connection.executemany(
+                    'INSERT INTO answers (key, value, used) VALUES (?, ?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET used = excluded.used',
+                    [(key, value, now) for key, value in self.pending.items()])
+                self.connection.executemany(
+                    'UPDATE answers SET used = ? WHERE key = ?', [(now, key) for key in self.touched - set(self.pending)])
+                self.stats['writes'] += len(self.pending)
+                self.evict()
+        except sqlite3.Error:
+            # Busy or read-only after all: keep serving from memory, drop the batch
+            pass
+        self.pending = {}
+        self.touched = set()
+
+    def evict(self):
+        count = self.connection.execute('SELECT COUNT(*) FROM answers').fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * EVICT_TO)
+        self.connection.execute(
+            'DELETE FROM answers WHERE key IN (SELECT key FROM answers ORDER BY used LIMIT ?)', (excess,))
+        self.stats['evictions'] += excess
+
+    def entries(self):
+        """Entries in the file (0 if it can't be read)"""
+        with self.lock:
+            connection = self.connect()
+            if connection is None:
+                return 0
+            try:
+                return connection.execute('SELECT COUNT(*) FROM answers').fetchone()[0] + len(self.pending)
+            except sqlite3.Error:
+                return 0
+
+    def metrics(self):
+        with self.lock:
+            stats = dict(self.stats)
+            lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+            stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+            stats['memory_entries'] = len(self.memory)
+        return stats
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, value in self.metrics().items():
+            kind = 'counter' if name in self.stats else 'gauge'
+            metric = f"draw_feasibility_cache_{name}" + ('_total' if kind == 'counter' else '')
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def compact(self):
+        """Flush, then fold the WAL into the file and shrink it, ready to ship read-only"""
+        with self.lock:
+            self.flush_locked()
+            if self.connection is None or not self.writable:
+                return
+            self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self.connection.execute('PRAGMA journal_mode=DELETE')
+            self.connection.execute('VACUUM')
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_feasibility_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FeasibilityCache()
+        return _cache
+
+@atexit.register
+def flush_cache():
+    """Write out the last batch (skipped when the file can't be written)"""
+    if _cache is not None:
+        _cache.flush()
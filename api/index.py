@@ -4,28 +4,217 @@ FIFA 2026 World Cup Draw - Vercel Serverless API Endpoint
 
 from http.server import BaseHTTPRequestHandler
 import json
-from api.solver import get_valid_group_for_team, get_initial_state, get_pots
+import os
+import select
+import socket
+import threading
+import time
+from collections import OrderedDict
+from api.admission import BATCH_SLOTS, PRIORITY_BATCH, PRIORITY_CLICK, PRIORITY_FULL_DRAW, Overloaded, admission
+from api.batch import BATCH_WORKERS, batch_summary, evaluate_batch
+from api.feasibility_cache import get_feasibility_cache
+from api.profiling import PROFILE_ALLOW_REQUEST, PROFILE_REQUESTS, profile_request
+from api.rules import load_rules, resolve_rules, validate_assignments
+from api.tracing import TRACE_ALLOW_REQUEST, now_us, record, trace_request
+from api.solver import SearchCancelled, cached_valid_group, get_valid_group_for_team, get_initial_state, get_pots
+from api.odds import get_odds
 
+# Opt-in capture of get_valid_group requests as JSONL, for tools/replay.py
+CAPTURE_FILE = os.environ.get('CAPTURE_FILE')
+capture_lock = threading.Lock()
 
-def get_valid_group_response(data):
+
+def capture_request(team, assignments, valid_group, latency):
+    """Append the request to CAPTURE_FILE; a failure to write it (e.g. a read-only
+    filesystem) is ignored"""
+    entry = {
+        'time': time.time(),
+        'team': team,
+        'assignments': assignments,
+        'valid_group': valid_group,
+        'latency': latency,
+    }
+    try:
+        with capture_lock, open(CAPTURE_FILE, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+    except OSError:
+        pass
+
+# Rule sets sent inline in requests are compiled into models, so the public API
+# only takes rule set names unless this is set
+ALLOW_INLINE_RULES = os.environ.get('ALLOW_INLINE_RULES', '0') == '1'
+
+
+def request_rules(data):
+    return resolve_rules(data.get('rules'), allow_inline=ALLOW_INLINE_RULES)
+
+# Cancel events of in-flight requests by client request_id. A cancel may arrive
+# before its request does, so events are created by whichever comes first.
+MAX_CANCEL_EVENTS = 1024
+cancel_events = OrderedDict()
+cancel_events_lock = threading.Lock()
+
+
+def get_cancel_event(request_id):
+    with cancel_events_lock:
+        event = cancel_events.get(request_id)
+        if event is None:
+            event = threading.Event()
+            cancel_events[request_id] = event
+            if len(cancel_events) > MAX_CANCEL_EVENTS:
+                cancel_events.popitem(last=False)
+        return event
+
+def release_cancel_event(request_id):
+    with cancel_events_lock:
+        cancel_events.pop(request_id, None)
+
+def watch_disconnect(connection, cancel, finished):
+    """Set cancel if the client closes the connection before the response is sent"""
+    try:
+        while not finished.is_set() and not cancel.is_set():
+            readable, _, _ = select.select([connection], [], [], 0.05)
+            if readable:
+                if connection.recv(1, socket.MSG_PEEK) == b'':
+                    cancel.set()
+                # Otherwise the client sent more data (a pipelined request): stop watching
+                return
+    except (OSError, ValueError):
+        pass
+
+def valid_group_request(data):
+    """(team, assignments, rules) of a get_valid_group request, validated"""
     raw_assignments = data.get('assignments', {})
     assignments = {str(k): int(v) for k, v in raw_assignments.items()}
 
     team = data.get('team')
-    valid_group = get_valid_group_for_team(team, assignments)
+    rules = request_rules(data)
+    validate_assignments(assignments, rules)
+    if team not in rules.team_pot:
+        raise ValueError(f"Unknown team: {team}")
+    if team in assignments:
+        raise ValueError(f"{team} is already assigned")
+    return team, assignments, rules
+
+def get_valid_group_response(data, cancel=None):
+    team, assignments, rules = valid_group_request(data)
+    start = time.perf_counter()
+    valid_group = get_valid_group_for_team(team, assignments, rules=rules, cancel=cancel)
+    if CAPTURE_FILE:
+        capture_request(team, assignments, valid_group, time.perf_counter() - start)
 
     return {
         'team': team,
         'valid_group': valid_group
     }
 
-def get_initial_state_response():
+def get_odds_response(data):
+    raw_assignments = data.get('assignments', {})
+    assignments = {str(k): int(v) for k, v in raw_assignments.items()}
+    # The draw pool holds draws of the default rule set
+    validate_assignments(assignments, load_rules())
+    return get_odds(assignments)
+
+def cancel_response(data):
+    request_id = data.get('request_id')
+    if request_id is None:
+        raise ValueError("Missing request_id")
+    get_cancel_event(str(request_id)).set()
+    return {'request_id': request_id, 'cancelled': True}
+
+def get_initial_state_response(data):
+    rules = request_rules(data)
     return {
-        'assignments': get_initial_state(),
-        'pots': get_pots()
+        'assignments': get_initial_state(rules),
+        'pots': get_pots(rules)
     }
 
 
+def run_action(action, data, cancel=None):
+    """Return (response, RequestProfile or None)"""
+    requested = PROFILE_ALLOW_REQUEST and bool(data.get('profile'))
+    with profile_request(action, PROFILE_REQUESTS or requested) as profile:
+        if action == 'get_valid_group':
+            response = get_valid_group_response(data, cancel)
+
+        elif action == 'get_initial_state':
+            response = get_initial_state_response(data)
+
+        elif action == 'get_odds':
+            response = get_odds_response(data)
+
+        else:
+            raise ValueError(f"Unknown action: {action}")
+
+    return response, profile
+
+def run_cancellable(data, connection, client_address):
+    """Run get_valid_group once admitted, until done, cancelled by request_id or
+    abandoned by the client. Full draws ("mode": "full_draw") queue behind clicks."""
+    request_id = data.get('request_id')
+    cancel = threading.Event() if request_id is None else get_cancel_event(str(request_id))
+    client = str(data.get('client_id') or client_address)
+    priority = PRIORITY_FULL_DRAW if data.get('mode') == 'full_draw' else PRIORITY_CLICK
+    finished = threading.Event()
+    watcher = threading.Thread(target=watch_disconnect, args=(connection, cancel, finished), daemon=True)
+    watcher.start()
+    try:
+        # Answers the feasibility cache holds don't wait for a solver slot
+        if cached_valid_group(*valid_group_request(data))[0]:
+            return run_action('get_valid_group', data, cancel)
+        with admission.admit(client, priority, cancel):
+            return run_action('get_valid_group', data, cancel)
+    finally:
+        finished.set()
+        if request_id is not None:
+            release_cancel_event(str(request_id))
+
+
+def write_line(handler, record):
+    handler.wfile.write((json.dumps(record) + '\n').encode('utf-8'))
+    handler.wfile.flush()
+
+def stream_batch(handler, data):
+    """Answer evaluate_batch with NDJSON: a line per query, in order, as soon as it
+    and every earlier one is known, then a summary line. The batch queues behind
+    clicks and full draws and holds a solver slot per worker process, at most
+    BATCH_SLOTS of them."""
+    rules = request_rules(data)
+    queries = data.get('queries')
+    request_id = data.get('request_id')
+    cancel = threading.Event() if request_id is None else get_cancel_event(str(request_id))
+    client = str(data.get('client_id') or handler.client_address[0])
+    workers = min(BATCH_WORKERS, BATCH_SLOTS)
+    start = time.perf_counter()
+    try:
+        # A cancel request stops the stream and drops the queries not yet started
+        num_distinct, results = evaluate_batch(queries, rules, workers=workers, cancel=cancel)
+        try:
+            with admission.admit(client, PRIORITY_BATCH, cancel, timed=False, slots=workers, work=num_distinct):
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'application/x-ndjson')
+                handler.send_header('Access-Control-Allow-Origin', '*')
+                handler.send_header('Cache-Control', 'no-store')
+                handler.end_headers()
+                # The status is sent: failures from here on end the stream with an error line
+                try:
+                    for result in results:
+                        write_line(handler, result)
+                    write_line(handler, batch_summary(len(queries), num_distinct, start))
+                except SearchCancelled:
+                    pass
+                except OSError:
+                    # The client left; closing the iterator drops the queued queries
+                    cancel.set()
+                except Exception as error:
+                    write_line(handler, {'error': str(error), 'type': type(error).__name__})
+        finally:
+            results.close()
+    finally:
+        if request_id is not None:
+            release_cancel_event(str(request_id))
+
+
 class handler(BaseHTTPRequestHandler):
     """Vercel serverless function handler"""
 
@@ -50,26 +239,64 @@ class handler(BaseHTTPRequestHandler):
 
     def do_POST(self):
         try:
+            start = now_us()
             content_length = int(self.headers['Content-Length'])
             body = self.rfile.read(content_length)
             data = json.loads(body.decode('utf-8'))
             action = data.get('action')
 
-            if action == 'get_valid_group':
-                response = get_valid_group_response(data)
+            trace_id = data.get('trace_id') if TRACE_ALLOW_REQUEST else None
+            with trace_request(trace_id, action, start, team=data.get('team'),
+                               request_id=data.get('request_id')):
+                record('parse_request', start, now_us(), 'request')
+                if action == 'get_valid_group':
+                    response, profile = run_cancellable(data, self.connection, self.client_address[0])
+
+                elif action == 'evaluate_batch':
+                    stream_batch(self, data)
+                    return
+
+                elif action == 'cancel':
+                    response, profile = cancel_response(data), None
 
-            elif action == 'get_initial_state':
-                response = get_initial_state_response()
+                elif action == 'get_metrics':
+                    response, profile = {**admission.metrics(),
+                                         'feasibility_cache': get_feasibility_cache().metrics()}, None
 
-            else:
-                raise ValueError(f"Unknown action: {action}")
+                else:
+                    response, profile = run_action(action, data)
 
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            if profile is not None:
+                self.send_header('X-Profile-Dir', profile.path)
             self.end_headers()
             self.wfile.write(json.dumps(response).encode('utf-8'))
 
+        except Overloaded as error:
+            self.send_response(503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Expose-Headers', 'Retry-After')
+            self.send_header('Retry-After', str(error.retry_after))
+            self.end_headers()
+            self.wfile.write(json.dumps({
+                'error': str(error),
+                'type': type(error).__name__,
+                'reason': error.reason,
+                'retry_after': error.retry_after
+            }).encode('utf-8'))
+
+        except SearchCancelled:
+            # Nobody is waiting for the answer; the status is for logs (as nginx's 499)
+            try:
+                self.send_response(499)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+            except OSError:
+                pass
+
         except Exception as error:
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
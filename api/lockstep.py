@@ -0,0 +1,168 @@
+"""
+FIFA 2026 World Cup Draw - Lockstep Batched Simulation
+Many draws advanced together, pot by pot and pick by pick, giving the same draws as
+simulate_draw with the same random generators. Each draw keeps a (team x group)
+domain mask, narrowed with NumPy after every pick by the pot, confederation and
+zone rules, and the complete draw it is known to be heading for. A pick is decided
+without searching when the team's lowest candidate group is where that draw puts
+it; otherwise the lower candidates are tried against every draw's witness, then by
+the solver.
+"""
+
+import numpy as np
+
+from api.solver import (
+    DEFAULT_RULES, ENDGAME_MAX_UNASSIGNED, ExactSearchExhausted, find_completion, solve_completion,
+)
+
+
+class LockstepSimulator:
+    """Batched draw procedure for one rule set. simulate(rngs) returns one draw per
+    generator, in draw order, as simulate_draw(rng) would.
+
+    The domain of an unassigned team holds the groups it could be placed in now,
+    which is exactly what the exact search allows it: no other team of its pot
+    there, no confederation of its at the maximum there, no separated team in the
+    same zone. A lowest valid group must be in it, so only its groups below the
+    witness's are ever probed, and a failed probe removes the group for good.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, endgame_threshold=ENDGAME_MAX_UNASSIGNED):
+        self.rules = rules
+        self.endgame_threshold = endgame_threshold
+        self.team_index = {team: idx for idx, team in enumerate(rules.all_teams)}
+        num_teams, num_groups = rules.num_teams, rules.num_groups
+
+        self.pot_columns = [np.array([self.team_index[t] for t in pot]) for pot in rules.pots]
+        confederations = list(rules.teams)
+        self.conf_member = np.zeros((num_teams, len(confederations)), dtype=bool)
+        for col, confederation in enumerate(confederations):
+            for team in rules.teams[confederation]:
+                self.conf_member[self.team_index[team], col] = True
+        self.conf_max = np.array([rules.confederation_limits[c]["max"] for c in confederations])
+
+        # Per separation: (member flag of each team, its team columns, groups sharing
+        # each group's zone as a num_groups x num_groups mask)
+        self.separations = []
+        for _, teams, zones in rules.separations:
+            member = np.zeros(num_teams, dtype=bool)
+            columns = np.array([self.team_index[t] for t in teams])
+            member[columns] = True
+            same_zone = np.zeros((num_groups, num_groups), dtype=bool)
+            for groups in zones:
+                idx = np.array(groups) - 1
+                same_zone[np.ix_(idx, idx)] = True
+            self.separations.append((member, columns, same_zone))
+
+        self.stats = {'picks': 0, 'propagated': 0, 'witnessed': 0, 'probes': 0}
+
+    def place(self, domains, counts, assigned, rows, teams, groups):
+        """Assign teams[i] to groups[i] in draw rows[i] and narrow the domains"""
+        gi = groups - 1
+        pot_columns = self.pot_columns[self.rules.team_pot[self.rules.all_teams[teams[0]]]]
+        domains[rows[:, None], pot_columns[None, :], gi[:, None]] = False
+
+        counts[rows, :, gi] += self.conf_member[teams]
+        full = counts[rows, :, gi] >= self.conf_max
+        # Teams of any confederation now at its maximum in the group lose the group
+        blocked = (self.conf_member[None, :, :] & full[:, None, :]).any(axis=2)
+        domains[rows, :, gi] &= ~blocked
+
+        for member, columns, same_zone in self.separations:
+            inside = member[teams]
+            if inside.any():
+                zone_rows = rows[inside]
+                domains[zone_rows[:, None], columns[None, :], :] &= ~same_zone[gi[inside]][:, None, :]
+
+        domains[rows, teams, :] = False
+        domains[rows, teams, gi] = True
+        assigned[rows, teams] = groups
+
+    def completion(self, assignments):
+        """Complete draw extending the assignments as a row of groups, or None; the
+        engine get_valid_group_for_team would use"""
+        self.stats['probes'] += 1
+        # The assignments include the team being probed
+        try:
+            if self.rules.num_teams - len(assignments) >= self.endgame_threshold:
+                raise ExactSearchExhausted
+            draw = find_completion(assignments, rules=self.rules)
+        except ExactSearchExhausted:
+            draw = solve_completion(assignments, rules=self.rules)
+        if draw is None:
+            return None
+        return np.array([draw[team] for team in self.rules.all_teams], dtype=np.int8)
+
+    def resolve(self, row, team, domains, assigned, witnesses):
+        """Lowest valid group of team in an undecided draw, updating its witness"""
+        target = witnesses[row, team]
+        known = assigned[row] > 0
+        # Any draw's witness agreeing with this draw so far proves a group feasible
+        agreeing = witnesses[(witnesses[:, known] == assigned[row, known]).all(axis=1)]
+        for group in np.flatnonzero(domains[row, team]) + 1:
+            if group >= target:
+                break
+            matches = agreeing[agreeing[:, team] == group]
+            if len(matches):
+                self.stats['witnessed'] += 1
+                witnesses[row] = matches[0]
+                return group
+            state = {self.rules.all_teams[col]: int(assigned[row, col]) for col in np.flatnonzero(known)}
+            state[self.rules.all_teams[team]] = int(group)
+            draw = self.completion(state)
+            if draw is not None:
+                witnesses[row] = draw
+                return group
+            domains[row, team, group - 1] = False
+        return target
+
+    def simulate(self, rngs):
+        """One complete draw (dict in draw order) per random generator"""
+        rules = self.rules
+        size = len(rngs)
+        rows = np.arange(size)
+        domains = np.ones((size, rules.num_teams, rules.num_groups), dtype=bool)
+        counts = np.zeros((size, self.conf_member.shape[1], rules.num_groups), dtype=np.int16)
+        assigned = np.zeros((size, rules.num_teams), dtype=np.int8)
+        if size == 0:
+            return []
+
+        initial = dict(rules.initial_state)
+        for team, group in initial.items():
+            self.place(domains, counts, assigned, rows, np.full(size, self.team_index[team]),
+                       np.full(size, group, dtype=np.int8))
+        first = self.completion(initial)
+        if first is None:
+            raise ValueError("The initial state has no valid completion")
+        witnesses = np.tile(first, (size, 1))
+
+        # The same shuffles as simulate_draw: each pot's teams left after the hosts
+        orders = [[] for _ in rngs]
+        for pot in rules.pots:
+            for order, rng in zip(orders, rngs):
+                remaining = [t for t in pot if t not in initial]
+                rng.shuffle(remaining)
+                order.append([self.team_index[t] for t in remaining])
+
+        picks = [list(initial) for _ in rngs]
+        for pot_idx in range(len(rules.pots)):
+            for step in range(len(orders[0][pot_idx])):
+                teams = np.array([order[pot_idx][step] for order in orders])
+                lowest = domains[rows, teams].argmax(axis=1) + 1
+                groups = witnesses[rows, teams].copy()
+                undecided = np.flatnonzero(lowest != groups)
+                self.stats['picks'] += size
+                self.stats['propagated'] += size - len(undecided)
+                for row in undecided:
+                    groups[row] = self.resolve(row, teams[row], domains, assigned, witnesses)
+                self.place(domains, counts, assigned, rows, teams, groups)
+                for draw_picks, team in zip(picks, teams):
+                    draw_picks.append(rules.all_teams[team])
+
+        return [{team: int(assigned[row, self.team_index[team]]) for team in draw_picks}
+                for row, draw_picks in enumerate(picks)]
+
+
+def simulate_draws_lockstep(rngs, rules=DEFAULT_RULES):
+    """simulate_draw(rng) for every generator, advanced in lockstep"""
+    return LockstepSimulator(rules).simulate(rngs)
@@ -0,0 +1,208 @@
+"""
+FIFA 2026 World Cup Draw - Live Odds
+Per-team group probabilities from a pool of complete draws that passed through the
+current state: the state's teams were the first ones drawn, into the same groups
+"""
+
+import os
+import random
+import threading
+
+import numpy as np
+
+from api.admission import PRIORITY_BATCH, admission
+from api.solver import ALL_TEAMS, NUM_OF_GROUPS, NUM_OF_TEAMS, check_feasibility, simulate_draw
+
+# Pre-generated draws (N x 48 group numbers in ALL_TEAMS order), see tools/build_draw_pool.py,
+# and next to them (draw_pool_order.npy) the position of each team in each draw's order
+POOL_FILE = os.environ.get('ODDS_POOL_FILE', os.path.join(os.path.dirname(__file__), 'draw_pool.npy'))
+
+# Below this many consistent draws, targeted simulations from the current state are added
+MIN_CONSISTENT_DRAWS = int(os.environ.get('ODDS_MIN_CONSISTENT_DRAWS', 200))
+# Top-up draws are merged into the pool this many at a time
+TOPUP_BATCH = 20
+
+TEAM_INDEX = {team: idx for idx, team in enumerate(ALL_TEAMS)}
+
+
+def draws_to_array(draws):
+    """List of complete assignment dicts -> uint8 array (one row per draw, ALL_TEAMS order)"""
+    return np.array([[draw[team] for team in ALL_TEAMS] for draw in draws], dtype=np.uint8).reshape(-1, NUM_OF_TEAMS)
+
+def draws_to_orders(draws, known=0):
+    """List of complete assignment dicts in draw order -> uint8 array of the position
+    each team was drawn at (ALL_TEAMS order). The first `known` teams, whose order
+    isn't known (a top-up's starting state), all get position known - 1."""
+    columns = np.array([[TEAM_INDEX[team] for team in draw] for draw in draws], dtype=np.intp)
+    columns = columns.reshape(-1, NUM_OF_TEAMS)
+    positions = np.maximum(np.arange(NUM_OF_TEAMS), known - 1).astype(np.uint8)
+    orders = np.empty(columns.shape, dtype=np.uint8)
+    np.put_along_axis(orders, columns, np.broadcast_to(positions, columns.shape), axis=1)
+    return orders
+
+def order_path(path):
+    """File of the draw orders of the pool in path"""
+    return os.path.splitext(path)[0] + '_order.npy'
+
+def group_counts(draws):
+    """48 x 12 array: how many of the draws put each team in each group"""
+    offsets = np.arange(NUM_OF_TEAMS) * (NUM_OF_GROUPS + 1)
+    counts = np.bincount((draws + offsets).ravel(), minlength=NUM_OF_TEAMS * (NUM_OF_GROUPS + 1))
+    return counts.reshape(NUM_OF_TEAMS, NUM_OF_GROUPS + 1)[:, 1:]
+
+
+class DrawPool:
+    """Complete draws, the order each was drawn in, and an inverted index
+    (team, group) -> sorted row ids.
+
+    A draw counts for a state only if it passed through it: every team of the state
+    is among its first len(state) teams drawn, in the state's group. Conditioned on
+    that, the rest of the draw is distributed as the draw procedure continuing from
+    the state, so the pooled and top-up draws matching a state are exact samples.
+    """
+
+    def __init__(self, draws=None, orders=None):
+        # Guards the draws, index and top-up state; merges are built outside it
+        self.lock = threading.Lock()
+        self.merge_lock = threading.Lock()
+        self.draws = np.zeros((0, NUM_OF_TEAMS), dtype=np.uint8)
+        self.orders = np.zeros((0, NUM_OF_TEAMS), dtype=np.uint8)
+        self.index = {}
+        self.topup_target = None
+        self.topup_thread = None
+        if draws is not None:
+            self.add(draws, orders)
+
+    @classmethod
+    def load(cls, path=POOL_FILE):
+        if not os.path.exists(path):
+            return cls()
+        orders = order_path(path)
+        return cls(np.load(path), np.load(orders) if os.path.exists(orders) else None)
+
+    def save(self, path=POOL_FILE):
+        np.save(path, self.draws)
+        np.save(order_path(path), self.orders)
+
+    def add(self, draws, orders=None):
+        """Merge draws and their orders into the pool (without orders, nothing is
+        known of the order: the draws only count for complete states). The new
+        arrays are built from the current ones and swapped in, so readers only wait
+        for the swap."""
+        if orders is None:
+            orders = np.full(draws.shape, NUM_OF_TEAMS - 1, dtype=np.uint8)
+        with self.merge_lock:
+            with self.lock:
+                current, current_orders, index = self.draws, self.orders, dict(self.index)
+            first_row = len(current)
+            merged = np.concatenate([current, draws])
+            merged_orders = np.concatenate([current_orders, orders])
+            for col in range(NUM_OF_TEAMS):
+                for group in range(1, NUM_OF_GROUPS + 1):
+                    rows = np.flatnonzero(draws[:, col] == group) + first_row
+                    if len(rows):
+                        key = (col, group)
+                        index[key] = np.concatenate([index.get(key, rows[:0]), rows])
+            with self.lock:
+                self.draws, self.orders, self.index = merged, merged_orders, index
+
+    def consistent_rows(self, assignments):
+        """Row ids of the draws that passed through the assignments"""
+        with self.lock:
+            draws, orders = self.draws, self.orders
+            pairs = [(TEAM_INDEX[team], group) for team, group in assignments.items()]
+            if not pairs:
+                return draws, np.arange(len(draws))
+
+            # Start from the rarest (team, group) pair, then check the other columns at once
+            postings = [self.index.get(pair, np.zeros(0, dtype=np.int64)) for pair in pairs]
+            rarest = min(range(len(pairs)), key=lambda i: len(postings[i]))
+            rows = postings[rarest]
+            cols = np.array([col for col, _ in pairs])
+            groups = np.array([group for _, group in pairs], dtype=np.uint8)
+            rows = rows[(draws[rows][:, cols] == groups).all(axis=1)]
+            return draws, rows[orders[rows][:, cols].max(axis=1) < len(pairs)]
+
+    def odds(self, assignments):
+        """Return (48 x 12 probability array, number of consistent draws)"""
+        draws, rows = self.consistent_rows(assignments)
+        if len(rows) < MIN_CONSISTENT_DRAWS:
+            self.request_topup(assignments)
+        if len(rows) == 0:
+            return np.zeros((NUM_OF_TEAMS, NUM_OF_GROUPS)), 0
+        return group_counts(draws[rows]) / len(rows), len(rows)
+
+    def request_topup(self, assignments):
+        """Simulate draws continuing from this state in the background (latest request wins)"""
+        with self.lock:
+            self.topup_target = dict(assignments)
+            if self.topup_thread is None:
+                self.topup_thread = threading.Thread(target=self.run_topups, daemon=True)
+                self.topup_thread.start()
+
+    def finish_topups(self, target):
+        """Stop the thread unless a newer target came in; True if it should stop"""
+        with self.lock:
+            if self.topup_target is not target:
+                return False
+            self.topup_target = None
+            self.topup_thread = None
+            return True
+
+    def run_topups(self):
+        rng = random.Random()
+        checked, feasible = None, False
+        try:
+            while True:
+                with self.lock:
+                    target = self.topup_target
+                _, rows = self.consistent_rows(target)
+                missing = MIN_CONSISTENT_DRAWS - len(rows)
+                if target is not checked:
+                    checked, feasible = target, check_feasibility(target)
+                # Enough draws, or a state no draw reaches
+                if missing <= 0 or not feasible:
+                    if self.finish_topups(target):
+                        return
+                    continue
+
+                batch = []
+                while len(batch) < min(missing, TOPUP_BATCH) and self.topup_target is target:
+                    # Each draw takes a solver slot behind every request, and waits for
+                    # one; it stands for a solve per team left to draw
+                    with admission.admit('odds_topup', PRIORITY_BATCH, timed=False, shed=False,
+                                         work=NUM_OF_TEAMS - len(target)):
+                        batch.append(simulate_draw(rng, target))
+                if batch:
+                    self.add(draws_to_array(batch), draws_to_orders(batch, len(target)))
+        except BaseException:
+            # Let the next request start a fresh thread
+            with self.lock:
+                self.topup_target = None
+                self.topup_thread = None
+            raise
+
+    def is_topping_up(self):
+        with self.lock:
+            return self.topup_target is not None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DrawPool.load()
+        return _pool
+
+def get_odds(assignments):
+    """Per-team group probabilities given the current assignments"""
+    pool = get_pool()
+    probabilities, samples = pool.odds(assignments)
+    return {
+        'probabilities': {team: probabilities[idx].round(4).tolist() for idx, team in enumerate(ALL_TEAMS)},
+        'samples': samples,
+        'topping_up': pool.is_topping_up(),
+    }
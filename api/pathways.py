@@ -0,0 +1,126 @@
+"""
+FIFA 2026 World Cup Draw - Knockout Pathways
+Earliest meeting rounds and path difficulty of group winners over simulated draws
+"""
+
+import numpy as np
+
+from api.analytics import CHUNK_SIZE, iter_chunks
+from api.odds import group_counts
+from api.solver import ALL_POTS, ALL_TEAMS, NUM_OF_GROUPS, NUM_OF_TEAMS, TOP_2_ZONES, TOP_4_ZONES
+
+# Assuming both teams win their groups. Group winners never meet in the round of
+# 32; these pairs of winners meet in the round of 16 (matches 89, 92, 94 and 96
+# of the schedule). The other winners face runners-up or third-placed teams there.
+R16_WINNER_PAIRS = [[5, 9], [1, 12], [4, 7], [2, 11]]
+
+ROUNDS = ["Group stage", "Round of 16", "Quarter-final", "Semi-final", "Final"]
+
+# Columns of each pot in a draw array; every group gets exactly one team per pot
+POT_COLUMNS = [np.array([ALL_TEAMS.index(team) for team in pot]) for pot in ALL_POTS]
+
+
+def bracket_nodes():
+    """(levels x 13) node of each group at each level: group, R16 tie, quarter, half"""
+    nodes = np.zeros((len(ROUNDS) - 1, NUM_OF_GROUPS + 1), dtype=np.intp)
+    nodes[0] = np.arange(NUM_OF_GROUPS + 1)
+    nodes[1] = np.arange(NUM_OF_GROUPS + 1) + len(R16_WINNER_PAIRS)
+    for idx, pair in enumerate(R16_WINNER_PAIRS):
+        nodes[1, pair] = idx
+    for level, subtrees in ((2, TOP_4_ZONES), (3, TOP_2_ZONES)):
+        for idx, groups in enumerate(subtrees):
+            nodes[level, groups] = idx
+    return nodes
+
+BRACKET_NODES = bracket_nodes()
+
+def path_groups():
+    """[level][group] -> groups whose winner the group's winner meets at that knockout level"""
+    # The final sits above the halves: a single node holding every group
+    nodes = np.vstack([BRACKET_NODES, np.zeros(NUM_OF_GROUPS + 1, dtype=np.intp)])
+    levels = []
+    for level in range(1, len(ROUNDS)):
+        below, same = nodes[level - 1], nodes[level]
+        levels.append([
+            [h for h in range(1, NUM_OF_GROUPS + 1) if same[h] == same[g] and below[h] != below[g]]
+            for g in range(NUM_OF_GROUPS + 1)
+        ])
+    return levels
+
+PATH_GROUPS = path_groups()
+HAS_PATH_OPPONENT = np.array([[bool(groups) for groups in level[1:]] for level in PATH_GROUPS], dtype=np.int64)
+
+
+class PathwayAnalytics:
+    """Accumulates, chunk by chunk, how often each pair of teams would first meet in
+    each round, and (given ratings) how strong each team's knockout opponents are.
+
+    strength is one rating per team in ALL_TEAMS order; each group is assumed to be
+    won by its highest-rated team, and a winner's opponent in a round is the
+    strongest winner of the groups on the other side of that bracket node.
+    """
+
+    def __init__(self, strength=None):
+        self.strength = None if strength is None else np.asarray(strength, dtype=np.float64)
+        self.num_draws = 0
+        # same_node[level, i, j]: draws in which teams i and j share the bracket node at level
+        self.same_node = np.zeros((len(BRACKET_NODES), NUM_OF_TEAMS, NUM_OF_TEAMS), dtype=np.int64)
+        self.difficulty_sum = np.zeros((len(PATH_GROUPS), NUM_OF_TEAMS))
+        self.difficulty_count = np.zeros((len(PATH_GROUPS), NUM_OF_TEAMS))
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk).astype(np.intp)
+        self.num_draws += len(chunk)
+
+        for level, nodes in enumerate(BRACKET_NODES):
+            labels = nodes[chunk]
+            for node in np.unique(nodes[1:]):
+                in_node = (labels == node).astype(np.float32)
+                self.same_node[level] += np.rint(in_node.T @ in_node).astype(np.int64)
+
+        if self.strength is not None:
+            self.update_difficulty(chunk)
+
+    def update_difficulty(self, chunk):
+        # winner[n, g]: rating of the strongest team of group g in draw n,
+        # scattering one pot at a time (each pot fills every group once)
+        winner = np.full((len(chunk), NUM_OF_GROUPS + 1), -np.inf, dtype=np.float32)
+        pot_rating = np.full_like(winner, -np.inf)
+        for columns in POT_COLUMNS:
+            ratings = np.broadcast_to(self.strength[columns], (len(chunk), len(columns)))
+            np.put_along_axis(pot_rating, chunk[:, columns], ratings, axis=1)
+            np.maximum(winner, pot_rating, out=winner)
+
+        # Groups without a group winner to meet at a level contribute nothing
+        team_groups = group_counts(chunk)
+        for level, groups_by_group in enumerate(PATH_GROUPS):
+            opponent = np.zeros((len(chunk), NUM_OF_GROUPS + 1), dtype=np.float32)
+            for group in range(1, NUM_OF_GROUPS + 1):
+                if groups_by_group[group]:
+                    opponent[:, group] = winner[:, groups_by_group[group]].max(axis=1)
+            self.difficulty_sum[level] += np.take_along_axis(opponent, chunk, axis=1).sum(axis=0)
+            self.difficulty_count[level] += team_groups @ HAS_PATH_OPPONENT[level]
+
+    def meeting_round_probabilities(self):
+        """(48 x 48 x 5) probability that two group winners first meet in each of ROUNDS"""
+        same = self.same_node / max(1, self.num_draws)
+        first_meeting = np.empty(same.shape[1:] + (len(ROUNDS),))
+        first_meeting[..., 0] = same[0]
+        for level in range(1, len(BRACKET_NODES)):
+            first_meeting[..., level] = same[level] - same[level - 1]
+        first_meeting[..., -1] = 1 - same[-1]
+        return first_meeting
+
+    def path_difficulty(self):
+        """{team: [mean opponent rating in R16, QF, SF, Final]} (nan when no group winner is met)"""
+        with np.errstate(invalid='ignore'):
+            mean = self.difficulty_sum / self.difficulty_count
+        return {team: mean[:, idx].tolist() for idx, team in enumerate(ALL_TEAMS)}
+
+
+def analyze_pathways(draws, strength=None, chunk_size=CHUNK_SIZE):
+    """Run the pathway statistics over draws (array or np.memmap) in one chunked pass"""
+    analytics = PathwayAnalytics(strength)
+    for chunk in iter_chunks(draws, chunk_size):
+        analytics.update(chunk)
+    return analytics
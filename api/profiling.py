@@ -0,0 +1,191 @@
+"""
+FIFA 2026 World Cup Draw - Request Profiling
+Opt-in CPU and memory profiles of single API requests, written for standard tools:
+
+- cpu.pstats     cProfile stats (snakeviz, flameprof, gprof2dot, pstats)
+- cpu.folded     sampled stacks in collapsed format (flamegraph.pl, speedscope, inferno)
+- memory.folded  live allocations at the end of the request by traceback, in bytes
+- memory.txt     top allocation sites by line
+- summary.json   wall time, overall peak memory and time/peak per solver section
+"""
+
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+
+from api import tracing
+
+# Profile every request, and whether requests sent with "profile": true are profiled
+# (off by default: any client could otherwise turn the profilers on)
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS', '0') == '1'
+PROFILE_ALLOW_REQUEST = os.environ.get('PROFILE_ALLOW_REQUEST', '0') == '1'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+# Stack depth kept by tracemalloc and interval of the stack sampler
+TRACEMALLOC_FRAMES = 25
+SAMPLE_INTERVAL = 0.001
+
+# One profiled request at a time: tracemalloc is process-wide, so overlapping
+# requests run unprofiled instead of mixing their allocations
+_profile_lock = threading.Lock()
+_active = None
+_counter = 0
+
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler:
+    """Samples one thread's Python stack every SAMPLE_INTERVAL, counting collapsed stacks.
+    Native code such as CpSolver.Solve shows up as the Python frame that called it."""
+
+    def __init__(self, thread_id):
+        self.thread_id = thread_id
+        self.counts = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+class RequestProfile:
+    def __init__(self, name):
+        global _counter
+        _counter += 1
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        label = re.sub(r'[^A-Za-z0-9_]', '_', str(name))[:40]
+        self.path = os.path.join(PROFILE_DIR, f"{stamp}-{label}-{os.getpid()}-{_counter}")
+        self.name = name
+        self.thread_id = threading.get_ident()
+        self.sections = []
+        # Highest traced memory seen by each open block, the request itself first.
+        # Every section resets tracemalloc's peak, so enclosing blocks fold it in first.
+        self.open_peaks = [0]
+
+    def fold_peak(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        self.open_peaks = [max(p, peak) for p in self.open_peaks]
+
+    @contextmanager
+    def section(self, name):
+        """Record the time and the peak memory above the starting point of a block"""
+        self.fold_peak()
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        self.open_peaks.append(start_memory)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fold_peak()
+            peak = self.open_peaks.pop()
+            self.sections.append({
+                'name': name,
+                'seconds': time.perf_counter() - start,
+                'peak_bytes': peak - start_memory,
+            })
+
+    def peak(self):
+        """Peak traced memory of the whole request so far"""
+        self.fold_peak()
+        return self.open_peaks[0]
+
+    def write(self, profiler, sampler, snapshot, seconds, peak):
+        os.makedirs(self.path, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.path, 'cpu.pstats'))
+
+        with open(os.path.join(self.path, 'cpu.folded'), 'w') as f:
+            for stack, count in sorted(sampler.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(self.path, 'memory.folded'), 'w') as f:
+            for stat in snapshot.statistics('traceback'):
+                frames = [f"{os.path.basename(fr.filename)}:{fr.lineno}" for fr in stat.traceback]
+                f.write(f"{';'.join(frames)} {stat.size}\n")
+
+        with open(os.path.join(self.path, 'memory.txt'), 'w') as f:
+            for stat in snapshot.statistics('lineno')[:50]:
+                f.write(f"{stat}\n")
+
+        with open(os.path.join(self.path, 'summary.json'), 'w') as f:
+            json.dump({
+                'name': self.name,
+                'seconds': seconds,
+                'peak_bytes': peak,
+                'sections': self.sections,
+            }, f, indent=2)
+
+
+def section(name, **args):
+    """Context manager timing a block of the profiled request, and recording it as a
+    span (with args) if the request is traced (see api/tracing.py). Without either
+    on this thread it is a shared no-op."""
+    profile = _active
+    if profile is None or profile.thread_id != threading.get_ident():
+        return tracing.span(name, **args)
+    if tracing.active() is None:
+        return profile.section(name)
+    stack = ExitStack()
+    stack.enter_context(profile.section(name))
+    stack.enter_context(tracing.span(name, **args))
+    return stack
+
+@contextmanager
+def profile_request(name, enabled=PROFILE_REQUESTS):
+    """Profile the block if enabled; yields the RequestProfile (or None). The
+    files are written when the block exits; a failure to write them is ignored."""
+    global _active
+    if not enabled or not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+
+    try:
+        profile = RequestProfile(name)
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        profiler = cProfile.Profile()
+        _active = profile
+        start = time.perf_counter()
+        try:
+            with StackSampler(profile.thread_id) as sampler:
+                profiler.enable()
+                try:
+                    yield profile
+                finally:
+                    profiler.disable()
+        finally:
+            _active = None
+            seconds = time.perf_counter() - start
+            peak = profile.peak()
+            # Leave out the sampler's own bookkeeping
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, __file__, all_frames=True)])
+            tracemalloc.stop()
+        try:
+            profile.write(profiler, sampler, snapshot, seconds, peak)
+        except OSError:
+            pass
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,152 @@
+"""
+FIFA 2026 World Cup Draw - Rule Sets
+Loads and validates draw rules from versioned JSON files in api/rulesets/
+"""
+
+import hashlib
+import json
+import os
+import re
+
+RULESETS_DIR = os.path.join(os.path.dirname(__file__), "rulesets")
+DEFAULT_RULESET = "fifa_world_cup_2026"
+FORMAT_VERSION = 1
+
+# Largest rule sets accepted, so one can't make the model arbitrarily large
+MAX_GROUPS = 64
+MAX_POTS = 8
+MAX_SEPARATIONS = 16
+
+
+class RuleSet:
+    """Validated draw rules, identified by the hash of their canonical JSON.
+
+    Playoff teams can appear in several confederations because their actual
+    confederation is unknown until the playoffs are decided; the solver treats
+    them as belonging to all of them. Each separation puts its teams in
+    different zones (e.g. the top 2 teams in different halves of the bracket).
+    """
+
+    def __init__(self, data):
+        validate_rules(data)
+        self.data = data
+        self.hash = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+        self.name = data["name"]
+        self.version = data["version"]
+        self.num_groups = data["num_groups"]
+        self.teams_per_group = data["teams_per_group"]
+        self.num_teams = self.num_groups * self.teams_per_group
+        self.groups = range(1, self.num_groups + 1)
+        self.teams = data["confederations"]
+        self.confederation_limits = data["confederation_limits"]
+        self.pots = data["pots"]
+        self.all_teams = [team for pot in self.pots for team in pot]
+        self.separations = [(s["name"], s["teams"], s["zones"]) for s in data["separations"]]
+        self.initial_state = data["initial_state"]
+
+        self.team_confederations = {}
+        for confederation, teams in self.teams.items():
+            for team in teams:
+                self.team_confederations.setdefault(team, []).append(confederation)
+        self.team_pot = {team: pot_idx for pot_idx, pot in enumerate(self.pots) for team in pot}
+        # (separated_teams, {group: zone}) pairs for the exact search
+        self.zone_maps = [
+            (teams, {g: zone for zone, groups in enumerate(zones) for g in groups})
+            for _, teams, zones in self.separations
+        ]
+
+    def __eq__(self, other):
+        return isinstance(other, RuleSet) and self.hash == other.hash
+
+    def __hash__(self):
+        return hash(self.hash)
+
+def validate_rules(data):
+    """Raise ValueError unless data describes a consistent draw"""
+    def check(condition, message):
+        if not condition:
+            raise ValueError(f"Invalid rules: {message}")
+
+    check(data.get("format_version") == FORMAT_VERSION, f"format_version must be {FORMAT_VERSION}")
+    for key in ("name", "version", "num_groups", "teams_per_group", "confederations",
+                "confederation_limits", "pots", "separations", "initial_state"):
+        check(key in data, f"missing '{key}'")
+
+    num_groups, pots = data["num_groups"], data["pots"]
+    check(isinstance(num_groups, int) and 1 <= num_groups <= MAX_GROUPS, f"num_groups must be 1 to {MAX_GROUPS}")
+    check(isinstance(pots, list) and 1 <= len(pots) <= MAX_POTS, f"there must be 1 to {MAX_POTS} pots")
+    check(len(data["separations"]) <= MAX_SEPARATIONS, f"at most {MAX_SEPARATIONS} separations")
+    groups = set(range(1, num_groups + 1))
+    check(len(pots) == data["teams_per_group"], "there must be one pot per group position")
+    check(all(len(pot) == num_groups for pot in pots), f"every pot must hold {num_groups} teams")
+
+    all_teams = [team for pot in pots for team in pot]
+    check(len(set(all_teams)) == len(all_teams), "a team appears in more than one pot")
+    check(len(data["confederations"]) <= len(all_teams), "more confederations than teams")
+    confederation_teams = {team for teams in data["confederations"].values() for team in teams}
+    check(confederation_teams == set(all_teams), "confederations and pots list different teams")
+
+    for confederation in data["confederations"]:
+        limits = data["confederation_limits"].get(confederation)
+        check(limits is not None, f"no limits for {confederation}")
+        check(0 <= limits["min"] <= limits["max"], f"bad limits for {confederation}")
+
+    for separation in data["separations"]:
+        check(len(separation["teams"]) == len(separation["zones"]),
+              f"separation {separation['name']} needs one zone per team")
+        check(set(separation["teams"]) <= set(all_teams), f"unknown team in separation {separation['name']}")
+        zone_groups = [g for zone in separation["zones"] for g in zone]
+        check(sorted(zone_groups) == sorted(groups), f"zones of {separation['name']} must cover every group once")
+
+    for team, group in data["initial_state"].items():
+        check(team in all_teams and group in groups, f"bad initial assignment {team} -> {group}")
+
+
+# Inline rule sets come from requests, so only the most recent ones are kept
+MAX_CACHED_RULES = 64
+
+_rules_by_hash = {}
+_rules_by_name = {}
+
+def intern_rules(data):
+    """RuleSet for data, shared with any earlier rule set of the same content"""
+    rules = RuleSet(data)
+    if rules.hash not in _rules_by_hash and len(_rules_by_hash) >= MAX_CACHED_RULES:
+        named = set(_rules_by_name.values())
+        for key in [k for k, r in _rules_by_hash.items() if r not in named][:1]:
+            del _rules_by_hash[key]
+    return _rules_by_hash.setdefault(rules.hash, rules)
+
+def load_rules(name=DEFAULT_RULESET):
+    """Load a rule set from api/rulesets/<name>.json (cached)"""
+    if name not in _rules_by_name:
+        if not re.fullmatch(r"[A-Za-z0-9_\-]+", name):
+            raise ValueError(f"Invalid rule set name: {name}")
+        path = os.path.join(RULESETS_DIR, f"{name}.json")
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown rule set: {name}")
+        with open(path) as f:
+            _rules_by_name[name] = intern_rules(json.load(f))
+    return _rules_by_name[name]
+
+def resolve_rules(spec, allow_inline=True):
+    """Rules from a request: None (default), a rule set name or, if allowed, an
+    inline rules dict"""
+    if spec is None:
+        return load_rules()
+    if isinstance(spec, str):
+        return load_rules(spec)
+    if isinstance(spec, dict):
+        if not allow_inline:
+            raise ValueError("Inline rules are disabled; use a rule set name")
+        return intern_rules(spec)
+    raise ValueError(f"Invalid rules: {spec!r}")
+
+def validate_assignments(assignments, rules):
+    """Raise ValueError unless every team is in the rule set and every group in range"""
+    unknown = [team for team in assignments if team not in rules.team_pot]
+    if unknown:
+        raise ValueError(f"Unknown teams: {', '.join(unknown)}")
+    if any(group not in rules.groups for group in assignments.values()):
+        raise ValueError(f"Groups must be between 1 and {rules.num_groups}")
@@ -0,0 +1,290 @@
+"""
+FIFA 2026 World Cup Draw - Sample Store
+Append-only, memory-mapped store of complete draws for simulation runs too large for
+memory: fixed 48-byte records (one group number per team, ALL_TEAMS order) plus an
+index of runs of records sharing a pot 1 configuration, compacted by configuration so
+a query reads only the runs it matches
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+from api.odds import group_counts
+from api.solver import ALL_TEAMS, NUM_OF_GROUPS, NUM_OF_TEAMS, POT1
+
+# Most memory a query holds at once: the mapped chunk and its temporaries
+MEMORY_LIMIT = int(os.environ.get('SAMPLE_MEMORY_LIMIT', 256 * 1024 * 1024))
+
+# Index entries appended since the last compaction that make the next append compact
+COMPACT_TAIL = int(os.environ.get('SAMPLE_COMPACT_TAIL', 65536))
+
+RECORD_SIZE = NUM_OF_TEAMS
+# Index entries: (pot 1 key, first record, number of records)
+INDEX_DTYPE = np.dtype([('key', '<u8'), ('start', '<u8'), ('count', '<u8')])
+EMPTY_INDEX = np.zeros(0, dtype=INDEX_DTYPE)
+
+TEAM_INDEX = {team: idx for idx, team in enumerate(ALL_TEAMS)}
+POT1_COLUMNS = np.array([TEAM_INDEX[team] for team in POT1])
+# 4 bits per pot 1 team's group, first team lowest
+POT1_SHIFTS = np.arange(len(POT1_COLUMNS), dtype=np.uint64) * np.uint64(4)
+
+
+def pot1_keys(draws):
+    """(N,) uint64 key of each draw's pot 1 configuration"""
+    groups = np.asarray(draws)[:, POT1_COLUMNS].astype(np.uint64)
+    return np.bitwise_or.reduce(groups << POT1_SHIFTS, axis=1)
+
+def pot1_mask(assignments):
+    """(mask, value): a draw's key k matches the assignments' pot 1 teams iff k & mask == value"""
+    mask = value = 0
+    for shift, col in zip(POT1_SHIFTS.tolist(), POT1_COLUMNS.tolist()):
+        team = ALL_TEAMS[col]
+        if team in assignments:
+            mask |= 0xF << shift
+            value |= assignments[team] << shift
+    return np.uint64(mask), np.uint64(value)
+
+def run_positions(first, count):
+    """Positions first[i] .. first[i] + count[i] - 1 of every i, concatenated"""
+    count = count.astype(np.int64)
+    offsets = first.astype(np.int64) - np.cumsum(count) + count
+    return np.repeat(offsets, count) + np.arange(count.sum())
+
+def spans_of(entries):
+    """(n, 2) int64 (start, stop) record ranges of index entries"""
+    return np.stack([entries['start'], entries['start'] + entries['count']], axis=1).astype(np.int64)
+
+
+class SampleStore:
+    """A directory with draws.u8 (records), index.u64 (runs), compact.u64 (the runs
+    by pot 1 configuration) and meta.json.
+
+    Writers sort each batch by pot 1 configuration and, holding an exclusive flock,
+    write the records after the last indexed one and then their runs to the index.
+    Records past the index's end (a writer that died mid-batch) are overwritten by
+    the next batch, so readers only ever see complete batches.
+
+    Once COMPACT_TAIL entries have been appended since, a writer folds them into
+    compact.u64: a header entry (number of keys, number of runs, index entries
+    covered), one entry per distinct key (key, its first run, number of runs) and
+    the covered runs grouped by key. It is written aside and renamed into place, so
+    readers see the old or the new one whole. A query scans the key table and the
+    entries past the covered ones, and reads the runs of matching keys only. Queries
+    map one chunk of records at a time, at most MEMORY_LIMIT bytes.
+    """
+
+    def __init__(self, path, memory_limit=MEMORY_LIMIT):
+        self.path = path
+        self.memory_limit = memory_limit
+        self.data_path = os.path.join(path, 'draws.u8')
+        self.index_path = os.path.join(path, 'index.u64')
+        self.compact_path = os.path.join(path, 'compact.u64')
+        meta_path = os.path.join(path, 'meta.json')
+
+        os.makedirs(path, exist_ok=True)
+        with self.locked():
+            if not os.path.exists(meta_path):
+                with open(meta_path, 'w') as f:
+                    json.dump({'record_size': RECORD_SIZE, 'teams': ALL_TEAMS}, f)
+                open(self.data_path, 'ab').close()
+                open(self.index_path, 'ab').close()
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta['teams'] != ALL_TEAMS:
+            raise ValueError(f"Sample store {path} holds draws of other teams")
+
+    @contextmanager
+    def locked(self):
+        """Exclusive lock on the store, across processes"""
+        with open(os.path.join(self.path, 'lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def index(self):
+        """Complete index entries, memory-mapped (empty array if none)"""
+        entries = os.path.getsize(self.index_path) // INDEX_DTYPE.itemsize
+        if entries == 0:
+            return EMPTY_INDEX
+        return np.memmap(self.index_path, dtype=INDEX_DTYPE, mode='r', shape=(entries,))
+
+    def compacted(self):
+        """(key table, runs grouped by key, number of index entries they cover), from
+        compact.u64, memory-mapped"""
+        try:
+            f = open(self.compact_path, 'rb')
+        except FileNotFoundError:
+            return EMPTY_INDEX, EMPTY_INDEX, 0
+        # Sized and mapped through one handle, in case a writer replaces the file
+        with f:
+            entries = os.fstat(f.fileno()).st_size // INDEX_DTYPE.itemsize
+            if entries == 0:
+                return EMPTY_INDEX, EMPTY_INDEX, 0
+            table = np.memmap(f, dtype=INDEX_DTYPE, mode='r', shape=(entries,))
+        num_keys, num_runs, covered = (int(table[0][field]) for field in INDEX_DTYPE.names)
+        return table[1:1 + num_keys], table[1 + num_keys:1 + num_keys + num_runs], covered
+
+    def __len__(self):
+        index = self.index()
+        return int(index[-1]['start'] + index[-1]['count']) if len(index) else 0
+
+    def append(self, draws):
+        """Add complete draws (N x 48 group numbers); safe from several processes at once"""
+        draws = np.asarray(draws, dtype=np.uint8).reshape(-1, RECORD_SIZE)
+        if not len(draws):
+            return
+        keys = pot1_keys(draws)
+        order = np.argsort(keys, kind='stable')
+        draws, keys = draws[order], keys[order]
+        run_keys, run_starts, run_counts = np.unique(keys, return_index=True, return_counts=True)
+
+        with self.locked():
+            # Drop a partial index entry left by a writer that died
+            entry_size = INDEX_DTYPE.itemsize
+            index_size = os.path.getsize(self.index_path)
+            if index_size % entry_size:
+                os.truncate(self.index_path, index_size - index_size % entry_size)
+            first = len(self)
+
+            with open(self.data_path, 'r+b') as f:
+                f.seek(first * RECORD_SIZE)
+                f.write(draws.tobytes())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+
+            runs = np.zeros(len(run_keys), dtype=INDEX_DTYPE)
+            runs['key'] = run_keys
+            runs['start'] = run_starts + first
+            runs['count'] = run_counts
+            with open(self.index_path, 'ab') as f:
+                f.write(runs.tobytes())
+
+            if len(self.index()) - self.compacted()[2] >= COMPACT_TAIL:
+                self._compact()
+
+    def compact(self):
+        """Fold every index entry appended since the last compaction into compact.u64"""
+        with self.locked():
+            self._compact()
+
+    def _compact(self):
+        # Called holding the lock
+        _, runs, covered = self.compacted()
+        index = self.index()
+        if len(index) == covered:
+            return
+        # Stable: a key's runs stay in record order, the covered ones first
+        entries = np.concatenate([runs, index[covered:]])
+        entries = entries[np.argsort(entries['key'], kind='stable')]
+        keys, first, count = np.unique(entries['key'], return_index=True, return_counts=True)
+
+        header = np.array([(len(keys), len(entries), len(index))], dtype=INDEX_DTYPE)
+        table = np.zeros(len(keys), dtype=INDEX_DTYPE)
+        table['key'] = keys
+        table['start'] = first
+        table['count'] = count
+        partial = self.compact_path + '.tmp'
+        with open(partial, 'wb') as f:
+            for part in (header, table, entries):
+                f.write(part.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, self.compact_path)
+
+    def ranges(self, assignments):
+        """Sorted, merged (start, stop) record ranges whose pot 1 configuration matches"""
+        mask, value = pot1_mask(assignments)
+        # Compacted first: the index only grows past the entries it covers
+        keys, runs, covered = self.compacted()
+        tail = self.index()[covered:]
+        selected = []
+        # The key table and the tail can be large too: scan them in chunks
+        step = max(1, self.memory_limit // (4 * INDEX_DTYPE.itemsize))
+        for offset in range(0, len(keys), step):
+            table = keys[offset:offset + step]
+            hits = table[(table['key'] & mask) == value]
+            if len(hits):
+                selected.append(spans_of(runs[run_positions(hits['start'], hits['count'])]))
+        for offset in range(0, len(tail), step):
+            entries = tail[offset:offset + step]
+            selected.append(spans_of(entries[(entries['key'] & mask) == value]))
+        if not selected:
+            return []
+        spans = np.concatenate(selected)
+        spans = spans[np.argsort(spans[:, 0], kind='stable')]
+
+        merged = []
+        for start, stop in spans.tolist():
+            if merged and merged[-1][1] == start:
+                merged[-1][1] = stop
+            else:
+                merged.append([start, stop])
+        return merged
+
+    def chunk_rows(self):
+        # The mapped records, the comparison against the filter and the selected rows
+        return max(1, self.memory_limit // (3 * RECORD_SIZE))
+
+    def query(self, assignments=None, chunk_rows=None):
+        """Yield chunks (n x 48 uint8) of the draws agreeing with every assignment.
+
+        Only runs whose pot 1 configuration matches are read. A chunk is a zero-copy
+        view of the mapped file when it covers one contiguous run and every assignment
+        is a pot 1 team, and a copy of the matching rows otherwise."""
+        assignments = assignments or {}
+        unknown = [team for team in assignments if team not in TEAM_INDEX]
+        if unknown:
+            raise ValueError(f"Unknown teams: {', '.join(unknown)}")
+        if any(group not in range(1, NUM_OF_GROUPS + 1) for group in assignments.values()):
+            raise ValueError(f"Groups must be between 1 and {NUM_OF_GROUPS}")
+        cols = np.array([TEAM_INDEX[team] for team in assignments if team not in POT1], dtype=np.intp)
+        groups = np.array([group for team, group in assignments.items() if team not in POT1], dtype=np.uint8)
+        chunk_rows = chunk_rows or self.chunk_rows()
+
+        for window_start, window_stop, spans in self.windows(self.ranges(assignments), chunk_rows):
+            # A map per window: its pages are released with it, keeping memory bounded
+            chunk = np.memmap(self.data_path, dtype=np.uint8, mode='r', offset=window_start * RECORD_SIZE,
+                              shape=(window_stop - window_start, RECORD_SIZE))
+            if len(spans) > 1:
+                chunk = chunk[np.concatenate([np.arange(start, stop) for start, stop in spans]) - window_start]
+            if len(cols):
+                chunk = chunk[(chunk[:, cols] == groups).all(axis=1)]
+            if len(chunk):
+                yield chunk
+
+    @staticmethod
+    def windows(ranges, chunk_rows):
+        """(start, stop, ranges inside) spanning at most chunk_rows records each, so
+        many small runs share one map and long ones are split"""
+        window = None
+        for start, stop in ranges:
+            while start < stop:
+                if window is not None and min(stop, start + chunk_rows) - window[0] > chunk_rows:
+                    yield window[0], window[1], window[2]
+                    window = None
+                if window is None:
+                    window = [start, start, []]
+                end = min(stop, window[0] + chunk_rows)
+                window[1] = end
+                window[2].append((start, end))
+                start = end
+        if window is not None:
+            yield window[0], window[1], window[2]
+
+    def count(self, assignments=None):
+        return sum(len(chunk) for chunk in self.query(assignments))
+
+    def group_counts(self, assignments=None):
+        """48 x 12 counts of each team in each group over the matching draws"""
+        counts = np.zeros((NUM_OF_TEAMS, NUM_OF_GROUPS), dtype=np.int64)
+        for chunk in self.query(assignments):
+            counts += group_counts(chunk)
+        return counts
+
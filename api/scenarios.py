@@ -0,0 +1,143 @@
+"""
+FIFA 2026 World Cup Draw - Playoff Scenarios
+Group distributions for every resolution of the playoff placeholders (YA, ZA)
+"""
+
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from ortools.sat.python import cp_model
+
+from api.solver import (
+    GROUPS, NUM_OF_TEAMS, TEAMS, CONFEDERATION_LIMITS, TEAM_CONFEDERATIONS,
+    addIntEqValFlag, addPotConstraints, addSeparationConstraints,
+    create_solver, create_team_group_map, ExactSearchExhausted, find_completion, get_occupied_groups, get_pot,
+    simulate_draw, ENDGAME_MAX_UNASSIGNED,
+)
+from api.odds import draws_to_array, group_counts
+
+# Placeholders listed under several confederations, with the candidate behind each one.
+# The four UEFA play-off winners are UEFA whichever path wins, so they never change the draw.
+PLAYOFF_CANDIDATES = {
+    "YA": {"CAF": "DR Congo", "CONCACAF": "Jamaica", "OFC": "New Caledonia"},
+    "ZA": {"AFC": "Iraq", "CONCACAF": "Suriname", "CONMEBOL": "Bolivia"},
+}
+assert all(sorted(TEAM_CONFEDERATIONS[p]) == sorted(c) for p, c in PLAYOFF_CANDIDATES.items())
+
+# None keeps every candidate confederation (the live draw, before the playoffs)
+SCENARIOS = [None] + [
+    dict(zip(PLAYOFF_CANDIDATES, resolution))
+    for resolution in itertools.product(*(sorted(c) for c in PLAYOFF_CANDIDATES.values()))
+]
+
+
+def scenario_name(scenario):
+    if scenario is None:
+        return "unresolved"
+    return " + ".join(PLAYOFF_CANDIDATES[p][c] for p, c in scenario.items())
+
+def scenario_confederations(scenario):
+    """TEAM_CONFEDERATIONS with each resolved placeholder in its winner's confederation only"""
+    if scenario is None:
+        return TEAM_CONFEDERATIONS
+    return {**TEAM_CONFEDERATIONS, **{p: [c] for p, c in scenario.items()}}
+
+
+class CompiledDrawModel:
+    """One CP model for every scenario: placeholder memberships and fixed assignments
+    are assumption literals, so switching scenario or state never rebuilds the model."""
+
+    def __init__(self):
+        self.model = cp_model.CpModel()
+        team_group = create_team_group_map(self.model)
+        addPotConstraints(self.model, team_group)
+        addSeparationConstraints(self.model, team_group)
+
+        self.in_group = {
+            t: {g: addIntEqValFlag(self.model, team_group[t], g, f'{t}_in_{g}') for g in GROUPS}
+            for t in team_group
+        }
+        self.membership = {
+            (p, c): self.model.NewBoolVar(f'{p}_is_{c}')
+            for p, candidates in PLAYOFF_CANDIDATES.items() for c in candidates
+        }
+        self.addConfederationConstraints()
+
+    def addConfederationConstraints(self):
+        for confederation, teams in TEAMS.items():
+            for group in GROUPS:
+                teams_in_group = []
+                for team in teams:
+                    t_in_g = self.in_group[team][group]
+                    if team in PLAYOFF_CANDIDATES:
+                        # Counts only while the placeholder belongs to this confederation
+                        member = self.membership[(team, confederation)]
+                        counted = self.model.NewBoolVar(f'{team}_counts_{confederation}_{group}')
+                        self.model.AddBoolAnd([t_in_g, member]).OnlyEnforceIf(counted)
+                        self.model.AddBoolOr([t_in_g.Not(), member.Not()]).OnlyEnforceIf(counted.Not())
+                        t_in_g = counted
+                    teams_in_group.append(t_in_g)
+
+                self.model.Add(sum(teams_in_group) >= CONFEDERATION_LIMITS[confederation]["min"])
+                self.model.Add(sum(teams_in_group) <= CONFEDERATION_LIMITS[confederation]["max"])
+
+    def check_feasibility(self, fixed_assignments, scenario=None):
+        literals = [self.in_group[t][g] for t, g in fixed_assignments.items()]
+        for (p, c), member in self.membership.items():
+            literals.append(member if scenario is None or scenario[p] == c else member.Not())
+
+        self.model.ClearAssumptions()
+        self.model.AddAssumptions(literals)
+        result = create_solver().Solve(self.model)
+        return result == cp_model.OPTIMAL or result == cp_model.FEASIBLE
+
+
+_compiled_model = None
+
+def get_compiled_model():
+    """The model is compiled once per process and shared by all scenarios it runs"""
+    global _compiled_model
+    if _compiled_model is None:
+        _compiled_model = CompiledDrawModel()
+    return _compiled_model
+
+def scenario_valid_group(scenario):
+    """get_valid_group_for_team equivalent for one scenario"""
+    team_confederations = scenario_confederations(scenario)
+    compiled = get_compiled_model()
+
+    def valid_group(team, current_assignments):
+        occupied_groups = get_occupied_groups(get_pot(team), current_assignments)
+        exact = NUM_OF_TEAMS - len(current_assignments) <= ENDGAME_MAX_UNASSIGNED
+        for group in GROUPS:
+            if group in occupied_groups:
+                continue
+            test_assignments = {**current_assignments, team: group}
+            feasible = None
+            if exact:
+                try:
+                    feasible = find_completion(test_assignments, team_confederations) is not None
+                except ExactSearchExhausted:
+                    pass
+            if feasible is None:
+                feasible = compiled.check_feasibility(test_assignments, scenario)
+            if feasible:
+                return group
+        return None
+
+    return valid_group
+
+def simulate_scenario(scenario, seeds):
+    """Complete draws for one scenario as an N x 48 array (one draw per seed)"""
+    valid_group = scenario_valid_group(scenario)
+    return draws_to_array([simulate_draw(random.Random(seed), valid_group=valid_group) for seed in seeds])
+
+def sweep_scenarios(num_draws, seed=2026, workers=None):
+    """{scenario index: 48 x 12 group probabilities}, scenarios run in parallel.
+    Every scenario uses the same seeds, so differences are not sampling noise
+    from different team orders."""
+    seeds = [seed + i for i in range(num_draws)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        draws = list(executor.map(simulate_scenario, SCENARIOS, [seeds] * len(SCENARIOS)))
+    return {idx: group_counts(d) / len(d) for idx, d in enumerate(draws)}
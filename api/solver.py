@@ -3,58 +3,75 @@ FIFA 2026 World Cup Draw - Constraint Solver
 Handles constraint checking with OR-Tools CP-SAT solver
 """
 
+import json
+import multiprocessing
+import os
+import random
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
+
+from google.protobuf import json_format
 from ortools.sat.python import cp_model
 
+from api import profiling
+from api.feasibility_cache import FEASIBLE, NO_GROUP, VALID_GROUP, cache_key, get_feasibility_cache
+from api.rules import load_rules
+from api.witnesses import get_witness_store
+
 # =============================================================================
 # TEAM DATA
 # =============================================================================
 
-# Playoff teams (YA, ZA) appear in multiple confederations because their actual
-# confederation is unknown until the playoffs are decided. The solver treats them
-# as potentially belonging to any of those confederations for constraint purposes.
-TEAMS = {
-    "CONCACAF": ["NA", "NB", "NC", "ND", "NE", "NF", "YA", "ZA"],
-    "CONMEBOL": ["CA", "CB", "CC", "CD", "CE", "CF", "ZA"],
-    "UEFA":     ["EA", "EB", "EC", "ED", "EE", "EF", "EG", "EH", "EI", "EJ", "EK", "EL", "EM", "EN", "EO", "EP"],
-    "CAF":      ["FA", "FB", "FC", "FD", "FE", "FF", "FG", "FH", "FI", "YA"],
-    "AFC":      ["AA", "AB", "AC", "AD", "AE", "AF", "AG", "AH", "ZA"],
-    "OFC":      ["XA", "YA"],
-}
-
-NUM_OF_GROUPS = 12
-TEAMS_PER_GROUP = 4
-NUM_OF_TEAMS = NUM_OF_GROUPS * TEAMS_PER_GROUP
-
-# Confederation constraints per group. Playoff teams (YA, ZA) are handled through
-# their potential confederations in TEAMS, so no separate "PLAYOFF" entry is needed.
-CONFEDERATION_LIMITS = {
-    "CONCACAF": {"min": 0, "max": 1},
-    "CONMEBOL": {"min": 0, "max": 1},
-    "CAF":      {"min": 0, "max": 1},
-    "AFC":      {"min": 0, "max": 1},
-    "OFC":      {"min": 0, "max": 1},
-    "UEFA":     {"min": 1, "max": 2},
-}
-
-POT1 = ["NA", "NB", "NC", "CA", "CB", "EA", "EB", "EC", "ED", "EE", "EF", "EG"]
-POT2 = ["CC", "CD", "CE", "EH", "EI", "EJ", "FA", "FB", "AA", "AB", "AC", "AD"]
-POT3 = ["ND", "CF", "EK", "EL", "FC", "FD", "FE", "FF", "FG", "AE", "AF", "AG"]
-POT4 = ["NE", "NF", "EM", "EN", "EO", "EP", "FH", "FI", "AH", "XA", "YA", "ZA"]
-ALL_POTS = [POT1, POT2, POT3, POT4]
-GROUPS = range(1, NUM_OF_GROUPS + 1)
-
-TOP_2_TEAMS = ["CA", "EA"] # Top 2 teams, each one must be in different 'half'
-TOP_4_TEAMS = ["CA", "EA", "EB", "EC"] # Top 4 teams, each one must be in a different 'zone'
-TOP_4_ZONES = [
-    [1, 3, 12],   # Zone 1: A, C, L
-    [2, 10, 11],  # Zone 2: B, J, K
-    [4, 7, 8],    # Zone 3: D, G, H
-    [5, 6, 9],    # Zone 4: E, F, I
-]
-TOP_2_ZONES = [
-    TOP_4_ZONES[0] + TOP_4_ZONES[1],
-    TOP_4_ZONES[2] + TOP_4_ZONES[3]
-]
+# The rules live in api/rulesets/*.json (see api/rules.py). These constants are
+# the default rule set, kept for code that only deals with the 2026 draw.
+DEFAULT_RULES = load_rules()
+
+TEAMS = DEFAULT_RULES.teams
+NUM_OF_GROUPS = DEFAULT_RULES.num_groups
+TEAMS_PER_GROUP = DEFAULT_RULES.teams_per_group
+NUM_OF_TEAMS = DEFAULT_RULES.num_teams
+CONFEDERATION_LIMITS = DEFAULT_RULES.confederation_limits
+
+POT1, POT2, POT3, POT4 = DEFAULT_RULES.pots
+ALL_POTS = DEFAULT_RULES.pots
+ALL_TEAMS = DEFAULT_RULES.all_teams
+GROUPS = DEFAULT_RULES.groups
+
+(_, TOP_2_TEAMS, TOP_2_ZONES), (_, TOP_4_TEAMS, TOP_4_ZONES) = DEFAULT_RULES.separations
+
+# Number of templates kept by get_model_template (one per rule set)
+MAX_MODEL_TEMPLATES = 16
+
+# Number of unassigned teams at or below which get_valid_group_for_team uses the
+# exact backtracking search instead of CP-SAT (see tools/bench_endgame.py: the
+# exact search wins up to ~22 teams left and falls off a cliff right after).
+# Capped: with 28 teams left a single exact probe can run for minutes.
+MAX_ENDGAME_UNASSIGNED = 24
+ENDGAME_MAX_UNASSIGNED = min(int(os.environ.get("ENDGAME_MAX_UNASSIGNED", 20)), MAX_ENDGAME_UNASSIGNED)
+
+# Search nodes the exact search may visit before the probe is handed to CP-SAT.
+# Endgame probes need a few hundred at most; the search visits ~5000 a second.
+EXACT_NODE_LIMIT = int(os.environ.get("EXACT_NODE_LIMIT", 2000))
+
+# Probe all candidate groups of a team at once in a process pool instead of one
+# after another. The answer is still the lowest-numbered valid group.
+PARALLEL_PROBES = os.environ.get("PARALLEL_PROBES", "0") == "1"
+PROBE_WORKERS = int(os.environ.get("PROBE_WORKERS", os.cpu_count() or 1))
+
+# Keep the complete draws found by probes (see api/witnesses.py): a later probe
+# consistent with any of them is answered without a search, and otherwise the
+# latest one is passed to CP-SAT as a hint.
+WITNESS_REUSE = os.environ.get("WITNESS_REUSE", "1") == "1"
+
+# Keep proven answers of check_feasibility and get_valid_group_for_team in memory and
+# in a SQLite file shared by worker processes (see api/feasibility_cache.py)
+FEASIBILITY_CACHE = os.environ.get("FEASIBILITY_CACHE", "1") == "1"
+
+# CP-SAT parameters picked by tools/tune_solver.py, applied on top of the time limit
+SOLVER_PARAMS_FILE = os.environ.get(
+    "SOLVER_PARAMS_FILE", os.path.join(os.path.dirname(__file__), "solver_params.json"))
 
 # =============================================================================
 # CP MODEL HELPERS
@@ -90,43 +107,42 @@ def create_team_subgroup_map(model, namespace, teams, lb, ub):
 
     return team_subgroup
 
-def create_team_group_map(model):
+def create_team_group_map(model, rules=DEFAULT_RULES):
     all_teams = []
-    for _, teams in TEAMS.items():
+    for _, teams in rules.teams.items():
         all_teams += teams
     all_teams = list(set(all_teams))
-    assert len(all_teams) == NUM_OF_TEAMS, f"len(all_teams): {len(all_teams)} must be equal to NUM_OF_TEAMS: {NUM_OF_TEAMS}"
+    assert len(all_teams) == rules.num_teams, f"len(all_teams): {len(all_teams)} must be equal to num_teams: {rules.num_teams}"
 
-    return create_team_subgroup_map(model, "", all_teams, 1, NUM_OF_GROUPS)
+    return create_team_subgroup_map(model, "", all_teams, 1, rules.num_groups)
 
 
 # =============================================================================
 # CONSTRAINTS
 # =============================================================================
 
-def addPotConstraints(model, team_group):
+def addPotConstraints(model, team_group, rules=DEFAULT_RULES):
     ''' All teams in a pot must go to a different group'''
-    for pot in ALL_POTS:
+    for pot in rules.pots:
         model.AddAllDifferent([team_group[t] for t in pot])
 
-def addConfederationConstraints(model, team_group):
-    for confederation, teams in TEAMS.items():
-        for group in GROUPS:
+def addConfederationConstraints(model, team_group, rules=DEFAULT_RULES):
+    for confederation, teams in rules.teams.items():
+        for group in rules.groups:
             teams_in_group = []
             for team in teams:
                 t_in_g = addIntEqValFlag(model, team_group[team], group, f'{team}_in_{group}')
                 teams_in_group.append(t_in_g)
 
-            lb = CONFEDERATION_LIMITS[confederation]["min"]
-            ub = CONFEDERATION_LIMITS[confederation]["max"]
+            lb = rules.confederation_limits[confederation]["min"]
+            ub = rules.confederation_limits[confederation]["max"]
             model.Add(sum(teams_in_group) >= lb)
             model.Add(sum(teams_in_group) <= ub)
 
-def addTop2TeamsConstraints(model, team_group):
-    addSeparateTeamsConstraint(model, team_group, "t2", TOP_2_TEAMS, TOP_2_ZONES)
-
-def addTop4TeamsConstraints(model, team_group):
-    addSeparateTeamsConstraint(model, team_group, "t4", TOP_4_TEAMS, TOP_4_ZONES)
+def addSeparationConstraints(model, team_group, rules=DEFAULT_RULES):
+    """Top 2 teams in different halves, top 4 in different zones (or the rule set's own)"""
+    for namespace, separated_teams, zones in rules.separations:
+        addSeparateTeamsConstraint(model, team_group, namespace, separated_teams, zones)
 
 def addFixedAssignments(model, team_group, fixed_assignments):
     if fixed_assignments:
@@ -137,29 +153,345 @@ def addFixedAssignments(model, team_group, fixed_assignments):
 # MODEL CREATION AND SOLVING
 # =============================================================================
 
-def create_model(fixed_assignments=None):
+def create_model(fixed_assignments=None, rules=DEFAULT_RULES):
     """Create CP model with all FIFA draw constraints"""
     model = cp_model.CpModel()
-    team_group = create_team_group_map(model)
+    team_group = create_team_group_map(model, rules)
 
-    addPotConstraints(model, team_group)
-    addConfederationConstraints(model, team_group)
-    addTop2TeamsConstraints(model, team_group)
-    addTop4TeamsConstraints(model, team_group)
+    addPotConstraints(model, team_group, rules)
+    addConfederationConstraints(model, team_group, rules)
+    addSeparationConstraints(model, team_group, rules)
 
     addFixedAssignments(model, team_group, fixed_assignments) # For host teams and for simulations
     return model, team_group
 
-def check_feasibility(fixed_assignments):
-    """Check if valid completion exists"""
-    model, _ = create_model(fixed_assignments)
+class ModelTemplate:
+    """A rule set's model built once; each check copies the proto and pins the
+    fixed teams' domains instead of rebuilding every constraint in Python"""
+
+    def __init__(self, rules):
+        self.model, team_group = create_model(rules=rules)
+        self.var_index = {team: var.Index() for team, var in team_group.items()}
+        self.groups = rules.groups
+
+    def instantiate(self, fixed_assignments, hint=None):
+        model = self.model.Clone()
+        proto = model.Proto()
+        for team, group in fixed_assignments.items():
+            if team not in self.var_index or group not in self.groups:
+                # No draw satisfies it: an empty clause makes the model infeasible
+                model.AddBoolOr([])
+                continue
+            domain = proto.variables[self.var_index[team]].domain
+            del domain[:]
+            domain.extend([group, group])
+        if hint:
+            proto.solution_hint.vars.extend(self.var_index[team] for team in hint)
+            proto.solution_hint.values.extend(hint.values())
+        return model
+
+    def solution(self, solver):
+        """Complete assignment {team: group} from a solver that found a solution"""
+        values = solver.ResponseProto().solution
+        return {team: values[idx] for team, idx in self.var_index.items()}
+
+_model_templates = OrderedDict()
+_model_templates_lock = threading.Lock()
+
+def get_model_template(rules=DEFAULT_RULES):
+    """Template for the rule set, built on first use and cached by rules hash"""
+    with _model_templates_lock:
+        template = _model_templates.get(rules.hash)
+        if template is None:
+            with profiling.section("create_model"):
+                template = ModelTemplate(rules)
+            _model_templates[rules.hash] = template
+            if len(_model_templates) > MAX_MODEL_TEMPLATES:
+                _model_templates.popitem(last=False)
+        _model_templates.move_to_end(rules.hash)
+        return template
+
+@contextmanager
+def stop_search_on(solver, cancel):
+    """Stop the solver's search as soon as the cancel event is set"""
+    if cancel is None:
+        yield
+        return
+
+    finished = threading.Event()
+
+    def watch():
+        while not finished.is_set():
+            if cancel.wait(0.01):
+                solver.StopSearch()
+                return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        finished.set()
+        watcher.join()
+
+def load_solver_params(path=SOLVER_PARAMS_FILE):
+    """Load tuned CP-SAT parameters, or none if the file does not exist"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["parameters"]
+
+SOLVER_PARAMS = load_solver_params()
+
+def create_solver(params=None):
+    """CpSolver with the 5 second limit and the tuned (or given) parameters"""
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 5
-    result = solver.Solve(model)
-    return result == cp_model.OPTIMAL or result == cp_model.FEASIBLE
+    json_format.ParseDict(SOLVER_PARAMS if params is None else params, solver.parameters)
+    return solver
+
+def run_completion(fixed_assignments, cancel=None, rules=DEFAULT_RULES, hint=None):
+    """(CP-SAT status, complete draw or None); the status is None if cancelled before solving"""
+    template = get_model_template(rules)
+    with profiling.section("instantiate_model"):
+        model = template.instantiate(fixed_assignments, hint)
+    if cancel is not None and cancel.is_set():
+        return None, None
+    solver = create_solver()
+    with stop_search_on(solver, cancel), profiling.section("solve"):
+        result = solver.Solve(model)
+    if result == cp_model.OPTIMAL or result == cp_model.FEASIBLE:
+        return result, template.solution(solver)
+    return result, None
+
+def solve_completion(fixed_assignments, cancel=None, rules=DEFAULT_RULES, hint=None):
+    """Complete valid draw extending fixed_assignments found by CP-SAT, or None if
+    there is none (or the search was cancelled). hint is a complete draw to start from."""
+    return run_completion(fixed_assignments, cancel, rules, hint)[1]
+
+# How feasibility checks were answered: "cache", "witness" (no search), "exact"
+# or "cp-sat" ("exact_exhausted": exact searches left to CP-SAT). Each worker
+# process of the parallel probes keeps its own counts.
+PROBE_STATS = Counter()
+
+def check_with_witnesses(fixed_assignments, engine, search, rules=DEFAULT_RULES):
+    """Answer from a stored witness if one is consistent, else run search(hint)
+    (a complete draw or None) and store the draw it finds"""
+    if not WITNESS_REUSE:
+        PROBE_STATS[engine] += 1
+        return search(None) is not None
+
+    store = get_witness_store(rules)
+    with profiling.section("witness_lookup"):
+        witness = store.find(fixed_assignments)
+    if witness is not None:
+        PROBE_STATS["witness"] += 1
+        return True
+
+    PROBE_STATS[engine] += 1
+    completion = search(store.last)
+    if completion is not None:
+        store.add(completion)
+    return completion is not None
+
+def cached_answer(kind, rules, assignments, team=None):
+    """(key, cached value or None); the key is None when caching is off"""
+    if not FEASIBILITY_CACHE:
+        return None, None
+    key = cache_key(kind, rules, assignments, team)
+    with profiling.section("cache_lookup"):
+        return key, get_feasibility_cache().get(key)
+
+def feasibility(fixed_assignments, cancel=None, rules=DEFAULT_RULES):
+    """True or False, or None if CP-SAT stopped without proving either (cancelled or out of time)"""
+    key, cached = cached_answer(FEASIBLE, rules, fixed_assignments)
+    if cached is not None:
+        PROBE_STATS["cache"] += 1
+        return bool(cached)
+
+    statuses = []
+    def search(hint):
+        status, completion = run_completion(fixed_assignments, cancel, rules, hint)
+        statuses.append(status)
+        return completion
+
+    feasible = check_with_witnesses(fixed_assignments, "cp-sat", search, rules)
+    if not feasible and statuses[-1] != cp_model.INFEASIBLE:
+        return None
+    if key is not None:
+        get_feasibility_cache().put(key, int(feasible))
+    return feasible
+
+def check_feasibility(fixed_assignments, cancel=None, rules=DEFAULT_RULES):
+    """Check if valid completion exists (a cancelled search reports False)"""
+    return bool(feasibility(fixed_assignments, cancel, rules))
+
+# =============================================================================
+# EXACT ENDGAME SEARCH
+# =============================================================================
+
+TEAM_CONFEDERATIONS = DEFAULT_RULES.team_confederations
+
+def has_matching(teams, domains, capacity):
+    """Check every team can take its own slot in a group of its domain (Kuhn's augmenting paths)"""
+    holders = {}
+
+    def augment(team, visited):
+        for group in domains[team]:
+            if group in visited:
+                continue
+            visited.add(group)
+            slots = holders.setdefault(group, [])
+            if len(slots) < capacity(group):
+                slots.append(team)
+                return True
+            for idx, other in enumerate(slots):
+                if augment(other, visited):
+                    slots[idx] = team
+                    return True
+        return False
+
+    return all(augment(team, set()) for team in teams)
+
+class ExactSearchExhausted(Exception):
+    """The exact search visited its node limit without an answer"""
+
+def find_completion(fixed_assignments, team_confederations=None, rules=DEFAULT_RULES, cancel=None,
+                    max_nodes=EXACT_NODE_LIMIT):
+    """Exact backtracking search for a complete valid draw (None if there is none).
+    team_confederations overrides the rule set's, e.g. for resolved playoff teams.
+    Raises ExactSearchExhausted after max_nodes nodes (None: no limit) and
+    SearchCancelled once cancel is set."""
+    team_confederations = team_confederations or rules.team_confederations
+    team_pot = rules.team_pot
+    limits = rules.confederation_limits
+    assignments = {}
+    conf_count = {c: [0] * (rules.num_groups + 1) for c in rules.teams}
+    pot_groups = [set() for _ in rules.pots]
+    zone_holder = [{} for _ in rules.zone_maps]
+
+    def can_place(team, group):
+        if group in pot_groups[team_pot[team]]:
+            return False
+        for c in team_confederations[team]:
+            if conf_count[c][group] >= limits[c]["max"]:
+                return False
+        for sep_idx, (separated_teams, zone_of) in enumerate(rules.zone_maps):
+            if team in separated_teams and zone_holder[sep_idx].get(zone_of[group], team) != team:
+                return False
+        return True
+
+    def place(team, group, delta):
+        if delta > 0:
+            assignments[team] = group
+            pot_groups[team_pot[team]].add(group)
+        else:
+            del assignments[team]
+            pot_groups[team_pot[team]].discard(group)
+        for c in team_confederations[team]:
+            conf_count[c][group] += delta
+        for sep_idx, (separated_teams, zone_of) in enumerate(rules.zone_maps):
+            if team in separated_teams:
+                if delta > 0:
+                    zone_holder[sep_idx][zone_of[group]] = team
+                else:
+                    del zone_holder[sep_idx][zone_of[group]]
+
+    def minimums_reachable(unassigned, domains):
+        for c, conf_limits in limits.items():
+            if conf_limits["min"] == 0:
+                continue
+            candidates = [t for t in unassigned if c in team_confederations[t]]
+            total_deficit = 0
+            for g in rules.groups:
+                deficit = conf_limits["min"] - conf_count[c][g]
+                if deficit <= 0:
+                    continue
+                total_deficit += deficit
+                if sum(1 for t in candidates if g in domains[t]) < deficit:
+                    return False
+            if total_deficit > len(candidates):
+                return False
+        return True
+
+    def matchings_exist(unassigned, domains):
+        for pot_idx in range(len(rules.pots)):
+            pot_teams = [t for t in unassigned if team_pot[t] == pot_idx]
+            if not has_matching(pot_teams, domains, lambda g: 1):
+                return False
+        for c in rules.teams:
+            conf_teams = [t for t in unassigned if c in team_confederations[t]]
+            room = lambda g: limits[c]["max"] - conf_count[c][g]
+            if not has_matching(conf_teams, domains, room):
+                return False
+        return True
+
+    nodes = 0
+
+    def search(unassigned):
+        nonlocal nodes
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise ExactSearchExhausted(f"No answer within {max_nodes} nodes")
+        raise_if_cancelled(cancel)
+        if not unassigned:
+            return minimums_reachable(unassigned, {})
+
+        domains = {t: [g for g in rules.groups if can_place(t, g)] for t in unassigned}
+        if not all(domains.values()) or not minimums_reachable(unassigned, domains):
+            return False
+        if not matchings_exist(unassigned, domains):
+            return False
+
+        team = min(unassigned, key=lambda t: len(domains[t]))
+        rest = [t for t in unassigned if t != team]
+        for group in domains[team]:
+            place(team, group, 1)
+            if search(rest):
+                return True
+            place(team, group, -1)
+        return False
+
+    for team, group in fixed_assignments.items():
+        if team not in team_pot or team in assignments or group not in rules.groups or not can_place(team, group):
+            return None
+        place(team, group, 1)
+
+    if search([t for t in rules.all_teams if t not in assignments]):
+        return assignments
+    return None
+
+def check_feasibility_exact(fixed_assignments, rules=DEFAULT_RULES, cancel=None):
+    """Check if valid completion exists without building a CP model. A search
+    exceeding EXACT_NODE_LIMIT is left to CP-SAT; True or False, or None if
+    cancelled or unproven."""
+    key, cached = cached_answer(FEASIBLE, rules, fixed_assignments)
+    if cached is not None:
+        PROBE_STATS["cache"] += 1
+        return bool(cached)
+
+    def search(hint):
+        with profiling.section("exact_search"):
+            return find_completion(fixed_assignments, rules=rules, cancel=cancel)
+
+    try:
+        feasible = check_with_witnesses(fixed_assignments, "exact", search, rules)
+    except ExactSearchExhausted:
+        PROBE_STATS["exact_exhausted"] += 1
+        return feasibility(fixed_assignments, cancel, rules)
+    except SearchCancelled:
+        return None
+    # A finished exact search is proven
+    if key is not None:
+        get_feasibility_cache().put(key, int(feasible))
+    return feasible
+
+# =============================================================================
+# DRAW PROCEDURE
+# =============================================================================
 
-def get_pot(team):
-    for pot in ALL_POTS:
+def get_pot(team, rules=DEFAULT_RULES):
+    for pot in rules.pots:
         if team in pot:
             return pot
 
@@ -173,40 +505,144 @@ def get_occupied_groups(pot, current_assignments):
 
     return occupied_groups
 
-def get_valid_group_for_team(team, current_assignments):
-    """Get the first valid group for a team (lowest-numbered)"""
-    pot = get_pot(team)
-    occupied_groups = get_occupied_groups(pot, current_assignments)
-
-    # Try each group in order, return first valid one
-    for group in GROUPS:
-        if group in occupied_groups:
-            continue
-
+def worker_context():
+    """Start method of worker processes: forked from a separate single-threaded server
+    process, never from a request thread, whose siblings may hold locks (the
+    feasibility cache's, the model templates', the witness stores') a forked child
+    would inherit held"""
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["api.solver"])
+    return context
+
+_probe_pool = None
+_probe_pool_lock = threading.Lock()
+
+def get_probe_pool():
+    """Lazily start the worker processes (and the manager for cancel events)"""
+    global _probe_pool
+    with _probe_pool_lock:
+        if _probe_pool is None:
+            context = worker_context()
+            _probe_pool = (ProcessPoolExecutor(max_workers=PROBE_WORKERS, mp_context=context), context.Manager())
+        return _probe_pool
+
+def probe_group(test_assignments, exact, cancel=None, rules=DEFAULT_RULES):
+    """True or False, or None if the probe was cut short"""
+    if exact:
+        return check_feasibility_exact(test_assignments, rules, cancel)
+    return feasibility(test_assignments, cancel, rules)
+
+class SearchCancelled(Exception):
+    """The request the search was for was cancelled (or its client went away)"""
+
+def raise_if_cancelled(cancel):
+    if cancel is not None and cancel.is_set():
+        raise SearchCancelled("Search cancelled")
+
+def first_valid_group_parallel(team, current_assignments, candidates, exact, rules=DEFAULT_RULES, cancel=None):
+    """Probe every candidate at once, answering in the same order as the sequential scan"""
+    executor, manager = get_probe_pool()
+    probes_cancel = manager.Event()
+    futures = [
+        executor.submit(probe_group, {**current_assignments, team: group}, exact, probes_cancel, rules)
+        for group in candidates
+    ]
+    try:
+        # A group is the answer once it is feasible and every lower one is not
+        decided = True
+        for group, future in zip(candidates, futures):
+            while not wait([future], timeout=None if cancel is None else 0.01).done:
+                raise_if_cancelled(cancel)
+            feasible = future.result()
+            if feasible:
+                return group, decided
+            decided = decided and feasible is not None
+        return None, decided
+    finally:
+        for future in futures:
+            future.cancel()
+        probes_cancel.set()
+
+def first_valid_group(team, current_assignments, candidates, exact, rules=DEFAULT_RULES, cancel=None):
+    """(first feasible candidate or None, whether every probe before it was proven)"""
+    decided = True
+    for group in candidates:
+        raise_if_cancelled(cancel)
         test_assignments = current_assignments.copy()
         test_assignments[team] = group
 
-        if check_feasibility(test_assignments):
-            return group
-
-    return None
-
-def get_initial_state():
-    """Get initial state with hosts pre-assigned"""
-    return {
-        'NA': 1,  # Mexico → Group A
-        'NB': 2,  # Canada → Group B
-        'NC': 4   # USA → Group D
-    }
-
-def get_pots():
+        with profiling.section("probe", team=team, group=group, engine="exact" if exact else "cp-sat"):
+            feasible = probe_group(test_assignments, exact, cancel, rules)
+        # A cancelled CP-SAT probe reports infeasible; that must not pick a later group
+        raise_if_cancelled(cancel)
+        if feasible:
+            return group, decided
+        decided = decided and feasible is not None
+
+    return None, decided
+
+def cached_valid_group(team, current_assignments, rules=DEFAULT_RULES):
+    """(True, get_valid_group_for_team's answer) if the feasibility cache holds it,
+    else (False, None)"""
+    _, cached = cached_answer(VALID_GROUP, rules, current_assignments, team)
+    if cached is None:
+        return False, None
+    return True, None if cached == NO_GROUP else cached
+
+def get_valid_group_for_team(team, current_assignments, endgame_threshold=ENDGAME_MAX_UNASSIGNED,
+                             parallel=PARALLEL_PROBES, rules=DEFAULT_RULES, cancel=None):
+    """Get the first valid group for a team (lowest-numbered). Setting the cancel
+    event stops the running probe and raises SearchCancelled."""
+    key, cached = cached_answer(VALID_GROUP, rules, current_assignments, team)
+    if cached is not None:
+        return None if cached == NO_GROUP else cached
+
+    pot = get_pot(team, rules)
+    occupied_groups = get_occupied_groups(pot, current_assignments)
+    candidates = [group for group in rules.groups if group not in occupied_groups]
+
+    # Late in the draw the exact search is cheaper than CP-SAT model setup
+    unassigned = rules.num_teams - len(current_assignments)
+    exact = unassigned <= endgame_threshold
+
+    if parallel and len(candidates) > 1:
+        # The probes run in worker processes, which record no spans of their own
+        with profiling.section("parallel_probes", team=team, candidates=len(candidates),
+                               engine="exact" if exact else "cp-sat"):
+            group, decided = first_valid_group_parallel(team, current_assignments, candidates, exact, rules, cancel)
+    else:
+        group, decided = first_valid_group(team, current_assignments, candidates, exact, rules, cancel)
+
+    # A probe that ran out of time may have hidden a lower valid group
+    if decided and key is not None:
+        get_feasibility_cache().put(key, NO_GROUP if group is None else group)
+    return group
+
+def get_initial_state(rules=DEFAULT_RULES):
+    """Get initial state with hosts pre-assigned (Mexico → A, Canada → B, USA → D)"""
+    return dict(rules.initial_state)
+
+def simulate_draw(rng=None, current_assignments=None, valid_group=None, rules=DEFAULT_RULES):
+    """Run a complete draw (or finish a partial one), picking each pot's teams in
+    random order. The returned dict is in draw order (hosts first). Raises
+    ValueError if a team has no valid group (a partial draw that can't be completed)."""
+    rng = rng or random
+    valid_group = valid_group or (lambda team, assignments: get_valid_group_for_team(team, assignments, rules=rules))
+    assignments = dict(current_assignments or get_initial_state(rules))
+    for pot in rules.pots:
+        remaining = [t for t in pot if t not in assignments]
+        rng.shuffle(remaining)
+        for team in remaining:
+            group = valid_group(team, assignments)
+            if group is None:
+                raise ValueError(f"No valid group for {team}: the draw can't be completed")
+            assignments[team] = group
+
+    return assignments
+
+def get_pots(rules=DEFAULT_RULES):
     """Get pot assignments (1-indexed)"""
-    return {
-        1: POT1,
-        2: POT2,
-        3: POT3,
-        4: POT4
-    }
+    return {pot_num: pot for pot_num, pot in enumerate(rules.pots, 1)}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+"""
+FIFA 2026 World Cup Draw - Request Tracing
+Spans of requests sent with a "trace_id" (if TRACE_ALLOW_REQUEST is set), appended
+to {TRACE_DIR}/{trace_id}.json in the Chrome trace event format (JSON array format). Every request of a full draw
+shares one trace id, so the file opens as one timeline in chrome://tracing or
+https://ui.perfetto.dev.
+"""
+
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+TRACE_DIR = os.environ.get('TRACE_DIR', 'traces')
+# Honour the "trace_id" of requests (off by default: any client could otherwise
+# make the server write files)
+TRACE_ALLOW_REQUEST = os.environ.get('TRACE_ALLOW_REQUEST', '0') == '1'
+# A trace file stops growing at this size; later spans are dropped
+TRACE_MAX_BYTES = int(os.environ.get('TRACE_MAX_BYTES', 16 * 1024 * 1024))
+
+_local = threading.local()
+_no_span = nullcontext()
+
+
+def now_us():
+    """Wall clock in microseconds, so spans of several processes line up"""
+    return time.time_ns() // 1000
+
+
+class Trace:
+    """Spans of one request, written to the trace file when the request ends"""
+
+    def __init__(self, trace_id):
+        self.trace_id = re.sub(r'[^A-Za-z0-9_.-]', '_', str(trace_id))[:80]
+        self.path = os.path.join(TRACE_DIR, f"{self.trace_id}.json")
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self.events = []
+
+    def add(self, name, start_us, end_us, category='solver', args=None):
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start_us, 'dur': end_us - start_us,
+                 'pid': self.pid, 'tid': self.tid}
+        args = {key: value for key, value in (args or {}).items() if value is not None}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category='solver', **args):
+        start = now_us()
+        try:
+            yield
+        finally:
+            self.add(name, start, now_us(), category, args)
+
+    def write(self):
+        """Append the events, unless the file has reached TRACE_MAX_BYTES. The array
+        is left open, which the format allows, so later requests of the same trace
+        can keep appending to it."""
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        with open(self.path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if f.tell() >= TRACE_MAX_BYTES:
+                    return
+                lead = '[\n' if f.tell() == 0 else ',\n'
+                f.write(lead + ',\n'.join(json.dumps(event) for event in self.events))
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def active():
+    return getattr(_local, 'trace', None)
+
+def span(name, category='solver', **args):
+    """Context manager recording a span of the traced request on this thread, a
+    shared no-op otherwise"""
+    trace = active()
+    if trace is None:
+        return _no_span
+    return trace.span(name, category, **args)
+
+def record(name, start_us, end_us, category='solver', **args):
+    """Add a span measured before the trace started (e.g. parsing the request)"""
+    trace = active()
+    if trace is not None:
+        trace.add(name, start_us, end_us, category, args)
+
+@contextmanager
+def trace_request(trace_id, name, start_us=None, **args):
+    """Trace the block as one request of trace_id (nothing if it is None), its span
+    starting at start_us (default: now); yields the Trace. The spans are written
+    when the block exits; a failure to write them is ignored."""
+    if trace_id is None:
+        yield None
+        return
+
+    trace = Trace(trace_id)
+    _local.trace = trace
+    start_us = start_us or now_us()
+    try:
+        yield trace
+    finally:
+        trace.add(name, start_us, now_us(), 'request', args)
+        _local.trace = None
+        try:
+            trace.write()
+        except OSError:
+            pass
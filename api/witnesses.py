@@ -0,0 +1,192 @@
+"""
+FIFA 2026 World Cup Draw - Witness Store
+Complete valid draws kept as packed team-by-group bit rows, so a partial assignment
+consistent with any of them is known to be feasible without a search
+"""
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from api.rules import load_rules
+
+# Persisted witnesses, one file per rule set named after its content hash so a
+# changed rule set never reuses stale draws (see tools/build_witnesses.py)
+WITNESS_DIR = os.environ.get('WITNESS_DIR', os.path.join(os.path.dirname(__file__), 'witnesses'))
+
+# Most witnesses kept per rule set (72 bytes each for the 2026 draw)
+MAX_WITNESSES = int(os.environ.get('MAX_WITNESSES', 50_000))
+
+# Number of rule sets whose stores are kept in memory
+MAX_STORES = 16
+
+
+class WitnessStore:
+    """Bounded set of complete draws, one row of uint64 words per draw with bit
+    team * num_groups + (group - 1) set for each team's group.
+
+    Rows loaded from disk stay memory-mapped (at most half the capacity); new
+    witnesses go to an in-memory ring buffer that overwrites its oldest rows.
+    """
+
+    def __init__(self, rules, capacity=MAX_WITNESSES, base=None):
+        self.rules = rules
+        self.team_index = {team: idx for idx, team in enumerate(rules.all_teams)}
+        self.num_words = -(-rules.num_teams * rules.num_groups // 64)
+        self.lock = threading.Lock()
+        if base is None:
+            base = np.zeros((0, self.num_words), dtype=np.uint64)
+        self.base = base[len(base) - min(len(base), capacity // 2):]
+        self.recent_capacity = capacity - len(self.base)
+        self.recent = np.zeros((0, self.num_words), dtype=np.uint64)
+        self.num_recent = 0
+        self.next_slot = 0
+        self.last = None
+        self.validator = None
+        # Only stores loaded from WITNESS_DIR are written back there at exit
+        self.persistent = False
+
+    @staticmethod
+    def path_for(rules):
+        return os.path.join(WITNESS_DIR, f"{rules.hash[:16]}.npy")
+
+    @classmethod
+    def load(cls, rules, capacity=MAX_WITNESSES):
+        path = cls.path_for(rules)
+        store = cls(rules, capacity, np.load(path, mmap_mode='r') if os.path.exists(path) else None)
+        # Files written before rows were checked may hold broken ones: drop them
+        valid = store.valid_mask(store.base)
+        if not valid.all():
+            store.base = store.base[valid]
+        store.persistent = True
+        return store
+
+    def save(self):
+        """Write every witness, oldest first. The file is replaced atomically, so
+        processes that have the old one mapped keep a consistent view."""
+        with self.lock:
+            order = np.arange(self.num_recent)
+            if self.num_recent == self.recent_capacity:
+                order = np.roll(order, -self.next_slot)
+            rows = np.concatenate([self.base, self.recent[order]])
+        path = self.path_for(self.rules)
+        os.makedirs(WITNESS_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, rows)
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.base) + self.num_recent
+
+    def pack(self, groups):
+        """(N x num_teams) group numbers, 0 for unassigned -> (N x num_words) bit rows"""
+        groups = np.asarray(groups, dtype=np.intp).reshape(-1, self.rules.num_teams)
+        bits = np.zeros((len(groups), self.num_words * 64), dtype=bool)
+        rows, teams = np.nonzero(groups)
+        bits[rows, teams * self.rules.num_groups + groups[rows, teams] - 1] = True
+        # Packed bytes viewed as words; unpack() views them back as bytes
+        return np.packbits(bits, axis=1).view(np.uint64)
+
+    def pack_assignments(self, assignments):
+        groups = np.zeros(self.rules.num_teams, dtype=np.intp)
+        for team, group in assignments.items():
+            groups[self.team_index[team]] = group
+        return self.pack(groups)[0]
+
+    def unpack(self, row):
+        bits = np.unpackbits(row.view(np.uint8))[:self.rules.num_teams * self.rules.num_groups]
+        groups = bits.reshape(self.rules.num_teams, self.rules.num_groups).argmax(axis=1) + 1
+        return {team: int(group) for team, group in zip(self.rules.all_teams, groups)}
+
+    def valid_mask(self, rows):
+        """Which bit rows hold a complete valid draw: one group per team and every
+        rule kept. The host assignments are not required; probes needn't pin them."""
+        num_teams, num_groups = self.rules.num_teams, self.rules.num_groups
+        bits = np.unpackbits(np.ascontiguousarray(rows).view(np.uint8), axis=1)
+        grid = bits[:, :num_teams * num_groups].reshape(len(rows), num_teams, num_groups)
+        valid = (grid.sum(axis=2) == 1).all(axis=1) & ~bits[:, num_teams * num_groups:].any(axis=1)
+        if valid.any():
+            if self.validator is None:
+                # Imported here: api.validation needs the solver, which needs this module
+                from api.validation import DrawValidator
+                self.validator = DrawValidator(self.rules)
+            ignored = 1 << self.validator.codes.index('initial_state')
+            masks = self.validator.validate(grid[valid].argmax(axis=2) + 1)
+            valid[valid] = (masks.astype(np.uint64) & ~np.uint64(ignored)) == 0
+        return valid
+
+    def add(self, draw):
+        """Keep a complete valid draw {team: group}; anything else is ignored"""
+        if set(draw) != set(self.team_index) or any(group not in self.rules.groups for group in draw.values()):
+            return
+        if self.add_rows(self.pack_assignments(draw)[None]):
+            self.last = dict(draw)
+
+    def add_rows(self, rows):
+        """Keep the rows that hold complete valid draws; returns how many"""
+        rows = rows[self.valid_mask(rows)]
+        with self.lock:
+            for row in rows[len(rows) - min(len(rows), self.recent_capacity):]:
+                if self.num_recent < self.recent_capacity:
+                    if self.num_recent == len(self.recent):
+                        # Grow by doubling so stores of small or short-lived rule sets stay small
+                        grown = np.zeros((min(self.recent_capacity, max(64, 2 * len(self.recent))), self.num_words),
+                                         dtype=np.uint64)
+                        grown[:self.num_recent] = self.recent
+                        self.recent = grown
+                    self.recent[self.num_recent] = row
+                    self.num_recent += 1
+                else:
+                    # Full: overwrite the oldest
+                    self.recent[self.next_slot] = row
+                    self.next_slot = (self.next_slot + 1) % self.recent_capacity
+        return len(rows)
+
+    def find(self, assignments):
+        """A stored complete draw agreeing with every assignment, or None"""
+        if any(team not in self.team_index or group not in self.rules.groups
+               for team, group in assignments.items()):
+            # No complete draw has it; leave the answer to the solver
+            return None
+        mask = self.pack_assignments(assignments)
+        words = np.flatnonzero(mask)
+        with self.lock:
+            # Recent witnesses first: they are the likeliest to match the current draw
+            for rows in (self.recent[:self.num_recent], self.base):
+                if not len(rows):
+                    continue
+                hits = np.flatnonzero(((rows[:, words] & mask[words]) == mask[words]).all(axis=1))
+                if len(hits):
+                    return self.unpack(rows[hits[0]])
+        return None
+
+
+_stores = OrderedDict()
+_stores_lock = threading.Lock()
+
+def get_witness_store(rules=None):
+    """Store for the rule set, loaded from WITNESS_DIR on first use"""
+    rules = rules or load_rules()
+    with _stores_lock:
+        store = _stores.get(rules.hash)
+        if store is None:
+            store = WitnessStore.load(rules)
+            _stores[rules.hash] = store
+            if len(_stores) > MAX_STORES:
+                _stores.popitem(last=False)
+        _stores.move_to_end(rules.hash)
+        return store
+
+@atexit.register
+def save_default_store():
+    """Persist the default rule set's new witnesses (skipped on a read-only filesystem)"""
+    store = _stores.get(load_rules().hash)
+    if store is not None and store.persistent and store.num_recent:
+        try:
+            store.save()
+        except OSError:
+            pass
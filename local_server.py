@@ -4,20 +4,194 @@ Local development server for testing the FIFA draw simulator
 Run this instead of 'vercel dev' to test without Vercel account
 """
 
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import gzip
+import hashlib
+import json
+import mimetypes
 import os
+import re
 import sys
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Add project root to path (so 'from api.solver import ...' works)
 sys.path.insert(0, os.path.dirname(__file__))
 
+from api.admission import admission
+from api.feasibility_cache import get_feasibility_cache
 from api.index import handler as APIHandler
 
 
+PUBLIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public')
+
+# Worth compressing; images other than SVG already are
+COMPRESSIBLE = {'.html', '.js', '.css', '.svg', '.json', '.txt'}
+
+# Files named like name.<hex hash>.ext never change, so browsers may keep them for a year
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{8,}\.[A-Za-z0-9]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Anything else is revalidated on every use, which costs a 304 at most
+REVALIDATE = 'no-cache'
+
+SPRITE_MANIFEST = 'flags/sprite.json'
+
+
+class Asset:
+    """A public file held in memory with its precompressed variants"""
+
+    def __init__(self, relative_path, body, mtime=None):
+        self.path = relative_path
+        self.mtime = mtime
+        self.content_type = mimetypes.guess_type(relative_path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type.endswith(('javascript', 'json', '+xml')):
+            self.content_type += '; charset=utf-8'
+        self.cache_control = IMMUTABLE if FINGERPRINTED.search(relative_path) else REVALIDATE
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        # Strong ETags must differ between encodings of the same content
+        self.variants = {None: (body, f'"{digest}"')}
+        if os.path.splitext(relative_path)[1] in COMPRESSIBLE:
+            compressed = {'gzip': gzip.compress(body, 9, mtime=0)}
+            if brotli is not None:
+                compressed['br'] = brotli.compress(body, quality=11)
+            for encoding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = (data, f'"{digest}-{encoding}"')
+
+    def select(self, accept_encoding):
+        """(body, etag, encoding) for the best encoding the client accepts"""
+        accepted = set()
+        for item in (accept_encoding or '').split(','):
+            name, _, params = item.strip().partition(';')
+            if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                accepted.add(name.strip().lower())
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and (encoding in accepted or '*' in accepted):
+                body, etag = self.variants[encoding]
+                return body, etag, encoding
+        body, etag = self.variants[None]
+        return body, etag, None
+
+
+class StaticAssets:
+    """Every file of public/ compressed once, up front, so serving one is a dict lookup
+    and a write: static requests never take CPU from a solve. Files edited while the
+    server runs are reloaded on their next request."""
+
+    def __init__(self, root=PUBLIC_DIR, flag_sprite=False):
+        self.root = root
+        self.lock = threading.Lock()
+        self.assets = {}
+        for directory, _, files in os.walk(root):
+            for name in files:
+                self.load(os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/'))
+        if flag_sprite:
+            self.add_flag_sprite()
+
+    def load(self, relative_path):
+        full_path = os.path.join(self.root, relative_path)
+        try:
+            mtime = os.stat(full_path).st_mtime_ns
+            with open(full_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        asset = Asset(relative_path, body, mtime)
+        with self.lock:
+            self.assets[relative_path] = asset
+        return asset
+
+    def get(self, url_path):
+        relative_path = url_path.split('?', 1)[0].split('#', 1)[0].lstrip('/') or 'index.html'
+        if relative_path.endswith('/'):
+            relative_path += 'index.html'
+        if '..' in relative_path.split('/'):
+            return None
+        asset = self.assets.get(relative_path)
+        if asset is None or asset.mtime is None:
+            # Unknown (new since startup) or generated
+            return asset or (self.load(relative_path) if os.path.isfile(os.path.join(self.root, relative_path))
+                             else None)
+        try:
+            if os.stat(os.path.join(self.root, relative_path)).st_mtime_ns != asset.mtime:
+                return self.load(relative_path)
+        except OSError:
+            with self.lock:
+                self.assets.pop(relative_path, None)
+            return None
+        return asset
+
+    def add_flag_sprite(self):
+        """Bundle flags/*.svg into one fingerprinted SVG stack: flags/sprite.<hash>.svg#<code>
+        shows a single flag. The frontend finds it through flags/sprite.json."""
+        parts = []
+        for relative_path in sorted(self.assets):
+            match = re.fullmatch(r'flags/([^/.]+)\.svg', relative_path)
+            if match:
+                parts.append(sprite_entry(match.group(1), self.assets[relative_path].variants[None][0].decode('utf-8')))
+        sprite = ('<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+                  '<style>svg>svg{display:none}svg>svg:target{display:inline}</style>'
+                  + ''.join(parts) + '</svg>').encode('utf-8')
+        name = f"flags/sprite.{hashlib.sha256(sprite).hexdigest()[:12]}.svg"
+        self.assets[name] = Asset(name, sprite)
+        self.assets[SPRITE_MANIFEST] = Asset(SPRITE_MANIFEST, json.dumps({'sprite': name}).encode('utf-8'))
+
+
+def sprite_entry(code, svg):
+    """One flag as a nested <svg id="code">, with its own ids prefixed so flags don't clash"""
+    start = re.search(r'<svg\b[^>]*>', svg)
+    end = svg.rindex('</svg>')
+    tag, content = start.group(0), svg[start.end():end]
+    attributes = dict(re.findall(r'([\w:.-]+)\s*=\s*"([^"]*)"', tag))
+    for name in ('id', 'x', 'y', 'width', 'height'):
+        attributes.pop(name, None)
+    if 'viewBox' not in attributes:
+        width, height = (re.search(rf'(?<![\w-]){name}="([\d.]+)', tag) for name in ('width', 'height'))
+        if width and height:
+            attributes['viewBox'] = f"0 0 {width.group(1)} {height.group(1)}"
+    content = re.sub(r'\bid="([^"]+)"', rf'id="{code}-\1"', content)
+    content = re.sub(r'url\(#([^)]+)\)', rf'url(#{code}-\1)', content)
+    content = re.sub(r'href="#([^"]+)"', rf'href="#{code}-\1"', content)
+    attributes['id'] = code
+    return '<svg ' + ' '.join(f'{name}="{value}"' for name, value in attributes.items()) + '>' + content + '</svg>'
+
+
 class LocalHandler(SimpleHTTPRequestHandler):
+    # Set at startup; None serves straight from disk
+    static = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory='public', **kwargs)
 
+    def send_asset(self, include_body=True):
+        """Serve a precompressed asset, or 304 if the client's copy is current.
+        Returns False when the path isn't a known asset."""
+        asset = self.static.get(self.path) if self.static else None
+        if asset is None:
+            return False
+        body, etag, encoding = asset.select(self.headers.get('Accept-Encoding'))
+        if_none_match = self.headers.get('If-None-Match', '')
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        not_modified = etag in tags or '*' in tags
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', asset.cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+        if not not_modified:
+            self.send_header('Content-Type', asset.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if include_body and not not_modified:
+            self.wfile.write(body)
+        return True
+
     def do_OPTIONS(self):
         if self.path == '/api':
             APIHandler.do_OPTIONS(self)
@@ -25,6 +199,21 @@ class LocalHandler(SimpleHTTPRequestHandler):
             self.send_response(200)
             self.end_headers()
 
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = (admission.prometheus_text() + get_feasibility_cache().prometheus_text()).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif not self.send_asset():
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.send_asset(include_body=False):
+            super().do_HEAD()
+
     def do_POST(self):
         if self.path == '/api':
             APIHandler.do_POST(self)
@@ -36,9 +225,14 @@ if __name__ == '__main__':
     import argparse
     parser = argparse.ArgumentParser(description='Local dev server for FIFA 2026 Draw Simulator')
     parser.add_argument('-p', '--port', type=int, default=3000, help='Port to run server on (default: 3000)')
+    parser.add_argument('--flag-sprite', action='store_true', help='Serve all flags as one SVG sprite')
+    parser.add_argument('--no-precompress', action='store_true', help='Serve public/ straight from disk')
     args = parser.parse_args()
     PORT = args.port
 
+    if not args.no_precompress:
+        LocalHandler.static = StaticAssets(flag_sprite=args.flag_sprite)
+
     print(f"""
 ╔════════════════════════════════════════════════════════════╗
 ║  FIFA 2026 World Cup Draw Simulator - Local Dev Server    ║
@@ -50,7 +244,8 @@ if __name__ == '__main__':
 Press Ctrl+C to stop
 """)
 
-    server = HTTPServer(('localhost', PORT), LocalHandler)
+    # Threaded, so a cancel request (or another user) is served while a solve runs
+    server = ThreadingHTTPServer(('localhost', PORT), LocalHandler)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
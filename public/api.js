@@ -5,19 +5,72 @@
 import { API_ENDPOINT } from './config.js';
 import { drawState, POTS, setPots } from './state.js';
 
+// In-flight requests by id, so abandoned ones can be aborted and stopped server-side
+const inFlight = new Map();
+const clientId = Math.random().toString(36).slice(2);
+let requestCount = 0;
+
+// With ?trace in the page URL, requests carry a trace id and the server records their
+// spans to traces/<id>.json (see api/tracing.py): one trace per full draw, one for the rest
+const tracing = new URLSearchParams(window.location.search).has('trace');
+const sessionTraceId = `session-${clientId}`;
+let traceId = tracing ? sessionTraceId : null;
+
+export function startTrace(name) {
+    if (tracing) {
+        traceId = `${name}-${clientId}-${Date.now()}`;
+        console.log(`Tracing to traces/${traceId}.json`);
+    }
+}
+
+export function endTrace() {
+    if (tracing) {
+        traceId = sessionTraceId;
+    }
+}
+
+// Retries of a request the server turned away as busy (503 with Retry-After)
+const MAX_BUSY_RETRIES = 3;
+
+function waitForRetry(seconds, signal) {
+    return new Promise((resolve, reject) => {
+        const timer = setTimeout(resolve, seconds * 1000);
+        signal.addEventListener('abort', () => {
+            clearTimeout(timer);
+            reject(new DOMException('Aborted', 'AbortError'));
+        }, { once: true });
+    });
+}
+
 export async function callAPI(action, data = {}) {
+    const requestId = `${clientId}-${++requestCount}`;
+    const controller = new AbortController();
+    inFlight.set(requestId, controller);
+
     try {
-        const response = await fetch(API_ENDPOINT, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                action,
-                assignments: drawState.assignments,
-                ...data
-            })
-        });
+        let response;
+        for (let attempt = 0; ; attempt++) {
+            response = await fetch(API_ENDPOINT, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    action,
+                    request_id: requestId,
+                    client_id: clientId,
+                    ...(traceId && { trace_id: traceId }),
+                    assignments: drawState.assignments,
+                    ...data
+                }),
+                signal: controller.signal
+            });
+            if (response.status !== 503 || attempt >= MAX_BUSY_RETRIES) {
+                break;
+            }
+            const retryAfter = Number(response.headers.get('Retry-After')) || 1;
+            await waitForRetry(retryAfter, controller.signal);
+        }
 
         if (!response.ok) {
             throw new Error(`API error: ${response.status}`);
@@ -25,13 +78,37 @@ export async function callAPI(action, data = {}) {
 
         return await response.json();
     } catch (error) {
-        console.error('API call failed:', error);
+        if (error.name !== 'AbortError') {
+            console.error('API call failed:', error);
+        }
         throw error;
+    } finally {
+        inFlight.delete(requestId);
+    }
+}
+
+function sendCancel(requestId) {
+    const body = JSON.stringify({ action: 'cancel', request_id: requestId });
+    // A beacon is still delivered while the page unloads
+    if (!navigator.sendBeacon || !navigator.sendBeacon(API_ENDPOINT, body)) {
+        fetch(API_ENDPOINT, { method: 'POST', body, keepalive: true }).catch(() => {});
     }
 }
 
-export async function getValidGroupForTeam(teamCode) {
-    const result = await callAPI('get_valid_group', { team: teamCode });
+// Abort every in-flight request and tell the server to stop solving for it
+export function cancelPendingRequests() {
+    for (const [requestId, controller] of inFlight) {
+        controller.abort();
+        sendCancel(requestId);
+    }
+    inFlight.clear();
+}
+
+window.addEventListener('pagehide', cancelPendingRequests);
+
+// mode 'full_draw' lets the server serve single clicks first when busy
+export async function getValidGroupForTeam(teamCode, mode = 'click') {
+    const result = await callAPI('get_valid_group', { team: teamCode, mode });
     return result.valid_group;
 }
 
@@ -3,8 +3,9 @@
  * Main application entry point
  */
 
+import { loadFlagSprite } from './config.js';
 import { drawState, actionQueue, isRunningFullDraw } from './state.js';
-import { getInitialState } from './api.js';
+import { cancelPendingRequests, getInitialState } from './api.js';
 import { populatePots, updatePotStatus } from './ui-pots.js';
 import { updateGroupsDisplay } from './ui-groups.js';
 import { clearHighlights, handleGroupClick } from './ui-highlights.js';
@@ -37,8 +38,9 @@ async function init() {
 async function initializeDraw() {
     updateLoadingMessage('Connecting to solver...');
 
-    // Get initial state from API
-    drawState.assignments = await getInitialState();
+    // Get initial state from API (and the flag sprite, if served, meanwhile)
+    const [assignments] = await Promise.all([getInitialState(), loadFlagSprite()]);
+    drawState.assignments = assignments;
     drawState.currentPot = 1;
     drawState.selectedTeam = null;
 
@@ -90,6 +92,10 @@ function setupEventListeners() {
         if (drawState.selectedTeam &&
             !e.target.closest('.team-item') &&
             !e.target.closest('.group')) {
+            if (drawState.validGroup === null) {
+                // Still waiting for the solver: stop it
+                cancelPendingRequests();
+            }
             clearHighlights();
             updateDrawStatus('Selection cancelled.');
         }
@@ -13,6 +13,28 @@ export const API_ENDPOINT = (() => {
     return `http://localhost:${port}/api`;
 })();
 
+// ===== Flags =====
+// local_server.py --flag-sprite bundles every flag into one SVG sprite, named in flags/sprite.json
+let flagSprite = null;
+
+export async function loadFlagSprite() {
+    if (window.location.hostname !== 'localhost') {
+        return;
+    }
+    try {
+        const response = await fetch('flags/sprite.json');
+        if (response.ok) {
+            flagSprite = (await response.json()).sprite;
+        }
+    } catch (error) {
+        // No sprite: one file per flag
+    }
+}
+
+export function flagURL(flag) {
+    return flagSprite ? `${flagSprite}#${flag}` : `flags/${flag}.svg`;
+}
+
 // ===== Display Order Constants =====
 // Maps pot number to slot index for each group type
 export const DISPLAY_ORDERS = {
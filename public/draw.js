@@ -3,7 +3,7 @@
  */
 
 import { drawState, actionQueue, POTS, setIsRunningFullDraw } from './state.js';
-import { getCurrentPot, getValidGroupForTeam } from './api.js';
+import { cancelPendingRequests, endTrace, getCurrentPot, getValidGroupForTeam, startTrace } from './api.js';
 import { assignTeamToGroup } from './ui-highlights.js';
 
 // ===== Helper Functions =====
@@ -20,7 +20,7 @@ export function drawOneTeam() {
     actionQueue.enqueue(() => processDrawOneTeam());
 }
 
-export async function processDrawOneTeam() {
+export async function processDrawOneTeam(mode = 'click') {
     const currentPot = getCurrentPot(drawState.assignments);
     if (currentPot === 0) {
         updateDrawStatus("Draw complete!");
@@ -39,7 +39,7 @@ export async function processDrawOneTeam() {
         }
 
         const teamCode = unassigned[Math.floor(Math.random() * unassigned.length)];
-        const validGroup = await getValidGroupForTeam(teamCode);
+        const validGroup = await getValidGroupForTeam(teamCode, mode);
 
         if (validGroup === null) {
             updateDrawStatus(`ERROR: No valid group for ${TEAM_DATA[teamCode].name}`);
@@ -49,6 +49,9 @@ export async function processDrawOneTeam() {
         assignTeamToGroup(teamCode, validGroup);
 
     } catch (error) {
+        if (error.name === 'AbortError') {
+            return;  // Stopped by the user
+        }
         console.error("Error drawing team:", error);
         updateDrawStatus("Error during draw");
     }
@@ -59,6 +62,7 @@ export function runFullDraw(isRunning) {
     if (isRunning) {
         // Stop requested
         actionQueue.cancel();
+        cancelPendingRequests();
     } else {
         // Start the draw
         actionQueue.enqueue(() => processFullDraw());
@@ -79,6 +83,7 @@ export function setFullDrawButtonState(running) {
 
 async function processFullDraw() {
     setFullDrawButtonState(true);
+    startTrace('full-draw');
     updateDrawStatus("Running full draw...");
 
     const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
@@ -94,7 +99,7 @@ async function processFullDraw() {
                 break;
             }
 
-            await processDrawOneTeam();
+            await processDrawOneTeam('full_draw');
             await delay(200);
             iterations++;
         }
@@ -110,6 +115,7 @@ async function processFullDraw() {
         console.error("Error in full draw:", error);
         updateDrawStatus("Error during full draw: " + error.message);
     } finally {
+        endTrace();
         setFullDrawButtonState(false);
     }
 }
@@ -2,6 +2,7 @@
  * Assignment log and undo functionality for FIFA 2026 World Cup Draw Simulator
  */
 
+import { flagURL } from './config.js';
 import { drawState, isRunningFullDraw } from './state.js';
 import { updateGroupsDisplay } from './ui-groups.js';
 import { updatePotStatus } from './ui-pots.js';
@@ -23,7 +24,7 @@ export function renderAssignmentLog() {
 
         const flag = document.createElement('img');
         flag.className = 'assignment-log-flag';
-        flag.src = `flags/${teamData.flag}.svg`;
+        flag.src = flagURL(teamData.flag);
         flag.alt = teamData.name;
         flag.onerror = () => { flag.src = 'flags/placeholder.svg'; };
 
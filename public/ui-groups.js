@@ -2,7 +2,7 @@
  * Group display and slot rendering for FIFA 2026 World Cup Draw Simulator
  */
 
-import { DISPLAY_ORDERS, SLOT_TO_POT, getDisplayOrderForGroup } from './config.js';
+import { DISPLAY_ORDERS, SLOT_TO_POT, flagURL, getDisplayOrderForGroup } from './config.js';
 import { drawState } from './state.js';
 
 export function updateGroupsDisplay() {
@@ -43,7 +43,7 @@ export function updateGroupsDisplay() {
 
                 const flag = document.createElement('img');
                 flag.className = 'team-slot-flag';
-                flag.src = `flags/${teamData.flag}.svg`;
+                flag.src = flagURL(teamData.flag);
                 flag.alt = teamData.name;
                 flag.onerror = () => { flag.src = 'flags/placeholder.svg'; };
 
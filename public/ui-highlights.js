@@ -66,6 +66,9 @@ async function processTeamClick(teamCode) {
         updateDrawStatus(`${teamData.name} → Group ${groupLetter}. Click team or group to confirm.`);
 
     } catch (error) {
+        if (error.name === 'AbortError') {
+            return;  // Selection cancelled while the solver was running
+        }
         console.error('Error in team click:', error);
         updateDrawStatus('Error checking constraints. Please try again.');
         clearHighlights();
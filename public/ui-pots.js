@@ -2,6 +2,7 @@
  * Pot rendering and team items for FIFA 2026 World Cup Draw Simulator
  */
 
+import { flagURL } from './config.js';
 import { POTS, drawState } from './state.js';
 import { getCurrentPot } from './api.js';
 import { handleTeamClick } from './ui-highlights.js';
@@ -28,7 +29,7 @@ function createTeamItem(teamCode, teamData) {
 
     const flag = document.createElement('img');
     flag.className = 'team-flag';
-    flag.src = `flags/${teamData.flag}.svg`;
+    flag.src = flagURL(teamData.flag);
     flag.alt = teamData.name;
     flag.onerror = () => { flag.src = 'flags/placeholder.svg'; };
 
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Summarize a large array of simulated draws (.npy, N x 48) with api/analytics.py.
+
+The file is memory-mapped and processed in chunks, so its size is not limited by RAM.
+"""
+
+import json
+import os
+import sys
+
+# Add project root to path (so 'from api.analytics import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from api.analytics import CHUNK_SIZE, CONFEDERATION_LABELS, analyze_draws
+from api.solver import ALL_TEAMS
+
+GROUP_LETTERS = "ABCDEFGHIJKL"
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Co-group, confederation mix and opponent strength statistics')
+    parser.add_argument('draws', help='.npy file of draws, e.g. api/draw_pool.npy')
+    parser.add_argument('--team', default='CA', help='Team to list likely group opponents for (default: CA)')
+    parser.add_argument('--strength', help='JSON file mapping team code to a rating, for opponent strength')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'Draws per chunk (default: {CHUNK_SIZE})')
+    args = parser.parse_args()
+
+    strength = None
+    if args.strength:
+        with open(args.strength) as f:
+            ratings = json.load(f)
+        strength = [ratings[team] for team in ALL_TEAMS]
+
+    draws = np.load(args.draws, mmap_mode='r')
+    analytics = analyze_draws(draws, strength, args.chunk_size)
+    print(f"{analytics.num_draws} draws")
+
+    team_idx = ALL_TEAMS.index(args.team)
+    co_group = analytics.co_group_probabilities()[team_idx]
+    print(f"\nMost likely group opponents of {args.team}:")
+    for idx in np.argsort(-co_group)[1:11]:
+        print(f"  {ALL_TEAMS[idx]}  {co_group[idx]:.3f}")
+
+    print("\nProbability of two teams of the same confederation in a group:")
+    print("  Group " + ''.join(f"{c:>10}" for c in CONFEDERATION_LABELS))
+    for group, mix in analytics.confederation_mix().items():
+        print(f"  {GROUP_LETTERS[group - 1]:<5} " + ''.join(f"{mix[c][2]:>10.3f}" for c in CONFEDERATION_LABELS))
+
+    if strength is not None:
+        print("\nOpponent strength (mean ± std):")
+        for team, (mean, std) in analytics.opponent_strength().items():
+            print(f"  {team}  {mean:8.2f} ± {std:.2f}")
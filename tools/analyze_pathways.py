@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Knockout pathway statistics for a large array of simulated draws (.npy, N x 48)
+with api/pathways.py, assuming every team wins its group.
+
+The file is memory-mapped and processed in chunks, so its size is not limited by RAM.
+"""
+
+import json
+import os
+import sys
+
+# Add project root to path (so 'from api.pathways import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from api.analytics import CHUNK_SIZE
+from api.pathways import ROUNDS, analyze_pathways
+from api.solver import ALL_TEAMS
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Earliest meeting rounds and path difficulty of group winners')
+    parser.add_argument('draws', help='.npy file of draws, e.g. api/draw_pool.npy')
+    parser.add_argument('--team', default='CA', help='Team to list earliest meetings for (default: CA)')
+    parser.add_argument('--strength', help='JSON file mapping team code to a rating, for path difficulty')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'Draws per chunk (default: {CHUNK_SIZE})')
+    args = parser.parse_args()
+
+    strength = None
+    if args.strength:
+        with open(args.strength) as f:
+            ratings = json.load(f)
+        strength = [ratings[team] for team in ALL_TEAMS]
+
+    draws = np.load(args.draws, mmap_mode='r')
+    analytics = analyze_pathways(draws, strength, args.chunk_size)
+    print(f"{analytics.num_draws} draws")
+
+    team_idx = ALL_TEAMS.index(args.team)
+    meetings = analytics.meeting_round_probabilities()[team_idx]
+    print(f"\nEarliest possible meeting with {args.team} (both group winners):")
+    print("  Team " + ''.join(f"{r:>15}" for r in ROUNDS))
+    for idx, team in enumerate(ALL_TEAMS):
+        if idx != team_idx:
+            print(f"  {team:<4} " + ''.join(f"{p:>15.3f}" for p in meetings[idx]))
+
+    if strength is not None:
+        print("\nMean opponent rating on the path (R16, QF, SF, Final):")
+        for team, levels in analytics.path_difficulty().items():
+            print(f"  {team}  " + ''.join(f"{d:>9.2f}" for d in levels))
@@ -0,0 +1,16 @@
+"""
+Minimal HTTP client for the draw API, mirroring callAPI in public/api.js.
+"""
+
+import json
+import urllib.request
+
+DEFAULT_API_URL = 'http://localhost:3000/api'
+
+
+def call_api(url, action, assignments=None, timeout=30, **data):
+    """POST an action to the API and return the decoded JSON response"""
+    body = json.dumps({'action': action, 'assignments': assignments or {}, **data}).encode('utf-8')
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
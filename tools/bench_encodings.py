@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Differential benchmark of CP-SAT encodings of the draw rules.
+
+Every encoding checks the same random partial states; they must agree on
+feasibility. Model size, build time from scratch, copy time from a model built
+once (as api/solver.py ModelTemplate does) and solve time are compared:
+
+- reified:  api/solver.py create_model (integer group per team, reified counts)
+- boolean:  one Boolean per (team, group) with linear sums, as in journey/chapter_2.py
+- alldiff:  integer group per team with AllDifferent per confederation capped
+            at one team per group, as in journey/chapter_3.py create_cp_style_model
+
+boolean and alldiff are built here from the rule set, so all three encode the same
+rules. The journey models themselves (--journey) predate the pot 4 playoff and
+bracket separation rules; they are timed too, but their disagreements are only
+reported.
+"""
+
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Time the encodings themselves, not witness store lookups
+os.environ.setdefault('WITNESS_REUSE', '0')
+
+from ortools.sat.python import cp_model
+from api.solver import DEFAULT_RULES, create_model, create_solver, solve_completion
+from tools.corpus import load_corpus
+from tools.latency import percentile
+
+JOURNEY_DIR = os.path.join(os.path.dirname(__file__), '..', 'journey')
+
+
+# =============================================================================
+# ENCODINGS
+# =============================================================================
+# Each builder returns (model without fixed assignments, pin) where pin(team, group)
+# gives the (variable index, value) that fixes the team to the group.
+
+def build_reified_model(rules=DEFAULT_RULES):
+    model, team_group = create_model(rules=rules)
+    return model, lambda team, group: (team_group[team].Index(), group)
+
+def build_boolean_model(rules=DEFAULT_RULES):
+    """x[t, g] is true iff team t is in group g; every rule is a linear sum"""
+    model = cp_model.CpModel()
+    x = {(t, g): model.NewBoolVar(f'{t}_{g}') for t in rules.all_teams for g in rules.groups}
+
+    for t in rules.all_teams:
+        model.AddExactlyOne(x[t, g] for g in rules.groups)
+    for pot in rules.pots:
+        for g in rules.groups:
+            model.AddExactlyOne(x[t, g] for t in pot)
+    for confederation, teams in rules.teams.items():
+        limits = rules.confederation_limits[confederation]
+        for g in rules.groups:
+            count = sum(x[t, g] for t in teams)
+            if limits["min"] > 0:
+                model.Add(count >= limits["min"])
+            model.Add(count <= limits["max"])
+    for separated_teams, zone_of in rules.zone_maps:
+        for zone in set(zone_of.values()):
+            model.AddAtMostOne(x[t, g] for t in separated_teams for g in rules.groups if zone_of[g] == zone)
+
+    return model, lambda team, group: (x[team, group].Index(), 1)
+
+def build_alldiff_model(rules=DEFAULT_RULES):
+    """Integer group per team; AllDifferent wherever at most one team per group is allowed,
+    and the separated teams' zones (via element constraints) all different"""
+    model = cp_model.CpModel()
+    team_group = {t: model.NewIntVar(1, rules.num_groups, t) for t in rules.all_teams}
+
+    for pot in rules.pots:
+        model.AddAllDifferent(team_group[t] for t in pot)
+    for confederation, teams in rules.teams.items():
+        limits = rules.confederation_limits[confederation]
+        if limits["max"] == 1 and limits["min"] == 0:
+            model.AddAllDifferent(team_group[t] for t in teams)
+            continue
+        for g in rules.groups:
+            flags = []
+            for t in teams:
+                flag = model.NewBoolVar(f'{t}_in_{g}')
+                model.Add(team_group[t] == g).OnlyEnforceIf(flag)
+                model.Add(team_group[t] != g).OnlyEnforceIf(flag.Not())
+                flags.append(flag)
+            model.Add(sum(flags) >= limits["min"])
+            model.Add(sum(flags) <= limits["max"])
+    for idx, (separated_teams, zone_of) in enumerate(rules.zone_maps):
+        # Index 0 of the table is unused: groups are numbered from 1
+        table = [0] + [zone_of[g] for g in rules.groups]
+        zones = []
+        for t in separated_teams:
+            zone = model.NewIntVar(min(table[1:]), max(table), f'sep{idx}_{t}')
+            model.AddElement(team_group[t], table, zone)
+            zones.append(zone)
+        model.AddAllDifferent(zones)
+
+    return model, lambda team, group: (team_group[team].Index(), group)
+
+RULE_ENCODINGS = {
+    'reified': build_reified_model,
+    'boolean': build_boolean_model,
+    'alldiff': build_alldiff_model,
+}
+
+def pin_assignments(model, pin, fixed_assignments):
+    variables = model.Proto().variables
+    for team, group in fixed_assignments.items():
+        idx, value = pin(team, group)
+        del variables[idx].domain[:]
+        variables[idx].domain.extend([value, value])
+    return model
+
+def load_journey_module(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(JOURNEY_DIR, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def journey_encodings():
+    """Journey builders take the fixed assignments up front, so they are only built from scratch"""
+    chapter_2 = load_journey_module('chapter_2')
+    chapter_3 = load_journey_module('chapter_3')
+    return {
+        'journey-ch2': lambda fixed: chapter_2.create_model_with_assignments(fixed)[0],
+        'journey-ch3-cp': lambda fixed: chapter_3.create_cp_style_model(fixed)[0],
+        'journey-ch3-ip': lambda fixed: chapter_3.create_ip_style_model(fixed)[0],
+    }
+
+
+# =============================================================================
+# CORPUS AND MEASUREMENT
+# =============================================================================
+
+def random_states(count, seed):
+    """Random partial states: a random subset of a complete draw (feasible), half the
+    time with one to four teams moved to other free groups of their pot"""
+    rng = random.Random(seed)
+    rules = DEFAULT_RULES
+    states = []
+    while len(states) < count:
+        # A few random pot 1 placements, completed by CP-SAT
+        seeds = dict(rules.initial_state)
+        free = [g for g in rules.groups if g not in seeds.values()]
+        rng.shuffle(free)
+        for team, group in zip([t for t in rules.pots[0] if t not in seeds], free[:rng.randint(0, 3)]):
+            seeds[team] = group
+        draw = solve_completion(seeds)
+        if draw is None:
+            continue
+
+        teams = rng.sample(rules.all_teams, rng.randint(1, rules.num_teams - 1))
+        state = {t: draw[t] for t in teams}
+        if rng.random() < 0.5:
+            for team in rng.sample(teams, min(len(teams), rng.randint(1, 4))):
+                pot = rules.pots[rules.team_pot[team]]
+                taken = {state[t] for t in pot if t in state and t != team}
+                state[team] = rng.choice([g for g in rules.groups if g not in taken])
+        states.append(state)
+    return states
+
+def solve(model):
+    """(feasible, or None when the time limit is hit; seconds)"""
+    solver = create_solver()
+    start = time.perf_counter()
+    status = solver.Solve(model)
+    seconds = time.perf_counter() - start
+    if status == cp_model.UNKNOWN:
+        return None, seconds
+    return status in (cp_model.OPTIMAL, cp_model.FEASIBLE), seconds
+
+def measure_chunk(states, include_journey):
+    """[(state index, {encoding: {feasible, build, copy, solve, variables, constraints}})]
+
+    build is the time to build the model from scratch, copy the time to copy a model
+    built once (as api/solver.py ModelTemplate does) and pin the fixed teams."""
+    templates = {name: builder() for name, builder in RULE_ENCODINGS.items()}
+    journey = journey_encodings() if include_journey else {}
+    results = []
+    for idx, state in states:
+        row = {}
+        for name, builder in RULE_ENCODINGS.items():
+            start = time.perf_counter()
+            pin_assignments(*builder(), state)
+            built = time.perf_counter()
+            template, pin = templates[name]
+            model = pin_assignments(template.Clone(), pin, state)
+            copied = time.perf_counter()
+            feasible, solve_time = solve(model)
+            proto = model.Proto()
+            row[name] = {'feasible': feasible, 'build': built - start, 'copy': copied - built, 'solve': solve_time,
+                         'variables': len(proto.variables), 'constraints': len(proto.constraints)}
+        for name, build in journey.items():
+            start = time.perf_counter()
+            model = build(state)
+            built = time.perf_counter()
+            feasible, solve_time = solve(model)
+            proto = model.Proto()
+            row[name] = {'feasible': feasible, 'build': built - start, 'copy': None, 'solve': solve_time,
+                         'variables': len(proto.variables), 'constraints': len(proto.constraints)}
+        results.append((idx, row))
+    return results
+
+def run_benchmark(states, jobs, include_journey, chunk_size=20):
+    chunks = [list(enumerate(states))[i:i + chunk_size] for i in range(0, len(states), chunk_size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(measure_chunk, chunk, include_journey) for chunk in chunks]
+        rows = [row for future in futures for row in future.result()]
+    return [row for _, row in sorted(rows, key=lambda item: item[0])]
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Differential benchmark of the CP-SAT encodings')
+    parser.add_argument('-n', '--states', type=int, default=500, help='Random partial states (default: 500)')
+    parser.add_argument('--corpus', help='Use a JSONL corpus (tools/corpus.py format) instead of random states')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Worker processes (default: CPUs)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    parser.add_argument('--journey', action='store_true', help='Also run the models of journey/ as they are')
+    args = parser.parse_args()
+
+    states = load_corpus(args.corpus) if args.corpus else random_states(args.states, args.seed)
+    rows = run_benchmark(states, args.jobs, args.journey)
+
+    names = list(rows[0])
+    reference = 'reified'
+    print(f"{len(states)} states, "
+          f"{sum(1 for row in rows if row[reference]['feasible'])} feasible according to {reference}\n")
+    print(f"{'encoding':<15} {'vars':>6} {'constr':>6} {'build p50':>10} {'copy p50':>9} {'solve p50':>10} "
+          f"{'solve p90':>10} {'unknown':>7} {'disagree':>8}")
+
+    totals = {}
+    disagreements = {}
+    for name in names:
+        results = [row[name] for row in rows]
+        solve_times = sorted(r['solve'] for r in results)
+        copy = '-' if results[0]['copy'] is None else \
+            f"{statistics.median(r['copy'] for r in results) * 1000:.2f}ms"
+        if name in RULE_ENCODINGS:
+            totals[name] = statistics.median(r['copy'] + r['solve'] for r in results)
+        disagreements[name] = [
+            states[idx] for idx, row in enumerate(rows)
+            if None not in (row[name]['feasible'], row[reference]['feasible'])
+            and row[name]['feasible'] != row[reference]['feasible']
+        ]
+        print(f"{name:<15} {results[0]['variables']:>6} {results[0]['constraints']:>6} "
+              f"{statistics.median(r['build'] for r in results) * 1000:>8.2f}ms {copy:>9} "
+              f"{statistics.median(solve_times) * 1000:>8.2f}ms {percentile(solve_times, 90) * 1000:>8.2f}ms "
+              f"{sum(1 for r in results if r['feasible'] is None):>7} {len(disagreements[name]):>8}")
+
+    for name in RULE_ENCODINGS:
+        for state in disagreements[name][:3]:
+            print(f"\n{name} disagrees with {reference} on {state}")
+    if any(disagreements[name] for name in RULE_ENCODINGS):
+        sys.exit("\nEncodings of the same rules disagree; no recommendation")
+
+    best = min(totals, key=totals.get)
+    print(f"\nMedian copy + solve per probe: " + ', '.join(f"{name} {t * 1000:.2f}ms" for name, t in totals.items()))
+    print(f"Recommended encoding for api/solver.py: {best}")
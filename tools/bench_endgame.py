@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the exact endgame search against CP-SAT to pick ENDGAME_MAX_UNASSIGNED.
+
+Replays simulated draws and times every probe of get_valid_group_for_team with
+both engines, bucketed by the number of teams still unassigned.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Time the engines themselves, not witness store or cache lookups
+os.environ.setdefault('WITNESS_REUSE', '0')
+os.environ.setdefault('FEASIBILITY_CACHE', '0')
+
+from api.solver import NUM_OF_TEAMS, check_feasibility, check_feasibility_exact, simulate_draw
+from tools.corpus import iter_probes
+
+
+def time_call(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def collect_timings(num_draws, max_unassigned, seed):
+    """Return {unassigned: ([cp-sat seconds], [exact seconds])} over every probe"""
+    rng = random.Random(seed)
+    timings = {}
+    for _ in range(num_draws):
+        for assignments, team, group in iter_probes(simulate_draw(rng)):
+            probe = {**assignments, team: group}
+            unassigned = NUM_OF_TEAMS - len(probe)
+            if unassigned > max_unassigned:
+                continue
+
+            cp_result, cp_time = time_call(check_feasibility, probe)
+            exact_result, exact_time = time_call(check_feasibility_exact, probe)
+            assert cp_result == exact_result, f"Engines disagree on {probe}"
+
+            cp_times, exact_times = timings.setdefault(unassigned, ([], []))
+            cp_times.append(cp_time)
+            exact_times.append(exact_time)
+
+    return timings
+
+def crossover(timings):
+    """Largest unassigned count such that the exact search wins at it and every smaller count"""
+    best = -1
+    for unassigned in sorted(timings):
+        cp_times, exact_times = timings[unassigned]
+        if statistics.median(exact_times) >= statistics.median(cp_times):
+            break
+        best = unassigned
+    return best
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark exact endgame search vs CP-SAT')
+    parser.add_argument('-n', '--draws', type=int, default=5, help='Number of simulated draws (default: 5)')
+    parser.add_argument('-m', '--max-unassigned', type=int, default=20,
+                        help='Only benchmark probes with at most this many teams left (default: 20)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    args = parser.parse_args()
+
+    timings = collect_timings(args.draws, args.max_unassigned, args.seed)
+
+    print(f"{'left':>4} {'probes':>6} {'cp-sat p50':>11} {'exact p50':>10} {'exact max':>10}")
+    for unassigned in sorted(timings):
+        cp_times, exact_times = timings[unassigned]
+        print(f"{unassigned:>4} {len(cp_times):>6} "
+              f"{statistics.median(cp_times) * 1000:>9.2f}ms "
+              f"{statistics.median(exact_times) * 1000:>8.2f}ms "
+              f"{max(exact_times) * 1000:>8.2f}ms")
+
+    print(f"\nSuggested ENDGAME_MAX_UNASSIGNED: {crossover(timings)}")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Check and time the lockstep batched simulation (api/lockstep.py) against
+simulate_draw.
+
+Both run the same seeded draws (random.Random(seed + i) for draw i); every draw
+must come out identical, teams in the same order. Exits with status 1 on any
+difference.
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Compare the procedures themselves, not what earlier runs cached
+os.environ.setdefault('FEASIBILITY_CACHE', '0')
+
+from api.lockstep import LockstepSimulator
+from api.solver import simulate_draw
+
+
+def generators(num_draws, seed):
+    return [random.Random(seed + i) for i in range(num_draws)]
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Compare lockstep batched simulation with simulate_draw')
+    parser.add_argument('-n', '--draws', type=int, default=50, help='Draws to simulate (default: 50)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Seed of the first draw (default: 2026)')
+    args = parser.parse_args()
+
+    simulator = LockstepSimulator()
+    start = time.perf_counter()
+    lockstep = simulator.simulate(generators(args.draws, args.seed))
+    lockstep_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sequential = [simulate_draw(rng) for rng in generators(args.draws, args.seed)]
+    sequential_seconds = time.perf_counter() - start
+
+    stats = simulator.stats
+    print(f"lockstep:     {lockstep_seconds:.2f}s ({args.draws / lockstep_seconds:.1f} draws/s)")
+    print(f"simulate_draw: {sequential_seconds:.2f}s ({args.draws / sequential_seconds:.1f} draws/s)")
+    print(f"{stats['picks']} picks: {stats['propagated']} decided by the domains and witness, "
+          f"{stats['witnessed']} by another draw's witness, {stats['probes']} solver probes")
+
+    mismatches = [idx for idx, (a, b) in enumerate(zip(lockstep, sequential)) if list(a.items()) != list(b.items())]
+    if mismatches:
+        print(f"MISMATCH in {len(mismatches)} draws, first: draw {mismatches[0]} (seed {args.seed + mismatches[0]})")
+        sys.exit(1)
+    print(f"All {args.draws} draws identical")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark over synthetic tournaments (see tools/synthetic_rules.py).
+
+For each group/pot count reports the CP model size, template build time,
+per-probe time of CP-SAT and of the exact endgame search, and the time of a
+full draw with each engine: CP-SAT only, and the default hybrid that switches
+to the exact search for the last ENDGAME_MAX_UNASSIGNED teams.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Time the engines themselves, not witness store or cache lookups
+os.environ.setdefault('WITNESS_REUSE', '0')
+os.environ.setdefault('FEASIBILITY_CACHE', '0')
+
+from api.rules import resolve_rules
+from api.solver import (
+    ENDGAME_MAX_UNASSIGNED, ModelTemplate, check_feasibility, check_feasibility_exact,
+    get_valid_group_for_team, simulate_draw,
+)
+from tools.corpus import iter_probes
+from tools.synthetic_rules import make_synthetic_rules
+
+ENGINES = {
+    "cp-sat": -1,  # endgame_threshold that never switches to the exact search
+    "hybrid": ENDGAME_MAX_UNASSIGNED,
+}
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def benchmark(rules, num_draws, seed):
+    template, build_time = timed(ModelTemplate, rules)
+    proto = template.model.Proto()
+    row = {
+        "teams": rules.num_teams,
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "build": build_time,
+    }
+
+    for engine, threshold in ENGINES.items():
+        draw_times = []
+        for i in range(num_draws):
+            def valid_group(team, assignments):
+                return get_valid_group_for_team(team, assignments, endgame_threshold=threshold, rules=rules)
+            final, draw_time = timed(simulate_draw, random.Random(seed + i), valid_group=valid_group, rules=rules)
+            draw_times.append(draw_time)
+        row[f"draw {engine}"] = statistics.mean(draw_times)
+
+    # Per-probe times over the probes of the last draw
+    cp_times, exact_times = [], []
+    for assignments, team, group in iter_probes(final, rules):
+        probe = {**assignments, team: group}
+        cp_times.append(timed(check_feasibility, probe, rules=rules)[1])
+        if rules.num_teams - len(probe) <= ENDGAME_MAX_UNASSIGNED:
+            exact_times.append(timed(check_feasibility_exact, probe, rules)[1])
+    row["probes"] = len(cp_times)
+    row["probe cp-sat"] = statistics.median(cp_times)
+    row["probe exact"] = statistics.median(exact_times) if exact_times else float('nan')
+    return row
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Scaling benchmark over synthetic tournaments')
+    parser.add_argument('-g', '--groups', type=int, nargs='+', default=[12, 16, 24],
+                        help='Group counts, multiples of 4 (default: 12 16 24)')
+    parser.add_argument('-p', '--pots', type=int, nargs='+', default=[4, 5], help='Pot counts (default: 4 5)')
+    parser.add_argument('--uefa-max', type=int, default=2, help='UEFA teams allowed per group (default: 2)')
+    parser.add_argument('-n', '--draws', type=int, default=1, help='Full draws per engine (default: 1)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    args = parser.parse_args()
+
+    print(f"{'format':>7} {'teams':>5} {'vars':>6} {'cons':>6} {'build':>8} {'probes':>6} "
+          f"{'probe cp':>9} {'probe ex':>9} {'draw cp':>8} {'draw hyb':>8}")
+    for num_groups in args.groups:
+        for num_pots in args.pots:
+            rules = resolve_rules(make_synthetic_rules(num_groups, num_pots, args.uefa_max, seed=args.seed))
+            row = benchmark(rules, args.draws, args.seed)
+            print(f"{num_groups:>4}x{num_pots:<2} {row['teams']:>5} {row['variables']:>6} {row['constraints']:>6} "
+                  f"{row['build'] * 1000:>6.0f}ms {row['probes']:>6} "
+                  f"{row['probe cp-sat'] * 1000:>7.1f}ms {row['probe exact'] * 1000:>7.1f}ms "
+                  f"{row['draw cp-sat']:>7.1f}s {row['draw hybrid']:>7.1f}s", flush=True)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Measure witness reuse in get_valid_group_for_team over full simulated draws.
+
+Runs the same draws with and without WITNESS_REUSE and reports, per draw, how
+many probes were answered with zero search (consistent with a stored complete
+draw) and the draw time. Both runs must produce identical draws.
+
+The witness store starts empty unless --persisted, which uses the store saved
+in api/witnesses/ (see tools/build_witnesses.py).
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# The second run repeats the first run's states: answer them by searching, not from the cache
+os.environ.setdefault('FEASIBILITY_CACHE', '0')
+
+import api.solver as solver
+from api import witnesses
+
+
+def run_draws(num_draws, seed, reuse, persisted=False):
+    """Return [(draw, {kind: probes}, seconds)] for num_draws draws"""
+    solver.WITNESS_REUSE = reuse
+    rules = solver.DEFAULT_RULES
+    store = witnesses.WitnessStore.load(rules) if persisted else witnesses.WitnessStore(rules)
+    # A fresh store is not persistent, so it never replaces the saved one at exit
+    witnesses._stores[rules.hash] = store
+    rng = random.Random(seed)
+    results = []
+    for _ in range(num_draws):
+        solver.PROBE_STATS.clear()
+        start = time.perf_counter()
+        draw = solver.simulate_draw(rng, valid_group=lambda team, assignments:
+                                    solver.get_valid_group_for_team(team, assignments, parallel=False))
+        results.append((draw, dict(solver.PROBE_STATS), time.perf_counter() - start))
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark witness reuse between consecutive probes')
+    parser.add_argument('-n', '--draws', type=int, default=10, help='Number of simulated draws (default: 10)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    parser.add_argument('--persisted', action='store_true', help='Start from the saved witness store')
+    args = parser.parse_args()
+
+    cold = run_draws(args.draws, args.seed, reuse=False)
+    warm = run_draws(args.draws, args.seed, reuse=True, persisted=args.persisted)
+
+    print(f"{'draw':>4} {'probes':>6} {'zero-search':>11} {'cp-sat':>6} {'exact':>5} {'cold':>8} {'reuse':>8}")
+    for idx, ((cold_draw, _, cold_time), (draw, stats, warm_time)) in enumerate(zip(cold, warm), 1):
+        assert cold_draw == draw, f"Draw {idx} differs with witness reuse"
+        print(f"{idx:>4} {sum(stats.values()):>6} {stats.get('witness', 0):>11} "
+              f"{stats.get('cp-sat', 0):>6} {stats.get('exact', 0):>5} "
+              f"{cold_time * 1000:>6.0f}ms {warm_time * 1000:>6.0f}ms")
+
+    probes = sum(sum(stats.values()) for _, stats, _ in warm)
+    zero_search = sum(stats.get('witness', 0) for _, stats, _ in warm)
+    print(f"\n{zero_search}/{probes} probes answered with zero search "
+          f"({zero_search / probes:.0%}); median draw time "
+          f"{statistics.median(t for _, _, t in cold) * 1000:.0f}ms -> "
+          f"{statistics.median(t for _, _, t in warm) * 1000:.0f}ms")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pre-generate the pool of complete draws behind the get_odds action (api/odds.py).
+
+With --store, workers append their draws straight to a sample store (api/samples.py)
+instead, for runs too large to hold in memory; several runs may write to one store
+at once. With --lockstep, each batch is simulated in lockstep (api/lockstep.py),
+giving the same draws.
+"""
+
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from api.odds import POOL_FILE, DrawPool, draws_to_array, draws_to_orders
+from api.lockstep import simulate_draws_lockstep
+from api.samples import SampleStore
+from api.solver import simulate_draw
+
+
+def simulate_batch(seed, num_draws, store_path=None, lockstep=False):
+    """(draws, their orders), or None once appended to the sample store"""
+    if lockstep:
+        # One generator per draw, so they can advance side by side
+        simulated = simulate_draws_lockstep([random.Random(seed * num_draws + i) for i in range(num_draws)])
+    else:
+        rng = random.Random(seed)
+        simulated = [simulate_draw(rng) for _ in range(num_draws)]
+    draws = draws_to_array(simulated)
+    if store_path is None:
+        return draws, draws_to_orders(simulated)
+    SampleStore(store_path).append(draws)
+    return None
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Pre-generate the draw pool for live odds')
+    parser.add_argument('-n', '--draws', type=int, default=10000, help='Draws to simulate (default: 10000)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Worker processes (default: CPUs)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    parser.add_argument('--append', action='store_true', help='Add to the existing pool instead of replacing it')
+    parser.add_argument('-o', '--output', default=POOL_FILE, help=f'Pool file (default: {POOL_FILE})')
+    parser.add_argument('--store', help='Append to this sample store directory instead of the pool file')
+    parser.add_argument('--lockstep', action='store_true', help='Simulate each batch of draws in lockstep')
+    args = parser.parse_args()
+
+    batch_size = 1000 if args.lockstep else 100
+    batches = [min(batch_size, args.draws - start) for start in range(0, args.draws, batch_size)]
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        arrays = list(executor.map(simulate_batch, [args.seed + i for i in range(len(batches))], batches,
+                                   [args.store] * len(batches), [args.lockstep] * len(batches)))
+
+    if args.store:
+        store = SampleStore(args.store)
+        store.compact()
+        print(f"Sample store now holds {len(store)} draws ({args.store})")
+        sys.exit(0)
+
+    pool = DrawPool.load(args.output) if args.append else DrawPool()
+    pool.add(np.concatenate([draws for draws, _ in arrays]), np.concatenate([orders for _, orders in arrays]))
+    pool.save(args.output)
+    print(f"Pool now holds {len(pool.draws)} draws ({args.output})")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Pre-build the feasibility cache (api/feasibility_cache.py) to ship with a deployment.
+
+Simulates full draws in worker processes, each writing the answers it proves to the
+same SQLite file, then folds the write-ahead log into the file and shrinks it so it
+can be read on a read-only filesystem.
+"""
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api import feasibility_cache
+from api.feasibility_cache import CACHE_FILE, FeasibilityCache
+from api.solver import simulate_draw
+
+
+def use_cache(path):
+    feasibility_cache._cache = FeasibilityCache(path)
+
+def simulate_batch(seed, num_draws):
+    rng = random.Random(seed)
+    for _ in range(num_draws):
+        simulate_draw(rng)
+    cache = feasibility_cache.get_feasibility_cache()
+    # Worker processes exit without running atexit handlers
+    cache.flush()
+    return cache.metrics()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Pre-build the SQLite feasibility cache')
+    parser.add_argument('-n', '--draws', type=int, default=1000, help='Draws to simulate (default: 1000)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Worker processes (default: CPUs)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    parser.add_argument('-o', '--output', default=CACHE_FILE, help=f'Cache file (default: {CACHE_FILE})')
+    args = parser.parse_args()
+
+    batch_size = 10
+    batches = [min(batch_size, args.draws - start) for start in range(0, args.draws, batch_size)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=use_cache, initargs=(args.output,)) as executor:
+        stats = list(executor.map(simulate_batch, [args.seed + i for i in range(len(batches))], batches))
+
+    hits = sum(s['memory_hits'] + s['disk_hits'] for s in stats)
+    lookups = hits + sum(s['misses'] for s in stats)
+    cache = FeasibilityCache(args.output)
+    cache.compact()
+    print(f"{args.draws} draws in {time.perf_counter() - start:.1f}s, "
+          f"{hits / max(1, lookups):.1%} of lookups answered by the cache")
+    print(f"{cache.entries()} entries, {os.path.getsize(args.output) / 1024:.0f} KB ({args.output})")
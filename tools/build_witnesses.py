@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Fill the witness store (api/witnesses.py) behind instant feasibility answers with
+the complete draws of a draw pool (see tools/build_draw_pool.py).
+
+Probes add the draws they find to the store as they run; this seeds it up front.
+"""
+
+import os
+import sys
+
+# Add project root to path (so 'from api.witnesses import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from api.odds import POOL_FILE
+from api.witnesses import WitnessStore, get_witness_store
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Seed the witness store from a pool of complete draws')
+    parser.add_argument('pool', nargs='?', default=POOL_FILE, help=f'.npy file of draws (default: {POOL_FILE})')
+    parser.add_argument('--replace', action='store_true', help='Drop the stored witnesses first')
+    args = parser.parse_args()
+
+    store = get_witness_store()
+    if args.replace:
+        store = WitnessStore(store.rules)
+    draws = np.load(args.pool, mmap_mode='r')
+    kept = store.add_rows(store.pack(draws))
+    store.save()
+    if kept < len(draws):
+        print(f"Skipped {len(draws) - kept} draws that break the rules")
+    print(f"Witness store now holds {len(store)} draws ({WitnessStore.path_for(store.rules)})")
@@ -0,0 +1,50 @@
+"""
+Corpus of realistic partial draw states for benchmarks and tuning.
+
+Each probe is the state get_valid_group_for_team checks for feasibility: the
+assignments before a team is drawn plus one candidate group for that team.
+"""
+
+import json
+import random
+
+from api.solver import (
+    DEFAULT_RULES, NUM_OF_TEAMS, get_initial_state, get_occupied_groups, get_pot, simulate_draw,
+)
+
+
+def iter_probes(final_assignments, rules=DEFAULT_RULES):
+    """Yield (assignments, team, group) for every probe of a recorded draw, in order"""
+    assignments = get_initial_state(rules)
+    for team in [t for t in final_assignments if t not in assignments]:
+        occupied = get_occupied_groups(get_pot(team, rules), assignments)
+        for group in rules.groups:
+            if group in occupied:
+                continue
+            yield dict(assignments), team, group
+            if group == final_assignments[team]:
+                break
+        assignments[team] = final_assignments[team]
+
+def build_corpus(num_draws, seed=2026, min_unassigned=0):
+    """Probe states of simulated draws that leave at least min_unassigned teams open"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(num_draws):
+        for assignments, team, group in iter_probes(simulate_draw(rng)):
+            probe = {**assignments, team: group}
+            if NUM_OF_TEAMS - len(probe) >= min_unassigned:
+                corpus.append(probe)
+    return corpus
+
+def save_corpus(corpus, path):
+    with open(path, 'w') as f:
+        for assignments in corpus:
+            f.write(json.dumps({'assignments': assignments}) + '\n')
+
+def load_corpus(path):
+    with open(path) as f:
+        return [
+            {str(k): int(v) for k, v in json.loads(line)['assignments'].items()}
+            for line in f if line.strip()
+        ]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Search for the partial draw states the solver is slowest on.
+
+Guided random walks follow the draw procedure (pots in order, teams shuffled,
+each placed in its lowest valid group) and time every get_valid_group_for_team
+step probe by probe. Walks restart either from the initial state or from a
+mutation of one of the slowest states found so far:
+
+- rewind     undo the last few teams of the state and walk on in another order
+- swap       exchange the groups of two teams of one pot (kept only if the draw can
+             still be completed: a state the API may be asked about, if not one the
+             draw procedure reaches)
+- next_team  draw another team of the current pot next
+
+The slowest states are timed again (median of --repeat runs) and their slowest
+probes saved, in the tools/corpus.py format, as a regression corpus for
+tools/tune_solver.py --corpus and the other benchmarks.
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Time the engines themselves, not witness store or cache lookups
+os.environ.setdefault('WITNESS_REUSE', '0')
+os.environ.setdefault('FEASIBILITY_CACHE', '0')
+
+from api.solver import (
+    DEFAULT_RULES, ENDGAME_MAX_UNASSIGNED, check_feasibility, get_initial_state, get_occupied_groups, get_pot,
+    probe_group,
+)
+from tools.latency import SUMMARY_HEADER, format_summary, summarize
+
+MUTATIONS = ('rewind', 'swap', 'next_team')
+
+
+def timed_step(team, assignments, rules=DEFAULT_RULES):
+    """(group, [(group, seconds, feasible)]): get_valid_group_for_team's sequential
+    scan, with each probe timed"""
+    occupied = get_occupied_groups(get_pot(team, rules), assignments)
+    exact = rules.num_teams - len(assignments) <= ENDGAME_MAX_UNASSIGNED
+    probes = []
+    for group in rules.groups:
+        if group in occupied:
+            continue
+        start = time.perf_counter()
+        feasible = probe_group({**assignments, team: group}, exact, rules=rules)
+        probes.append((group, time.perf_counter() - start, feasible))
+        if feasible:
+            return group, probes
+    return None, probes
+
+def cost(probes, objective):
+    return len(probes) if objective == 'probes' else sum(seconds for _, seconds, _ in probes)
+
+def remaining_teams(assignments, rules=DEFAULT_RULES):
+    """Unassigned teams of the first pot not yet complete ([] once the draw is)"""
+    for pot in rules.pots:
+        remaining = [t for t in pot if t not in assignments]
+        if remaining:
+            return remaining
+    return []
+
+
+class Fuzzer:
+    """Keeps the `keep` costliest (state, team) steps seen, by state"""
+
+    def __init__(self, objective='time', keep=50, steps=12, rng=None, rules=DEFAULT_RULES):
+        self.objective = objective
+        self.keep = keep
+        self.steps = steps
+        self.rng = rng or random.Random()
+        self.rules = rules
+        self.found = {}  # (state key, team) -> (cost, assignments, team, probes, origin)
+        self.evaluated = 0
+
+    def record(self, assignments, team, probes, origin):
+        self.evaluated += 1
+        key = (tuple(sorted(assignments.items())), team)
+        entry = (cost(probes, self.objective), dict(assignments), team, probes, origin)
+        if key in self.found and self.found[key][0] >= entry[0]:
+            return
+        self.found[key] = entry
+        if len(self.found) > 2 * self.keep:
+            ranked = sorted(self.found.items(), key=lambda item: item[1][0], reverse=True)
+            self.found = dict(ranked[:self.keep])
+
+    def walk(self, assignments, origin, first_team=None):
+        """Follow the draw procedure for up to `steps` teams, recording each step"""
+        assignments = dict(assignments)
+        for step in range(self.steps):
+            remaining = remaining_teams(assignments, self.rules)
+            if not remaining:
+                return
+            team = first_team if step == 0 and first_team in remaining else self.rng.choice(remaining)
+            group, probes = timed_step(team, assignments, self.rules)
+            self.record(assignments, team, probes, origin)
+            if group is None:
+                return
+            assignments[team] = group
+
+    def random_start(self):
+        """A state partway through a draw, reached by the draw procedure itself
+        (its steps are recorded too)"""
+        assignments = get_initial_state(self.rules)
+        depth = self.rng.randrange(self.rules.num_teams - len(assignments))
+        for _ in range(depth):
+            team = self.rng.choice(remaining_teams(assignments, self.rules))
+            group, probes = timed_step(team, assignments, self.rules)
+            self.record(assignments, team, probes, 'walk')
+            if group is None:
+                break
+            assignments[team] = group
+        return assignments
+
+    def parent(self):
+        """A slow state, by tournament among those found"""
+        entries = list(self.found.values())
+        return max(self.rng.sample(entries, min(3, len(entries))), key=lambda entry: entry[0])
+
+    def mutate(self, mutation, assignments, team):
+        """(start state, first team) or None if the mutation doesn't apply"""
+        initial = self.rules.initial_state
+        drawn = [t for t in assignments if t not in initial]
+        if mutation == 'rewind':
+            if not drawn:
+                return None
+            undo = set(drawn[-self.rng.randint(1, min(len(drawn), self.steps)):])
+            return {t: g for t, g in assignments.items() if t not in undo}, None
+
+        if mutation == 'swap':
+            pot = self.rules.pots[self.rules.team_pot[self.rng.choice(drawn)]] if drawn else []
+            teams = [t for t in pot if t in assignments and t not in initial]
+            if len(teams) < 2:
+                return None
+            first, second = self.rng.sample(teams, 2)
+            swapped = {**assignments, first: assignments[second], second: assignments[first]}
+            if not check_feasibility(swapped, rules=self.rules):
+                return None
+            return swapped, team
+
+        others = [t for t in remaining_teams(assignments, self.rules) if t != team]
+        if not others:
+            return None
+        return assignments, self.rng.choice(others)
+
+    def run(self, iterations, explore=0.3):
+        for _ in range(iterations):
+            if not self.found or self.rng.random() < explore:
+                self.walk(self.random_start(), 'walk')
+                continue
+            _, assignments, team, _, _ = self.parent()
+            mutation = self.rng.choice(MUTATIONS)
+            start = self.mutate(mutation, assignments, team)
+            if start is not None:
+                self.walk(start[0], mutation, start[1])
+
+    def finalists(self, repeat=3):
+        """The kept steps timed again (median of `repeat` runs), costliest first"""
+        ranked = sorted(self.found.values(), key=lambda entry: entry[0], reverse=True)[:self.keep]
+        results = []
+        for _, assignments, team, _, origin in ranked:
+            runs = [timed_step(team, assignments, self.rules)[1] for _ in range(repeat)]
+            probes = runs[0]
+            seconds = [statistics.median(run[i][1] for run in runs) for i in range(len(probes))]
+            slowest = max(range(len(probes)), key=seconds.__getitem__)
+            results.append({
+                'assignments': {**assignments, team: probes[slowest][0]},
+                'state': assignments,
+                'team': team,
+                'probes': len(probes),
+                'seconds': sum(seconds),
+                'probe_seconds': seconds[slowest],
+                'origin': origin,
+            })
+        results.sort(key=lambda result: result['probes' if self.objective == 'probes' else 'seconds'], reverse=True)
+        return results
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Fuzz the solver for its slowest partial draw states')
+    parser.add_argument('-n', '--iterations', type=int, default=100, help='Walks to run (default: 100)')
+    parser.add_argument('--steps', type=int, default=12, help='Teams drawn per walk (default: 12)')
+    parser.add_argument('--objective', choices=('time', 'probes'), default='time',
+                        help='Maximize solve time or probes per step (default: time)')
+    parser.add_argument('--keep', type=int, default=50, help='States kept and saved (default: 50)')
+    parser.add_argument('--explore', type=float, default=0.3,
+                        help='Share of walks from a fresh random state rather than a mutation (default: 0.3)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timings per finalist (default: 3)')
+    parser.add_argument('--seed', type=int, default=2026)
+    parser.add_argument('--output', default='slow_states.jsonl', help='Corpus to write (default: slow_states.jsonl)')
+    args = parser.parse_args()
+
+    fuzzer = Fuzzer(args.objective, args.keep, args.steps, random.Random(args.seed))
+    start = time.perf_counter()
+    fuzzer.run(args.iterations, args.explore)
+    print(f"{fuzzer.evaluated} steps evaluated in {time.perf_counter() - start:.1f}s")
+
+    results = fuzzer.finalists(args.repeat)
+    with open(args.output, 'w') as f:
+        for result in results:
+            f.write(json.dumps(result) + '\n')
+
+    print(f"\nSlowest {len(results)} steps (get_valid_group_for_team, median of {args.repeat}):")
+    print(SUMMARY_HEADER)
+    print(format_summary(summarize([result['seconds'] for result in results])))
+    print(f"\n{'team':<6} {'assigned':>8} {'probes':>6} {'step':>9} {'probe':>9}  origin")
+    for result in results[:10]:
+        print(f"{result['team']:<6} {len(result['state']):>8} {result['probes']:>6} "
+              f"{result['seconds'] * 1000:>7.1f}ms {result['probe_seconds'] * 1000:>7.1f}ms  {result['origin']}")
+    print(f"\nWrote {args.output}; origins: "
+          + ', '.join(f"{origin} {sum(r['origin'] == origin for r in results)}"
+                      for origin in ('walk',) + MUTATIONS))
@@ -0,0 +1,32 @@
+"""
+Latency summaries shared by the benchmark and load testing tools.
+"""
+
+import math
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile (q in 0-100) of an already sorted list"""
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(values):
+    """Count, mean, p50/p90/p99 and max of a list of seconds"""
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) if values else float('nan'),
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else float('nan'),
+    }
+
+SUMMARY_HEADER = f"{'count':>7} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"
+
+def format_summary(summary):
+    """One table row matching SUMMARY_HEADER, times in milliseconds"""
+    times = ' '.join(f"{summary[k] * 1000:>7.1f}ms" for k in ('mean', 'p50', 'p90', 'p99', 'max'))
+    return f"{summary['count']:>7} {times}"
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Synthetic load generator for local_server.py.
+
+Each virtual user loads the initial state and then completes a draw the way
+public/draw.js and public/ui-highlights.js do: either a full draw (random team
+from the current pot, 200ms between teams) or the two-click flow (click a team,
+think, sometimes cancel and pick another, then confirm).
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+# Add project root to path (so 'from tools.api_client import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tools.api_client import DEFAULT_API_URL, call_api
+from tools.latency import SUMMARY_HEADER, format_summary, summarize
+
+FULL_DRAW_DELAY = 0.2  # processFullDraw in public/draw.js
+
+
+def get_current_pot(pots, assignments):
+    """Same as getCurrentPot in public/api.js (0 once the draw is complete)"""
+    for pot in sorted(pots, key=int):
+        if any(t not in assignments for t in pots[pot]):
+            return int(pot)
+    return 0
+
+class Stats:
+    """Thread-safe latency and error samples keyed by (kind, label)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, keys, latency=None, error=False):
+        with self.lock:
+            for key in keys:
+                if error:
+                    self.errors[key] = self.errors.get(key, 0) + 1
+                else:
+                    self.latencies.setdefault(key, []).append(latency)
+
+    def report(self, elapsed):
+        total = sum(len(v) for k, v in self.latencies.items() if k[0] == 'action')
+        errors = sum(v for k, v in self.errors.items() if k[0] == 'action')
+        print(f"{total + errors} requests in {elapsed:.1f}s ({(total + errors) / elapsed:.1f} req/s), "
+              f"error rate {errors / max(1, total + errors):.2%}")
+        for kind in ('action', 'pot'):
+            print(f"\n{kind:<18} {SUMMARY_HEADER} {'errors':>7}")
+            for key in sorted(set(self.latencies) | set(self.errors), key=str):
+                if key[0] != kind:
+                    continue
+                summary = summarize(self.latencies.get(key, []))
+                print(f"{str(key[1]):<18} {format_summary(summary)} {self.errors.get(key, 0):>7}")
+
+def timed_call(stats, url, keys, action, assignments=None, **data):
+    start = time.perf_counter()
+    try:
+        result = call_api(url, action, assignments, **data)
+    except Exception:
+        stats.record(keys, error=True)
+        raise
+    stats.record(keys, time.perf_counter() - start)
+    return result
+
+def run_session(url, rng, stats, full_draw, think_range, cancel_ratio, deadline, client_id):
+    """One user drawing every team once (or until the deadline); raises on the first failed request"""
+    initial = timed_call(stats, url, [('action', 'get_initial_state')], 'get_initial_state')
+    pots, assignments = initial['pots'], initial['assignments']
+    action = 'full_draw' if full_draw else 'click'
+    # As public/api.js: the server limits requests per client and queues full draws behind clicks
+    request = {'client_id': client_id, 'mode': action}
+
+    while (pot := get_current_pot(pots, assignments)) > 0 and time.time() < deadline:
+        unassigned = [t for t in pots[str(pot)] if t not in assignments]
+        team = rng.choice(unassigned)
+        keys = [('action', action), ('pot', pot)]
+        valid_group = timed_call(stats, url, keys, 'get_valid_group', assignments, team=team,
+                                 **request)['valid_group']
+        if valid_group is None:
+            raise RuntimeError(f"No valid group for {team}")
+
+        if full_draw:
+            time.sleep(FULL_DRAW_DELAY)
+        else:
+            time.sleep(rng.uniform(*think_range))
+            if len(unassigned) > 1 and rng.random() < cancel_ratio:
+                continue  # Cancelled the selection; another team is clicked next
+        assignments[team] = valid_group
+
+def virtual_user(url, seed, deadline, stats, args):
+    rng = random.Random(seed)
+    while time.time() < deadline:
+        try:
+            run_session(url, rng, stats, rng.random() < args.full_draw_ratio,
+                        (args.think_min, args.think_max), args.cancel_ratio, deadline, f"loadgen-{seed}")
+        except Exception:
+            time.sleep(1)  # Back off like a user hitting "Start Over" after an error
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Virtual-user load generator for local_server.py')
+    parser.add_argument('--url', default=DEFAULT_API_URL, help=f'API endpoint (default: {DEFAULT_API_URL})')
+    parser.add_argument('-u', '--users', type=int, default=10, help='Concurrent virtual users (default: 10)')
+    parser.add_argument('-d', '--duration', type=float, default=60, help='Seconds to run (default: 60)')
+    parser.add_argument('--full-draw-ratio', type=float, default=0.5,
+                        help='Share of sessions that run a full draw instead of clicking (default: 0.5)')
+    parser.add_argument('--think-min', type=float, default=0.5, help='Min think time between clicks (default: 0.5)')
+    parser.add_argument('--think-max', type=float, default=3.0, help='Max think time between clicks (default: 3.0)')
+    parser.add_argument('--cancel-ratio', type=float, default=0.1,
+                        help='Chance a click is cancelled in favour of another team (default: 0.1)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    args = parser.parse_args()
+
+    stats = Stats()
+    start = time.time()
+    users = [
+        threading.Thread(target=virtual_user, args=(args.url, args.seed + i, start + args.duration, stats, args),
+                         daemon=True)
+        for i in range(args.users)
+    ]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+
+    stats.report(time.time() - start)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Compare group distributions across every resolution of the playoff placeholders.
+
+Each scenario fixes the confederation of the intercontinental playoff winners
+(YA, ZA); see api/scenarios.py. Reports how far each scenario moves teams'
+group probabilities away from the unresolved draw.
+"""
+
+import os
+import sys
+
+# Add project root to path (so 'from api.scenarios import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from api.scenarios import SCENARIOS, scenario_name, sweep_scenarios
+from api.solver import ALL_TEAMS
+
+GROUP_LETTERS = "ABCDEFGHIJKL"
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Sweep playoff placeholder resolutions')
+    parser.add_argument('-n', '--draws', type=int, default=20, help='Draws per scenario (default: 20)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Worker processes (default: CPUs)')
+    parser.add_argument('--top', type=int, default=3, help='Largest shifts to list per scenario (default: 3)')
+    args = parser.parse_args()
+
+    probabilities = sweep_scenarios(args.draws, args.seed, args.jobs)
+    baseline = probabilities[0]
+
+    print(f"{args.draws} draws per scenario; shifts are vs. the unresolved draw\n")
+    for idx, scenario in enumerate(SCENARIOS[1:], 1):
+        shift = probabilities[idx] - baseline
+        total_variation = np.abs(shift).sum(axis=1).max() / 2
+        print(f"{scenario_name(scenario):<28} max team total variation {total_variation:.3f}")
+        for flat in np.argsort(-np.abs(shift), axis=None)[:args.top]:
+            team, group = divmod(int(flat), shift.shape[1])
+            if shift[team, group] == 0:
+                break
+            print(f"    {ALL_TEAMS[team]} in Group {GROUP_LETTERS[group]}: "
+                  f"{baseline[team, group]:.3f} -> {probabilities[idx][team, group]:.3f}")
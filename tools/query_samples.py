@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Query a sample store (api/samples.py) written by tools/build_draw_pool.py --store.
+
+Counts the draws agreeing with a partial assignment and prints the group
+probabilities of a team over them, reading the store chunk by chunk within
+the memory limit (SAMPLE_MEMORY_LIMIT).
+"""
+
+import json
+import os
+import sys
+import time
+
+# Add project root to path (so 'from api.samples import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.samples import MEMORY_LIMIT, TEAM_INDEX, SampleStore
+
+GROUP_LETTERS = "ABCDEFGHIJKL"
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Filter and aggregate the draws of a sample store')
+    parser.add_argument('store', help='Sample store directory')
+    parser.add_argument('--assignments', default='{}', help='JSON partial assignment, e.g. \'{"CA": 3, "EA": 7}\'')
+    parser.add_argument('--team', default='CA', help='Team to show group probabilities for (default: CA)')
+    parser.add_argument('--memory-limit', type=int, default=MEMORY_LIMIT,
+                        help=f'Bytes a query may hold at once (default: {MEMORY_LIMIT})')
+    args = parser.parse_args()
+
+    store = SampleStore(args.store, args.memory_limit)
+    assignments = json.loads(args.assignments)
+    start = time.perf_counter()
+    counts = store.group_counts(assignments)
+    seconds = time.perf_counter() - start
+
+    matching = int(counts[0].sum())
+    print(f"{matching} of {len(store)} draws match ({seconds:.2f}s)")
+    if matching:
+        probabilities = counts[TEAM_INDEX[args.team]] / matching
+        print(f"\nGroup probabilities of {args.team}:")
+        for group, p in enumerate(probabilities):
+            if p:
+                print(f"  {GROUP_LETTERS[group]}  {p:.3f}")
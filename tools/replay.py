@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Replay get_valid_group requests captured with CAPTURE_FILE=... (see api/index.py).
+
+Re-issues the captured requests against a running local_server.py or directly
+against the solver, keeping their original spacing divided by --speedup, and
+reports throughput, latency percentiles and answers that differ from the capture.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.solver import get_valid_group_for_team
+from tools.api_client import DEFAULT_API_URL, call_api
+from tools.latency import SUMMARY_HEADER, format_summary, summarize
+
+
+def load_capture(path, limit=None):
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    records.sort(key=lambda r: r['time'])
+    return records[:limit] if limit else records
+
+def solve_direct(record):
+    return get_valid_group_for_team(record['team'], record['assignments'])
+
+def solve_http(url):
+    def solve(record):
+        # Each replay thread is one client, so the server's per-client limit applies per thread
+        client_id = f"replay-{threading.get_ident()}"
+        return call_api(url, 'get_valid_group', record['assignments'], team=record['team'],
+                        client_id=client_id)['valid_group']
+    return solve
+
+def replay(records, solve, concurrency, speedup):
+    """Issue every record; return (wall seconds, [(record, answer, latency, error)])"""
+    first = records[0]['time']
+    results = [None] * len(records)
+    start = time.perf_counter()
+
+    def issue(idx):
+        record = records[idx]
+        if speedup > 0:
+            delay = (record['time'] - first) / speedup - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        sent = time.perf_counter()
+        try:
+            answer, error = solve(record), None
+        except Exception as e:
+            answer, error = None, f"{type(e).__name__}: {e}"
+        results[idx] = (record, answer, time.perf_counter() - sent, error)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(issue, range(len(records))))
+
+    return time.perf_counter() - start, results
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Replay captured get_valid_group requests')
+    parser.add_argument('capture', help='JSONL file written with CAPTURE_FILE')
+    parser.add_argument('--url', default=DEFAULT_API_URL, help=f'API endpoint (default: {DEFAULT_API_URL})')
+    parser.add_argument('--direct', action='store_true', help='Call the solver in-process instead of over HTTP')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='Requests in flight (default: 4)')
+    parser.add_argument('--speedup', type=float, default=1.0,
+                        help='Divide captured spacing by this factor, 0 for as fast as possible (default: 1)')
+    parser.add_argument('--limit', type=int, help='Replay only the first N requests')
+    args = parser.parse_args()
+
+    records = load_capture(args.capture, args.limit)
+    if not records:
+        sys.exit(f"No requests in {args.capture}")
+
+    solve = solve_direct if args.direct else solve_http(args.url)
+    elapsed, results = replay(records, solve, args.concurrency, args.speedup)
+
+    errors = [r for r in results if r[3] is not None]
+    mismatches = [r for r in results if r[3] is None and r[1] != r[0]['valid_group']]
+    latencies = [r[2] for r in results if r[3] is None]
+
+    print(f"Replayed {len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.1f} req/s)")
+    print(f"\n{SUMMARY_HEADER}")
+    if latencies:
+        print(format_summary(summarize(latencies)) + "  replay")
+    print(format_summary(summarize([r['latency'] for r in records])) + "  captured")
+
+    print(f"\nErrors: {len(errors)}  Mismatches: {len(mismatches)}")
+    for record, answer, _, error in (errors + mismatches)[:10]:
+        print(f"  {record['team']}: captured {record['valid_group']}, got {error or answer}")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Summarize a trace written by api/tracing.py (traces/<trace_id>.json).
+
+Totals time per span name across every request of the trace, and lists the
+slowest requests with the spans inside them, to see where the seconds of a slow
+draw went before opening the file in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import json
+import sys
+from collections import defaultdict
+
+
+def load_trace(path):
+    """Events of a trace file; the array may be left open"""
+    with open(path) as f:
+        text = f.read().strip()
+    if not text.endswith(']'):
+        text += ']'
+    return json.loads(text)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Time per span of a Chrome trace file')
+    parser.add_argument('trace', help='Trace file, e.g. traces/full-draw-....json')
+    parser.add_argument('--slowest', type=int, default=5, help='Slowest requests to break down (default: 5)')
+    args = parser.parse_args()
+
+    events = [e for e in load_trace(args.trace) if e.get('ph') == 'X']
+    requests = [e for e in events if e['cat'] == 'request' and e['name'] not in ('parse_request', 'admission_wait')]
+    if not requests:
+        sys.exit("No requests in trace")
+    wall = max(e['ts'] + e['dur'] for e in events) - min(e['ts'] for e in events)
+    print(f"{len(requests)} requests, {sum(r['dur'] for r in requests) / 1000:.1f}ms in requests "
+          f"over {wall / 1000:.1f}ms wall time\n")
+
+    totals = defaultdict(lambda: [0, 0])
+    for event in events:
+        totals[event['name']][0] += 1
+        totals[event['name']][1] += event['dur']
+    print(f"{'span':<20} {'count':>6} {'total':>10} {'mean':>9}")
+    for name, (count, total) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        print(f"{name:<20} {count:>6} {total / 1000:>8.1f}ms {total / count / 1000:>7.2f}ms")
+
+    for request in sorted(requests, key=lambda r: -r['dur'])[:args.slowest]:
+        end = request['ts'] + request['dur']
+        inside = [e for e in events if e is not request and e['pid'] == request['pid']
+                  and e['tid'] == request['tid'] and request['ts'] <= e['ts'] <= end]
+        label = ', '.join(f"{k}={v}" for k, v in request.get('args', {}).items())
+        print(f"\n{request['name']} ({label}) {request['dur'] / 1000:.1f}ms")
+        for event in sorted(inside, key=lambda e: e['ts']):
+            details = ', '.join(f"{k}={v}" for k, v in event.get('args', {}).items())
+            print(f"  +{(event['ts'] - request['ts']) / 1000:>7.1f}ms {event['name']:<18} "
+                  f"{event['dur'] / 1000:>7.1f}ms {details}")
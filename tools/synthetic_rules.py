@@ -0,0 +1,69 @@
+"""
+Synthetic tournament rule sets for scaling experiments.
+
+Rules are generated around a hidden valid draw, so every generated rule set is
+guaranteed to be completable: confederations are spread over the groups within
+their limits, pots are the group positions of that draw, and the separated top
+teams and hosts are taken from it.
+"""
+
+import random
+
+from api.rules import FORMAT_VERSION
+
+CONFEDERATION_PREFIXES = {"CONCACAF": "N", "CONMEBOL": "C", "UEFA": "E", "CAF": "F", "AFC": "A", "OFC": "X"}
+NUM_OF_ZONES = 4
+
+
+def make_synthetic_rules(num_groups, num_pots, uefa_max=2, double_uefa_share=1 / 3, seed=0):
+    """Rules dict for num_groups groups of num_pots teams (one per pot)"""
+    if num_groups % NUM_OF_ZONES:
+        raise ValueError(f"num_groups must be a multiple of {NUM_OF_ZONES}")
+    others = [c for c in CONFEDERATION_PREFIXES if c != "UEFA"]
+    if num_pots - 1 > len(others):
+        raise ValueError(f"At most {len(others) + 1} pots fit one team per non-UEFA confederation")
+
+    rng = random.Random(seed)
+    counters = dict.fromkeys(CONFEDERATION_PREFIXES, 0)
+    confederations = {c: [] for c in CONFEDERATION_PREFIXES}
+    hidden_draw = []  # hidden_draw[group][position] = team
+
+    def new_team(confederation):
+        counters[confederation] += 1
+        team = f"{CONFEDERATION_PREFIXES[confederation]}{counters[confederation]:02d}"
+        confederations[confederation].append(team)
+        return team
+
+    for _ in range(num_groups):
+        num_uefa = min(uefa_max, num_pots, 2 if rng.random() < double_uefa_share else 1)
+        labels = ["UEFA"] * num_uefa + rng.sample(others, num_pots - num_uefa)
+        rng.shuffle(labels)
+        hidden_draw.append([new_team(c) for c in labels])
+
+    pots = [[hidden_draw[g][p] for g in range(num_groups)] for p in range(num_pots)]
+    for pot in pots:
+        rng.shuffle(pot)
+
+    zone_size = num_groups // NUM_OF_ZONES
+    zones = [list(range(z * zone_size + 1, (z + 1) * zone_size + 1)) for z in range(NUM_OF_ZONES)]
+    top_4 = [hidden_draw[zone[0] - 1][0] for zone in zones]
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "name": f"Synthetic {num_groups}x{num_pots}",
+        "version": f"seed-{seed}",
+        "num_groups": num_groups,
+        "teams_per_group": num_pots,
+        "confederations": {c: teams for c, teams in confederations.items() if teams},
+        "confederation_limits": {
+            c: {"min": 1, "max": uefa_max} if c == "UEFA" else {"min": 0, "max": 1}
+            for c, teams in confederations.items() if teams
+        },
+        "pots": pots,
+        "separations": [
+            {"name": "t2", "teams": [top_4[0], top_4[2]], "zones": [zones[0] + zones[1], zones[2] + zones[3]]},
+            {"name": "t4", "teams": top_4, "zones": zones},
+        ],
+        # Like the hosts: a pot-1 team pre-assigned to each of the first groups
+        "initial_state": {hidden_draw[g][0]: g + 1 for g in (0, 1)},
+    }
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tune CP-SAT parameters for check_feasibility over a corpus of partial draw states.
+
+Runs a grid or random search over solver parameters, timing Solve on every
+state of the corpus as production builds it (the model template instantiated with
+the state pinned, hinted with the draw found for the state before), and writes the winning configuration to the file that
+api/solver.py loads at startup (api/solver_params.json by default).
+"""
+
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+# Add project root to path (so 'from api.solver import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ortools.sat.python import cp_model
+from api.solver import ENDGAME_MAX_UNASSIGNED, SOLVER_PARAMS_FILE, create_solver, get_model_template
+from tools.corpus import build_corpus, load_corpus, save_corpus
+from tools.latency import SUMMARY_HEADER, format_summary, summarize
+
+SEARCH_SPACE = {
+    "num_workers": [1, 2, 4, 8],
+    "cp_model_presolve": [True, False],
+    "symmetry_level": [0, 1, 2],
+    "search_branching": ["AUTOMATIC_SEARCH", "FIXED_SEARCH", "PORTFOLIO_SEARCH"],
+    "linearization_level": [0, 1, 2],
+}
+
+
+def grid_configs():
+    names = list(SEARCH_SPACE)
+    for values in itertools.product(*(SEARCH_SPACE[n] for n in names)):
+        yield dict(zip(names, values))
+
+def random_configs(trials, rng):
+    """Up to `trials` distinct random configurations"""
+    all_configs = list(grid_configs())
+    return rng.sample(all_configs, min(trials, len(all_configs)))
+
+def run_config(models, params):
+    """Solve every model with params; return (feasibility per model, solve seconds per model)"""
+    results, times = [], []
+    for model in models:
+        solver = create_solver(params)
+        start = time.perf_counter()
+        status = solver.Solve(model)
+        times.append(time.perf_counter() - start)
+        results.append(status in (cp_model.OPTIMAL, cp_model.FEASIBLE))
+    return results, times
+
+def production_models(corpus):
+    """The models run_completion solves for the corpus states: each hinted, like the
+    witness store's latest draw, with the completion found for the state before"""
+    template = get_model_template()
+    models, hint = [], None
+    for assignments in corpus:
+        model = template.instantiate(assignments, hint)
+        solver = create_solver({})
+        if solver.Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            hint = template.solution(solver)
+        models.append(model)
+    return models
+
+def tune(corpus, configs, metric):
+    """Return [(params, summary)] sorted best first; configs that change an answer are dropped"""
+    models = production_models(corpus)
+    reference, baseline_times = run_config(models, {})
+    ranked = [({}, summarize(baseline_times))]
+
+    for params in configs:
+        results, times = run_config(models, params)
+        if results != reference:
+            print(f"  skipped {params}: answers differ from defaults (time limit hit?)")
+            continue
+        ranked.append((params, summarize(times)))
+        print(f"  {format_summary(ranked[-1][1])}  {params}")
+
+    return sorted(ranked, key=lambda entry: (entry[1][metric], entry[1]['mean']))
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Tune CP-SAT parameters over a corpus of draw states')
+    parser.add_argument('-n', '--draws', type=int, default=5, help='Simulated draws for the corpus (default: 5)')
+    parser.add_argument('-s', '--seed', type=int, default=2026, help='Random seed (default: 2026)')
+    parser.add_argument('--corpus', help='Load the corpus from this JSONL file instead of simulating')
+    parser.add_argument('--save-corpus', help='Save the simulated corpus to this JSONL file')
+    parser.add_argument('--grid', action='store_true', help='Try the full grid instead of random configs')
+    parser.add_argument('-t', '--trials', type=int, default=20, help='Random configs to try (default: 20)')
+    parser.add_argument('--metric', choices=['mean', 'p50', 'p90', 'p99', 'max'], default='p90',
+                        help='Statistic used to pick the winner (default: p90)')
+    parser.add_argument('-o', '--output', default=SOLVER_PARAMS_FILE,
+                        help=f'Where to write the winning parameters (default: {SOLVER_PARAMS_FILE})')
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        # Only states CP-SAT actually sees; the endgame search answers the rest
+        corpus = build_corpus(args.draws, args.seed, min_unassigned=ENDGAME_MAX_UNASSIGNED + 1)
+        if args.save_corpus:
+            save_corpus(corpus, args.save_corpus)
+
+    configs = grid_configs() if args.grid else random_configs(args.trials, random.Random(args.seed))
+    print(f"Tuning over {len(corpus)} states\n  {SUMMARY_HEADER}")
+    ranked = tune(corpus, configs, args.metric)
+
+    print(f"\nTop configurations by {args.metric}:\n  {SUMMARY_HEADER}")
+    for params, summary in ranked[:5]:
+        print(f"  {format_summary(summary)}  {params or 'defaults'}")
+
+    params, summary = ranked[0]
+    with open(args.output, 'w') as f:
+        json.dump({'parameters': params, 'metric': args.metric, 'corpus_size': len(corpus),
+                   'summary': summary}, f, indent=2)
+        f.write('\n')
+    print(f"\nWrote {params or 'defaults'} to {args.output}")
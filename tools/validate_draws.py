@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Validate a large array of complete draws (.npy, N x 48) with api/validation.py.
+
+The file is memory-mapped and checked in chunks; every rule broken by any draw is
+counted, and the first invalid draws are listed with the rules they break.
+"""
+
+import os
+import sys
+import time
+
+# Add project root to path (so 'from api.validation import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from api.analytics import CHUNK_SIZE
+from api.rules import resolve_rules
+from api.validation import DrawValidator, validate_draws
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Check complete draws against every rule, without a solver')
+    parser.add_argument('draws', help='.npy file of draws, e.g. api/draw_pool.npy')
+    parser.add_argument('--rules', help='Rule set name (default: the 2026 rules)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'Draws per chunk (default: {CHUNK_SIZE})')
+    parser.add_argument('--show', type=int, default=5, help='Invalid draws to list (default: 5)')
+    parser.add_argument('--masks', help='Write the per-draw violation masks to this .npy file')
+    args = parser.parse_args()
+
+    rules = resolve_rules(args.rules)
+    draws = np.load(args.draws, mmap_mode='r')
+    start = time.perf_counter()
+    masks = validate_draws(draws, rules, args.chunk_size)
+    seconds = time.perf_counter() - start
+
+    invalid = np.flatnonzero(masks)
+    print(f"{len(draws)} draws checked in {seconds:.2f}s ({len(draws) / max(seconds, 1e-9):,.0f}/s), "
+          f"{len(invalid)} invalid")
+
+    validator = DrawValidator(rules)
+    for name, count in validator.summary(masks).items():
+        if count:
+            print(f"  {name:<30} {count}")
+    for idx in invalid[:args.show]:
+        print(f"\nDraw {idx}: {', '.join(validator.explain(masks[idx]))}")
+
+    if args.masks:
+        np.save(args.masks, masks)
+        print(f"\nMasks written to {args.masks}")
+    sys.exit(1 if len(invalid) else 0)
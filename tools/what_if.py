@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Evaluate many what-if queries at once with the evaluate_batch action (api/batch.py).
+
+Queries are (assignments, team) pairs: where would the team go, and can the draw
+still be completed. They come from a JSONL file ({"assignments": {...}, "team": ...}
+per line; without a team only completability is checked) or from the draw states
+of simulated draws. Results stream back in order; --local evaluates in this
+process instead, to compare against the server's throughput.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+import urllib.request
+
+# Add project root to path (so 'from api.batch import ...' works)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.batch import BATCH_WORKERS, evaluate_batch
+from api.solver import simulate_draw
+from tools.api_client import DEFAULT_API_URL
+from tools.corpus import iter_probes
+
+
+def load_queries(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def simulated_queries(num_draws, seed=2026):
+    """Every state a team is drawn in, over num_draws simulated draws"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(num_draws):
+        seen = set()
+        for assignments, team, _ in iter_probes(simulate_draw(rng)):
+            if team not in seen:
+                seen.add(team)
+                queries.append({'assignments': assignments, 'team': team})
+    return queries
+
+def stream_results(url, queries, timeout=600):
+    """Yield the decoded NDJSON lines of an evaluate_batch request as they arrive"""
+    body = json.dumps({'action': 'evaluate_batch', 'queries': queries}).encode('utf-8')
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        for line in response:
+            if line.strip():
+                yield json.loads(line)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Evaluate what-if queries in one batch')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--queries', help='JSONL file of {"assignments": {...}, "team": ...}')
+    source.add_argument('--draws', type=int, help='Query every state of this many simulated draws')
+    parser.add_argument('--seed', type=int, default=2026)
+    parser.add_argument('--url', default=DEFAULT_API_URL, help=f'API endpoint (default: {DEFAULT_API_URL})')
+    parser.add_argument('--local', action='store_true', help='Evaluate in this process, without the server')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS,
+                        help=f'Worker processes with --local (default: {BATCH_WORKERS})')
+    parser.add_argument('--output', help='Write the results as JSONL here')
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries) if args.queries else simulated_queries(args.draws, args.seed)
+    start = time.perf_counter()
+    if args.local:
+        _, results = evaluate_batch(queries, workers=args.workers)
+    else:
+        results = stream_results(args.url, queries)
+
+    output = open(args.output, 'w') if args.output else None
+    answered = errors = 0
+    first = None
+    for result in results:
+        if result.get('done'):
+            print(f"Server: {result['distinct']} distinct of {result['queries']} in {result['seconds']:.2f}s")
+            continue
+        if first is None:
+            first = time.perf_counter() - start
+        answered += 1
+        errors += 'error' in result
+        if output:
+            output.write(json.dumps(result) + '\n')
+    if output:
+        output.close()
+
+    seconds = time.perf_counter() - start
+    print(f"{answered} of {len(queries)} queries answered ({errors} errors) in {seconds:.2f}s, "
+          f"{answered / seconds:.1f}/s; first result after {first or 0:.3f}s")